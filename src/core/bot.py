@@ -0,0 +1,142 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+
+from botkit import img_logger
+from core import brain, clock, sensor
+from core.frame_ring import RingCamera
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_RETRIES = 3
+EXECUTION_RETRIES = 3
+
+
+@dataclass(frozen=True)
+class Decision:
+    at: datetime
+    task: int
+    action: str
+
+
+class Bot:
+    """
+    Plays the game from the frames of a camera, with a keyboard. Neither are tied to the game, so a captured session can
+    be replayed through the same loop. Observing and acting are done in line, one after the other.
+    """
+
+    def __init__(
+        self,
+        camera,
+        keyboard: brain.Keyboard,
+        capture_mode: sensor.CaptureMode,
+        log_frames: bool = True,
+    ):
+        self.camera = camera
+        self.keyboard = keyboard
+        self.capture_mode = capture_mode
+        self.log_frames = log_frames
+        self.statement_stability = sensor.StatementStability()
+        self.decisions: list[Decision] = []
+
+    def capture(self) -> sensor.Frame:
+        frame = sensor.create_frame(self.camera.get_latest_frame(), self.capture_mode)
+        if self.log_frames:
+            # Frames of the ring are only kept until the next one is read, which may be before the logger writes them.
+            img_logger.submit(frame.img.copy() if isinstance(self.camera, RingCamera) else frame.img)
+            img_logger.publish()
+        return frame
+
+    def decide(self, task: brain.Task, action: str) -> None:
+        logger.info(f"Task {task.index}: {action}")
+        self.decisions.append(Decision(clock.now(), task.index, action))
+
+    def observe(self) -> sensor.Frame:
+        frame = self.capture()
+        sensor.analyse_waiting_tasks(frame)
+        return frame
+
+    def request_statement(self) -> None:
+        self.statement_stability.reset()
+
+    def observe_statement(self) -> sensor.Frame:
+        """Frame on which the statement was read, once it stopped moving. Its statement is None if none was found."""
+        while True:
+            frame = self.observe()
+            if self.statement_stability.has_settled(frame):
+                sensor.read_task_statement(frame)
+                return frame
+
+    def act(self, callback: Callable[[brain.Keyboard], None]) -> None:
+        callback(self.keyboard)
+        self.camera.flush()
+
+    def reject_statement(self, frame: sensor.Frame) -> None:
+        """The brain could not understand the statement of the frame, so it must be read again rather than cached."""
+        sensor.forget_statement(frame.current_statement_key)
+
+    def loop(self) -> None:
+        """
+        1. Find and store new active tasks
+            - Store timestamps on when it was detected
+        2. Execute tasks
+            - Read title, find known task in dictionary
+            -
+        """
+
+        last_frame = self.observe()
+        if not last_frame.has_found_tasks:
+            logger.info(f"Found no waiting tasks.")
+            return
+
+        task, task_callback = brain.choose_task_to_execute(last_frame.tasks)
+        if task_callback is None:
+            return
+
+        logger.info(f"Launching task {task}")
+        self.decide(task, task_callback.__name__)
+
+        if task_callback.is_executable:
+            self.act(task_callback)
+            return
+
+        self.act(partial(select_task, task.index))
+
+        task_execution = None
+        execution_retry = 0
+        while task_execution is None:
+            statement_retry = 0
+            self.request_statement()
+            last_frame = self.observe_statement()
+            while last_frame.current_statement is None:
+                statement_retry += 1
+                if statement_retry >= STATEMENT_RETRIES:
+                    logger.warning(f"No statement after {STATEMENT_RETRIES} tries, will choose another task.")
+                    return
+                logger.info(f"Waiting for statement to appear...")
+                last_frame = self.observe_statement()
+
+            logger.info(f"Found statement {last_frame.current_statement_title}")
+            task_execution = task_callback(last_frame.tasks, last_frame.current_statement)
+            if task_execution.is_unknown:
+                self.reject_statement(last_frame)
+                execution_retry += 1
+                if execution_retry >= EXECUTION_RETRIES:
+                    logger.warning(
+                        f"Could not find a proper execution for task {last_frame.current_statement_title}, but will execute anyway."
+                    )
+                    break
+
+                logger.warning(
+                    f"Could not find a proper execution for task {last_frame.current_statement_title}. Will retry reading statement."
+                )
+                task_execution = None
+
+        self.decide(task, f"{task_execution.__name__} '{last_frame.current_statement_title}'")
+        self.act(task_execution)
+
+
+def select_task(index: int, keyboard: brain.Keyboard) -> None:
+    keyboard.send(str(index))
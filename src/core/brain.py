@@ -1,23 +1,28 @@
 from __future__ import annotations
 
 import enum
+import hashlib
 import json
 import logging
 import re
-import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from functools import cached_property, partial
 from importlib.resources import files
+from pathlib import Path
 from typing import Any, Pattern, Protocol, runtime_checkable, ClassVar
 
 from botkit.text import autocorrect, create_dictionary_from_text
-from core import resources
+from core import bundle, clock, resources, text_index
+from core.text_index import DeletionIndex, FuzzyIndex, TitleIndex, normalize
 
 EXPIRATION_DELAY_IN_SECONDS = 1.2
 CREATION_DELAY_IN_SECONDS = 0.5
+# A title read this close to the title of a known task is taken for it.
+FUZZY_TITLE_CONFIDENCE = 0.85
 
 logger = logging.getLogger(__name__)
 logger.level = logging.DEBUG
@@ -51,6 +56,42 @@ class TaskStatement:
     description: str
 
 
+class LazyTaskStatement(TaskStatement):
+    """
+    Statement whose description is only read when it is first needed, as most tasks are known by their title.
+
+    Comparing statements never reads the description: a lazy statement is only equal to one reading its description
+    from the same lines, never to a statement already read. Compare titles and descriptions to check what was read.
+    """
+
+    def __init__(self, title: str, read_description: Callable[[], str]):
+        self.title = title
+        self._read_description = read_description
+        self._description: str | None = None
+
+    @property
+    def description(self) -> str:
+        if self._description is None:
+            self._description = self._read_description()
+        return self._description
+
+    @property
+    def is_description_read(self) -> bool:
+        return self._description is not None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LazyTaskStatement):
+            return NotImplemented
+        return self.title == other.title and self._read_description is other._read_description
+
+    def __hash__(self) -> int:
+        return hash((self.title, id(self._read_description)))
+
+    def __repr__(self) -> str:
+        description = repr(self._description) if self.is_description_read else "<not read>"
+        return f"{type(self).__name__}(title={self.title!r}, description={description})"
+
+
 class TaskType(enum.Enum):
     SIMPLE = enum.auto()
     COOKING = enum.auto()
@@ -63,8 +104,10 @@ class HoldInput:
     hold_seconds: float
 
 
-@dataclass
+@dataclass(frozen=True)
 class TaskInstructions:
+    """Shared by every task following them, so they are never changed once found."""
+
     type: TaskType
     keys: list[str | HoldInput] | None = None
     cooking_seconds: int | None = None
@@ -75,7 +118,7 @@ class TaskInstructions:
     @staticmethod
     def from_dict(d: dict[str, Any]):
         keys = []
-        for input_ in d["keys"].split(","):
+        for input_ in d["keys"].split(",") if d["keys"] else []:
             split_input = input_.split(":")
             if len(split_input) == 1:
                 keys.append(input_)
@@ -94,8 +137,22 @@ class TaskInstructions:
             d.get("cooking_seconds"),
             d.get("input_delay_seconds", 0),
             d.get("post_task_seconds", 0),
+            d.get("has_next_step", False),
         )
 
+    def to_dict(self) -> dict[str, Any]:
+        """Same format as tasks.json."""
+        return {
+            "type": self.type.name,
+            "keys": ",".join(
+                key if isinstance(key, str) else f"hold:{key.key}:{key.hold_seconds}" for key in self.keys or []
+            ),
+            "cooking_seconds": self.cooking_seconds,
+            "input_delay_seconds": self.input_delay_seconds,
+            "post_task_seconds": self.post_task_seconds,
+            "has_next_step": self.has_next_step,
+        }
+
     @staticmethod
     def unknown():
         return TaskInstructions(TaskType.UNKNOWN)
@@ -140,6 +197,18 @@ class EquipmentStep:
         if self.use_quantity_suffixes:
             self.step_keywords += list(self.QUANTITY_SUFFIXES.keys())
 
+    def __getstate__(self) -> dict[str, Any]:
+        # Unpickled patterns are compiled again, which would be most of the time spent loading the bundle.
+        return {k: v for k, v in self.__dict__.items() if k != "keywords_pattern"}
+
+    @cached_property
+    def keywords_pattern(self) -> Pattern[str] | None:
+        if not self.step_keywords:
+            return None
+        # Alternatives are tried in order, so the longest keyword starting at the leftmost position wins.
+        keywords = sorted(self.step_keywords, key=len, reverse=True)
+        return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
     @staticmethod
     def from_dict(d: dict[str, Any]):
         return EquipmentStep(
@@ -161,8 +230,19 @@ class EquipmentStep:
             dictionary |= set(self.QUANTITY_SUFFIXES)
         return dictionary
 
+    @cached_property
+    def autocorrect_index(self) -> DeletionIndex:
+        return DeletionIndex(self.autocorrect_dictionary)
+
+    def autocorrect_candidates(self, description: str) -> set[str]:
+        """
+        Words of the dictionary close to the description, so only those are compared to it however large the dictionary
+        is. The whole dictionary when none is close, so autocorrect still gets a dictionary to correct from.
+        """
+        return self.autocorrect_index.candidates(description) or self.autocorrect_dictionary
+
     def find_instructions(self, description: str) -> TaskInstructions | None:
-        description = autocorrect(description, self.autocorrect_dictionary)
+        description = autocorrect(description, self.autocorrect_candidates(description))
 
         if self.step_format is not None:
             task_elements = self._find_task_elements_by_format(description)
@@ -208,14 +288,9 @@ class EquipmentStep:
         return [task_element for task_element in match.groups() if task_element is not None]
 
     def _find_task_elements_by_keywords(self, description: str) -> list[str] | None:
-        search_description = description
-        found_keywords: dict[int, str] = {}
-        for keyword in self.step_keywords:
-            while (found_index := search_description.find(keyword)) != -1:
-                found_keywords[found_index] = keyword
-                search_description = search_description.replace(keyword, "_" * len(keyword), 1)
-
-        return [v for k, v in sorted(found_keywords.items(), key=lambda x: x[0])]
+        if self.keywords_pattern is None:
+            return None
+        return [match.group() for match in self.keywords_pattern.finditer(description)]
 
 
 @dataclass
@@ -239,12 +314,95 @@ class Equipment:
                 continue
 
             if i != len(self.steps) - 1:
-                instructions.has_next_step = True
+                instructions = replace(instructions, has_next_step=True)
 
             return instructions
         return None
 
 
+def resources_digest() -> dict[str, str]:
+    """Hashes of the files instructions are found from, which are only valid as long as those files do not change."""
+    return {
+        name: hashlib.sha256(files(resources).joinpath(name).read_bytes()).hexdigest()
+        for name in ("equipments.json", "tasks.json")
+    }
+
+
+class InstructionCache:
+    """
+    Least recently used instructions found by equipments, keyed by equipment name and normalized description, so orders
+    seen before skip autocorrect and keyword scanning. Descriptions no step understood are kept too.
+    """
+
+    def __init__(self, max_size: int = 256, path: str | None = None):
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._instructions: OrderedDict[tuple[str, str], TaskInstructions | None] = OrderedDict()
+
+        if self.path is not None and Path(self.path).exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._instructions)
+
+    def find_instructions(self, equipment: Equipment, description: str) -> TaskInstructions | None:
+        key = (equipment.name, normalize(description))
+        if key in self._instructions:
+            self.hits += 1
+            self._instructions.move_to_end(key)
+            return self._instructions[key]
+
+        self.misses += 1
+        instructions = equipment.find_instructions(description)
+        self.put(key, instructions)
+        return instructions
+
+    def put(self, key: tuple[str, str], instructions: TaskInstructions | None) -> None:
+        self._instructions[key] = instructions
+        self._instructions.move_to_end(key)
+        while len(self._instructions) > self.max_size:
+            self._instructions.popitem(last=False)
+
+    def load(self) -> None:
+        with open(self.path) as cache_file:
+            cache = json.load(cache_file)
+        if cache.get("resources") != resources_digest():
+            logger.info(f"Ignoring instructions of {self.path}, as equipments or tasks changed since.")
+            return
+
+        for entry in cache["instructions"]:
+            instructions = entry["instructions"]
+            self.put(
+                (entry["equipment"], entry["description"]),
+                None if instructions is None else TaskInstructions.from_dict(instructions),
+            )
+        logger.info(f"Loaded {len(self)} instructions from {self.path}.")
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+
+        cache = {
+            "resources": resources_digest(),
+            "instructions": [
+                {
+                    "equipment": equipment,
+                    "description": description,
+                    "instructions": None if instructions is None else instructions.to_dict(),
+                }
+                for (equipment, description), instructions in self._instructions.items()
+            ],
+        }
+        with open(self.path, "w") as cache_file:
+            json.dump(cache, cache_file, indent=2)
+        logger.info(f"Saved {len(self)} instructions to {self.path}.")
+
+    def __str__(self) -> str:
+        return f"{len(self)} instructions, {self.hits} hits, {self.misses} misses"
+
+
 @runtime_checkable
 class TaskExecutionCallback(Protocol):
     is_unknown: ClassVar[bool] = False
@@ -286,15 +444,15 @@ class Task:
 
     @property
     def is_cooking(self) -> bool:
-        return not self.is_new and self.instructions.type == TaskType.COOKING and self.cooked_at > datetime.now()
+        return not self.is_new and self.instructions.type == TaskType.COOKING and self.cooked_at > clock.now()
 
     @property
     def is_cooked(self) -> bool:
-        return not self.is_new and self.instructions.type == TaskType.COOKING and self.cooked_at <= datetime.now()
+        return not self.is_new and self.instructions.type == TaskType.COOKING and self.cooked_at <= clock.now()
 
     @property
     def is_expired(self) -> bool:
-        return self.is_completed and self.expire_at <= datetime.now()
+        return self.is_completed and self.expire_at <= clock.now()
 
     @property
     def is_completed(self) -> bool:
@@ -306,20 +464,20 @@ class Task:
             not self.is_completed
             and self.visible_status == TaskStatus.READY
             and (
-                (self.is_new and self.created_at + timedelta(seconds=CREATION_DELAY_IN_SECONDS) <= datetime.now())
+                (self.is_new and self.created_at + timedelta(seconds=CREATION_DELAY_IN_SECONDS) <= clock.now())
                 or self.is_cooked
             )
         )
 
     @property
     def is_just_arrived(self) -> bool:
-        return self.created_at + timedelta(seconds=CREATION_DELAY_IN_SECONDS) > datetime.now()
+        return self.created_at + timedelta(seconds=CREATION_DELAY_IN_SECONDS) > clock.now()
 
     def complete(self):
-        self.expire_at = datetime.now() + timedelta(seconds=EXPIRATION_DELAY_IN_SECONDS)
+        self.expire_at = clock.now() + timedelta(seconds=EXPIRATION_DELAY_IN_SECONDS)
 
     def cook(self):
-        self.cooked_at = datetime.now() + timedelta(seconds=self.instructions.cooking_seconds)
+        self.cooked_at = clock.now() + timedelta(seconds=self.instructions.cooking_seconds)
         logger.info(f"{self.statement.title} will be cooked at {self.cooked_at}.")
 
     @define_callback(is_unknown=True)
@@ -333,10 +491,10 @@ class Task:
         for key in self.instructions.keys:
             keyboard.send(key)
             if self.instructions.input_delay_seconds != 0:
-                time.sleep(self.instructions.input_delay_seconds)
+                clock.sleep(self.instructions.input_delay_seconds)
         self.complete()
         if self.instructions.post_task_seconds != 0:
-            time.sleep(self.instructions.post_task_seconds)
+            clock.sleep(self.instructions.post_task_seconds)
 
     @define_callback
     def cooking_task_execution(self, keyboard: Keyboard) -> None:
@@ -344,7 +502,7 @@ class Task:
         for key in self.instructions.keys:
             keyboard.send(key)
             if self.instructions.input_delay_seconds != 0:
-                time.sleep(self.instructions.input_delay_seconds)
+                clock.sleep(self.instructions.input_delay_seconds)
         self.cook()
 
     @define_callback
@@ -359,19 +517,16 @@ class Task:
     ) -> TaskExecutionCallback:
         _synchronize_tasks(visible_tasks)
 
-        instructions = TASKS_INSTRUCTIONS.get(statement.title.lower())
+        instructions = find_task_instructions(statement.title)
         if instructions is not None:
             return self.get_executions(statement, instructions)
 
         logger.info(
             f"'{statement.title}' is not in predefined tasks. Trying to interpret statement '{statement.description}'."
         )
-        for equipment in EQUIPMENTS.values():
-            if not equipment.match_title(statement.title):
-                continue
-
+        for equipment in EQUIPMENT_TITLES.match(statement.title):
             logger.info(f"'{statement.title}' is a '{equipment.name}' task.")
-            instructions = equipment.find_instructions(statement.description)
+            instructions = instruction_cache.find_instructions(equipment, statement.description)
             if instructions is None:
                 logger.warning(f"'Could not understand instructions for {statement.title}.")
                 break
@@ -381,6 +536,10 @@ class Task:
         return self.get_executions(statement, TaskInstructions.unknown())
 
 
+# Pause after every key, so the game registers it.
+KEY_INTERVAL_SECONDS = 0.1
+
+
 class Keyboard(ABC):
     @abstractmethod
     def send(self, key: str | HoldInput):
@@ -391,17 +550,75 @@ class Keyboard(ABC):
         raise NotImplementedError
 
 
-with files(resources).joinpath("tasks.json").open() as recipes_file:
-    TASKS_INSTRUCTIONS: dict[str, TaskInstructions] = {
-        k.lower(): TaskInstructions.from_dict(v) for k, v in json.load(recipes_file).items()
-    }
+class AsyncKeyboard(ABC):
+    """Keyboard whose keys are sent without blocking, so frames are still analysed while a key is held."""
+
+    @abstractmethod
+    async def send(self, key: str | HoldInput):
+        raise NotImplementedError
 
-with files(resources).joinpath("equipments.json").open() as equipments_file:
-    EQUIPMENTS: dict[str, Equipment] = {k: Equipment.from_dict(k, v) for k, v in json.load(equipments_file).items()}
+    @abstractmethod
+    async def wait_for(self, key: str):
+        raise NotImplementedError
 
-    @property
-    def index(self):
-        return self.task.index
+
+@dataclass(frozen=True)
+class BrainResources:
+    tasks_instructions: dict[str, TaskInstructions]
+    task_titles: FuzzyIndex
+    equipments: dict[str, Equipment]
+    equipment_titles: TitleIndex[Equipment]
+
+
+def build_resources() -> BrainResources:
+    """Everything the brain needs from tasks.json and equipments.json, autocorrect indexes included."""
+    with files(resources).joinpath("tasks.json").open() as recipes_file:
+        tasks_instructions = {k.lower(): TaskInstructions.from_dict(v) for k, v in json.load(recipes_file).items()}
+
+    with files(resources).joinpath("equipments.json").open() as equipments_file:
+        equipments = {k: Equipment.from_dict(k, v) for k, v in json.load(equipments_file).items()}
+    for equipment in equipments.values():
+        for step in equipment.steps:
+            step.autocorrect_index
+
+    return BrainResources(
+        tasks_instructions,
+        FuzzyIndex(tasks_instructions),
+        equipments,
+        # When several equipments match a title, the first in equipments.json wins.
+        TitleIndex((equipment, equipment.title_keywords) for equipment in equipments.values()),
+    )
+
+
+# Resources are built once, then loaded from this bundle until tasks.json, equipments.json or the code building them
+# change.
+BUNDLE_PATH = Path(resources.__file__).parent / "brain.bundle"
+
+
+def bundle_digest() -> dict[str, str]:
+    return resources_digest() | bundle.source_digest(Path(__file__), Path(text_index.__file__))
+
+
+_resources = bundle.load_or_build(BUNDLE_PATH, bundle_digest(), build_resources)
+TASKS_INSTRUCTIONS = _resources.tasks_instructions
+TASK_TITLES = _resources.task_titles
+EQUIPMENTS = _resources.equipments
+EQUIPMENT_TITLES = _resources.equipment_titles
+
+instruction_cache = InstructionCache()
+
+
+def find_task_instructions(title: str) -> TaskInstructions | None:
+    """Instructions of the known task with this title, or with a title close enough to absorb OCR errors."""
+    instructions = TASKS_INSTRUCTIONS.get(title.lower())
+    if instructions is not None:
+        return instructions
+
+    known_title, confidence = TASK_TITLES.best_match(title)
+    if confidence < FUZZY_TITLE_CONFIDENCE:
+        return None
+    logger.info(f"'{title}' is taken for '{known_title}', with a confidence of {confidence:.2f}.")
+    return TASKS_INSTRUCTIONS[known_title]
 
 
 def _synchronize_tasks(visible_tasks: list[VisibleTask | None]) -> None:
@@ -414,7 +631,7 @@ def _synchronize_tasks(visible_tasks: list[VisibleTask | None]) -> None:
         active_task = active_tasks[i]
         if active_task is None:
             if visible_task is not None:
-                active_tasks[i] = Task(i + 1, datetime.now(), visible_task.status)
+                active_tasks[i] = Task(i + 1, clock.now(), visible_task.status)
             continue
 
         if active_task.is_expired:
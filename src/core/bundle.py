@@ -0,0 +1,62 @@
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def source_digest(*paths: Path) -> dict[str, str]:
+    """Hashes of the modules building a bundle, so changing how it is built rebuilds it, like changing its sources."""
+    return {path.name: hashlib.sha256(path.read_bytes()).hexdigest() for path in paths}
+
+
+def bundle_key(digest: dict[str, str]) -> dict[str, Any]:
+    return {"python": list(sys.version_info[:2]), "sources": digest}
+
+
+def load(path: Path, digest: dict[str, str]) -> Any | None:
+    """Content of the bundle, or None if there is none or it was built from other sources."""
+    try:
+        with open(path, "rb") as bundle_file:
+            bundle = pickle.load(bundle_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Could not load {path}, it will be rebuilt: {e}")
+        return None
+
+    if bundle.get("key") != bundle_key(digest):
+        logger.info(f"{path} was built from other sources, it will be rebuilt.")
+        return None
+    return bundle["content"]
+
+
+def save(path: Path, digest: dict[str, str], content: Any) -> None:
+    """Written to a temporary file first, so processes importing at the same time never read half a bundle."""
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporary_path, "wb") as bundle_file:
+            pickle.dump({"key": bundle_key(digest), "content": content}, bundle_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+    except OSError as e:
+        logger.warning(f"Could not save {path}, resources will be built again next time: {e}")
+        temporary_path.unlink(missing_ok=True)
+
+
+def load_or_build(path: Path, digest: dict[str, str], build: Callable[[], T]) -> T:
+    """
+    Content of the bundle at path if it was built from the sources of this digest, otherwise built again and saved for
+    next time.
+    """
+    content = load(path, digest)
+    if content is None:
+        content = build()
+        save(path, digest, content)
+    return content
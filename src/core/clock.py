@@ -0,0 +1,48 @@
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+
+class Clock(ABC):
+    @abstractmethod
+    def now(self) -> datetime:
+        raise NotImplementedError
+
+    @abstractmethod
+    def sleep(self, seconds: float) -> None:
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Clock of a replayed session. It follows the timestamps of the frames, and sleeping only moves it forward."""
+
+    def __init__(self, start: datetime):
+        self._now = start
+
+    def now(self) -> datetime:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        self._now += timedelta(seconds=seconds)
+
+    def advance_to(self, moment: datetime) -> None:
+        self._now = max(self._now, moment)
+
+
+current: Clock = SystemClock()
+
+
+def now() -> datetime:
+    return current.now()
+
+
+def sleep(seconds: float) -> None:
+    current.sleep(seconds)
@@ -0,0 +1,275 @@
+import logging
+import multiprocessing
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Lock
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAME_RING_SLOTS = 4
+# Slots are allocated for the largest frame expected, smaller frames only use the top left of their slot.
+MAX_FRAME_SHAPE = (1080, 1920, 3)
+# The capture process waits this long before capturing again, so it does not take a whole core from the analysis.
+CAPTURE_INTERVAL_SECONDS = 0.01
+# How long the analysis waits between two checks for a new frame.
+POLL_INTERVAL_SECONDS = 0.001
+CAPTURE_PROCESS_START_TIMEOUT_SECONDS = 10
+
+
+@dataclass(frozen=True)
+class RingFrame:
+    number: int
+    img: np.ndarray
+    """Read-only view on the slot of the ring, valid until the next frame is read from the ring."""
+    captured_at: float
+    """time.time() when the frame was captured."""
+
+
+class FrameRing:
+    """
+    Ring of frames in shared memory, written by a single capture process and read by a single analysis without copies.
+
+    The slot of the last frame read is leased to the reader, so the writer skips it and the frame can be analysed for
+    as long as it takes. The lease moves with the next frame read. Every slot has a sequence number, which is odd while
+    the slot is being written and 2 * (frame number + 1) once written, so a frame no longer in the ring can be told.
+    """
+
+    def __init__(self, memory: SharedMemory, lock: Lock, slots: int, max_shape: tuple[int, int, int], owner: bool):
+        if slots < 3:
+            raise ValueError("The ring needs a slot to write besides the latest frame and the one the reader holds.")
+        self.memory = memory
+        self.lock = lock
+        self.slots = slots
+        self.max_shape = max_shape
+        self.owner = owner
+
+        buffer = memory.buf
+        self._written = np.ndarray((1,), dtype=np.int64, buffer=buffer)
+        self._latest_slot = np.ndarray((1,), dtype=np.int64, buffer=buffer, offset=8)
+        self._leased_slot = np.ndarray((1,), dtype=np.int64, buffer=buffer, offset=16)
+        self._sequences = np.ndarray((slots,), dtype=np.int64, buffer=buffer, offset=24)
+        self._shapes = np.ndarray((slots, 3), dtype=np.int64, buffer=buffer, offset=24 + slots * 8)
+        self._captured_at = np.ndarray((slots,), dtype=np.float64, buffer=buffer, offset=24 + slots * 32)
+        self._frames = np.ndarray(
+            (slots, *max_shape), dtype=np.uint8, buffer=buffer, offset=FrameRing._header_size(slots)
+        )
+
+    @staticmethod
+    def _header_size(slots: int) -> int:
+        # Frames start on a cache line.
+        return (24 + slots * 40 + 63) // 64 * 64
+
+    @staticmethod
+    def create(slots: int = FRAME_RING_SLOTS, max_shape: tuple[int, int, int] = MAX_FRAME_SHAPE) -> "FrameRing":
+        size = FrameRing._header_size(slots) + slots * int(np.prod(max_shape))
+        ring = FrameRing(SharedMemory(create=True, size=size), multiprocessing.Lock(), slots, max_shape, owner=True)
+        ring._written[0] = 0
+        ring._latest_slot[0] = -1
+        ring._leased_slot[0] = -1
+        ring._sequences[:] = 0
+        return ring
+
+    @staticmethod
+    def attach(
+        name: str, lock: Lock, slots: int = FRAME_RING_SLOTS, max_shape: tuple[int, int, int] = MAX_FRAME_SHAPE
+    ) -> "FrameRing":
+        """The lock is the one of the ring created, which must be passed to the attaching process when it starts."""
+        return FrameRing(SharedMemory(name=name), lock, slots, max_shape, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    @property
+    def written(self) -> int:
+        return int(self._written[0])
+
+    def write(self, frame: np.ndarray, captured_at: float | None = None) -> int:
+        """Only a single process may write to the ring."""
+        frame = frame.reshape(frame.shape[0], frame.shape[1], -1)
+        if any(size > max_size for size, max_size in zip(frame.shape, self.max_shape)):
+            raise ValueError(f"Frame of shape {frame.shape} does not fit in slots of shape {self.max_shape}.")
+
+        number = self.written
+        height, width, channels = frame.shape
+        with self.lock:
+            latest, leased = int(self._latest_slot[0]), int(self._leased_slot[0])
+            slot = next(
+                slot
+                for slot in ((latest + offset) % self.slots for offset in range(1, self.slots + 1))
+                if slot != latest and slot != leased
+            )
+            self._sequences[slot] = 2 * number + 1
+
+        # The slot is neither the latest nor leased, so the reader cannot take it while it is written.
+        self._frames[slot, :height, :width, :channels] = frame
+        self._shapes[slot] = frame.shape
+        self._captured_at[slot] = time.time() if captured_at is None else captured_at
+
+        with self.lock:
+            self._sequences[slot] = 2 * number + 2
+            self._latest_slot[0] = slot
+            self._written[0] = number + 1
+        return number
+
+    def latest(self) -> RingFrame | None:
+        """Last frame written, or None if there is none yet. Its slot is leased until the next call."""
+        with self.lock:
+            number = self.written - 1
+            if number < 0:
+                return None
+
+            slot = int(self._latest_slot[0])
+            self._leased_slot[0] = slot
+
+        height, width, channels = self._shapes[slot]
+        img = self._frames[slot, :height, :width, :channels]
+        if channels == 1:
+            img = img[:, :, 0]
+        img.flags.writeable = False
+        return RingFrame(number, img, float(self._captured_at[slot]))
+
+    def release(self) -> None:
+        """Let the writer use the slot of the last frame read again."""
+        with self.lock:
+            self._leased_slot[0] = -1
+
+    def is_current(self, number: int) -> bool:
+        """Whether the frame is still in its slot, so its image was not overwritten."""
+        return bool(np.any(self._sequences == 2 * number + 2))
+
+    def close(self) -> None:
+        del self._written, self._latest_slot, self._leased_slot, self._sequences, self._shapes, self._captured_at
+        del self._frames
+        try:
+            self.memory.close()
+        except BufferError:
+            logger.warning("Frames of the ring are still referenced, its memory will be freed with them.")
+        if self.owner:
+            self.memory.unlink()
+
+
+def capture_frames(
+    ring_name: str,
+    lock: Lock,
+    slots: int,
+    max_shape: tuple[int, int, int],
+    create_source: Callable,
+    started,
+    stopped,
+    interval: float = CAPTURE_INTERVAL_SECONDS,
+) -> None:
+    """Capture process, writing the frames of its source to the ring until it is stopped."""
+    ring = FrameRing.attach(ring_name, lock, slots, max_shape)
+    source = create_source()
+    if hasattr(source, "start"):
+        source.start()
+    started.set()
+    try:
+        while not stopped.is_set():
+            frame = source.get_latest_frame()
+            if frame is not None:
+                ring.write(frame)
+            time.sleep(interval)
+    finally:
+        if hasattr(source, "stop"):
+            source.stop()
+        ring.close()
+
+
+class RingCamera:
+    """
+    Camera whose frames are captured by another process, so capturing does not compete with the analysis for the GIL.
+    The frames returned are views on the ring, which stay valid until the next frame is taken, as the capture process
+    skips the slot of the frame being analysed.
+
+    Keeps the age of every frame when it was returned, the frames captured but never returned, and the frames
+    overwritten while they were still being analysed, which should never happen.
+    """
+
+    def __init__(
+        self,
+        create_source: Callable,
+        slots: int = FRAME_RING_SLOTS,
+        max_shape: tuple[int, int, int] = MAX_FRAME_SHAPE,
+        interval: float = CAPTURE_INTERVAL_SECONDS,
+    ):
+        self.create_source = create_source
+        self.slots = slots
+        self.max_shape = max_shape
+        self.interval = interval
+        self.ring: FrameRing | None = None
+        self.ages: list[float] = []
+        self.dropped = 0
+        self.overwritten = 0
+        self._last_number = -1
+        self._flushed_at = 0.0
+        self._process: multiprocessing.Process | None = None
+        self._stopped = multiprocessing.Event()
+
+    def start(self) -> None:
+        self.ring = FrameRing.create(self.slots, self.max_shape)
+        started = multiprocessing.Event()
+        self._process = multiprocessing.Process(
+            target=capture_frames,
+            args=(
+                self.ring.name,
+                self.ring.lock,
+                self.slots,
+                self.max_shape,
+                self.create_source,
+                started,
+                self._stopped,
+                self.interval,
+            ),
+            name="capture",
+            daemon=True,
+        )
+        self._process.start()
+        if not started.wait(CAPTURE_PROCESS_START_TIMEOUT_SECONDS):
+            self.stop()
+            raise TimeoutError("Capture process did not start.")
+
+    def get_latest_frame(self) -> np.ndarray:
+        if self._last_number >= 0 and not self.ring.is_current(self._last_number):
+            self.overwritten += 1
+
+        frame = self.ring.latest()
+        while frame is None or frame.number <= self._last_number or frame.captured_at < self._flushed_at:
+            if not self._process.is_alive():
+                raise RuntimeError("Capture process stopped.")
+            time.sleep(POLL_INTERVAL_SECONDS)
+            frame = self.ring.latest()
+
+        self.ages.append(time.time() - frame.captured_at)
+        self.dropped += frame.number - self._last_number - 1
+        self._last_number = frame.number
+        return frame.img
+
+    def flush(self) -> None:
+        """Only return frames captured from now on."""
+        self._flushed_at = time.time()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._process is not None:
+            self._process.join(CAPTURE_PROCESS_START_TIMEOUT_SECONDS)
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def __str__(self) -> str:
+        if not self.ages:
+            return "no frames"
+
+        ages = sorted(self.ages)
+        return (
+            f"{len(ages)} frames, aged {statistics.median(ages) * 1000:.1f} ms median and"
+            f" {ages[int(len(ages) * 0.95)] * 1000:.1f} ms p95, {self.dropped} dropped,"
+            f" {self.overwritten} overwritten during analysis"
+        )
@@ -0,0 +1,192 @@
+import logging
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from importlib.resources import files
+
+import cv2
+import numpy as np
+
+from core import resources
+
+logger = logging.getLogger(__name__)
+
+GLYPH_ATLAS_FILE = "glyph_atlas.npz"
+
+# Glyphs are compared on a canvas anchored on the baseline of their line, so "," and "'" do not look alike.
+GLYPH_ABOVE_BASELINE = 32
+GLYPH_BELOW_BASELINE = 10
+GLYPH_WIDTH = 32
+MIN_LINE_HEIGHT = 8
+LINE_PADDING = 4
+SPACE_WIDTH_RATIO = 0.33
+QUOTE = '"'
+
+
+@dataclass
+class TextLine:
+    glyphs: np.ndarray
+    """Flattened glyph canvases, one row per glyph."""
+    spaces: list[bool]
+    """Whether there is a space before each glyph."""
+
+    def __len__(self) -> int:
+        return len(self.glyphs)
+
+
+def _runs(profile: np.ndarray) -> np.ndarray:
+    """Start and end of every run of non-zero values, as a (n, 2) array."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], profile > 0, [0])).astype(np.int8)))
+    return edges.reshape(-1, 2)
+
+
+def remove_border_noise(masked: np.ndarray) -> np.ndarray:
+    """Remove the shapes touching the left or right border, as statements never do."""
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(masked.astype(np.uint8), connectivity=8)
+    left, width = stats[:, cv2.CC_STAT_LEFT], stats[:, cv2.CC_STAT_WIDTH]
+    keep = (left > 0) & (left + width < masked.shape[1])
+    keep[0] = False
+    return keep[labels]
+
+
+def find_lines(masked: np.ndarray) -> list[slice]:
+    return [slice(top, bottom) for top, bottom in _runs(masked.sum(axis=1)) if bottom - top >= MIN_LINE_HEIGHT]
+
+
+def segment_lines(masked: np.ndarray) -> list[tuple[slice, np.ndarray]]:
+    """
+    Crop every text line of a mask tightly, using its horizontal projection to find the rows of the lines, then its
+    vertical projection to find where each line starts and ends. A small margin is kept, as tesseract needs one.
+
+    :return: the rows of every line, with its cropped image.
+    """
+    masked = remove_border_noise(masked)
+    lines = []
+    for rows in find_lines(masked):
+        line = masked[rows]
+        columns = np.flatnonzero(line.any(axis=0))
+        lines.append((rows, np.pad(line[:, columns[0] : columns[-1] + 1], LINE_PADDING)))
+    return lines
+
+
+def split_glyphs(line: np.ndarray) -> TextLine:
+    """Split a line in glyphs using its column projection, then draw every glyph on a canvas anchored on the baseline."""
+    columns = _runs(line.sum(axis=0))
+    bottoms = np.array([line.shape[0] - np.argmax(line[::-1, left:right].any(axis=1)) for left, right in columns])
+    baseline = np.bincount(bottoms).argmax() if len(bottoms) else 0
+
+    canvas_height = GLYPH_ABOVE_BASELINE + GLYPH_BELOW_BASELINE
+    glyphs = np.zeros((len(columns), canvas_height, GLYPH_WIDTH), dtype=bool)
+    top = max(baseline - GLYPH_ABOVE_BASELINE, 0)
+    bottom = min(baseline + GLYPH_BELOW_BASELINE, line.shape[0])
+    canvas_top = top - (baseline - GLYPH_ABOVE_BASELINE)
+    for glyph, (left, right) in zip(glyphs, columns):
+        right = min(right, left + GLYPH_WIDTH)
+        glyph[canvas_top : canvas_top + bottom - top, : right - left] = line[top:bottom, left:right]
+
+    gaps = columns[1:, 0] - columns[:-1, 1]
+    spaces = [False] + (gaps >= SPACE_WIDTH_RATIO * baseline).tolist()
+    return TextLine(glyphs.reshape(len(columns), -1), spaces)
+
+
+def read_lines(masked: np.ndarray) -> list[TextLine]:
+    masked = remove_border_noise(masked)
+    return [split_glyphs(masked[rows]) for rows in find_lines(masked)]
+
+
+class GlyphAtlas:
+    """Glyphs of the game font, labeled from captures."""
+
+    def __init__(self, bitmaps: np.ndarray, labels: list[str]):
+        self.bitmaps = bitmaps
+        self.labels = labels
+        self._exact = {bitmap.tobytes(): label for bitmap, label in zip(bitmaps, labels)}
+        characters = sorted(set(labels))
+        self._characters = np.array([characters.index(label) for label in labels])
+        self._bitmaps = bitmaps.astype(np.float32)
+        self._sizes = self._bitmaps.sum(axis=1)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def match(self, glyphs: np.ndarray) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """
+        Match glyphs with the atlas. Glyphs drawn exactly like in the atlas are found by lookup, the others are matched
+        with the atlas glyph sharing the most pixels.
+
+        :return: the labels, the intersection over union of every glyph with its match, and how much higher it is than
+            with the closest glyph of another character.
+        """
+        labels = [self._exact.get(glyph.tobytes()) for glyph in glyphs]
+        scores = np.ones(len(glyphs), dtype=np.float32)
+        margins = np.ones(len(glyphs), dtype=np.float32)
+
+        unknown = [i for i, label in enumerate(labels) if label is None]
+        if unknown and len(self):
+            candidates = glyphs[unknown].astype(np.float32)
+            intersections = candidates @ self._bitmaps.T
+            unions = candidates.sum(axis=1)[:, None] + self._sizes[None, :] - intersections
+            ious = intersections / np.maximum(unions, 1)
+            best = ious.argmax(axis=1)
+            best_scores = ious[np.arange(len(unknown)), best]
+            same_character = self._characters[None, :] == self._characters[best][:, None]
+            second_scores = np.where(same_character, 0, ious).max(axis=1)
+            for i, match, score, second in zip(unknown, best, best_scores, second_scores):
+                labels[i] = self.labels[match]
+                scores[i] = score
+                margins[i] = score - second
+        elif unknown:
+            scores[unknown] = 0
+            margins[unknown] = 0
+
+        return [label or "" for label in labels], scores, margins
+
+    def read(self, line: TextLine) -> tuple[str, float, float]:
+        """:return: the text of the line, with the lowest score and margin of its glyphs."""
+        labels, scores, margins = self.match(line.glyphs)
+        text = "".join(" " + label if space else label for label, space in zip(labels, line.spaces))
+        return text, float(scores.min(initial=1)), float(margins.min(initial=1))
+
+    @staticmethod
+    def build(samples: Iterable[tuple[np.ndarray, str, str]]) -> "GlyphAtlas":
+        """
+        Build an atlas from statement masks along with their known title and description. Lines are skipped when their
+        glyphs cannot be paired one to one with the known text.
+        """
+        votes: dict[bytes, Counter] = defaultdict(Counter)
+        bitmaps: dict[bytes, np.ndarray] = {}
+        for masked, title, description in samples:
+            lines = read_lines(masked)
+            if len(lines) < 2:
+                logger.warning(f"Skipping '{title}', as its title and description were not found.")
+                continue
+
+            title_chars = title.replace(" ", "")
+            if len(lines[0]) == len(title_chars) + 2:
+                title_chars = QUOTE + title_chars + QUOTE
+            description_chars = description.replace(" ", "")
+            description_glyphs = np.concatenate([line.glyphs for line in lines[1:]])
+
+            for glyphs, chars in ((lines[0].glyphs, title_chars), (description_glyphs, description_chars)):
+                if len(glyphs) != len(chars):
+                    logger.warning(f"Skipping '{chars}', as {len(glyphs)} glyphs were found.")
+                    continue
+
+                for glyph, char in zip(glyphs, chars):
+                    votes[glyph.tobytes()][char] += 1
+                    bitmaps[glyph.tobytes()] = glyph
+
+        keys = list(bitmaps)
+        return GlyphAtlas(
+            np.array([bitmaps[key] for key in keys]).reshape(len(keys), -1),
+            [votes[key].most_common(1)[0][0] for key in keys],
+        )
+
+    @staticmethod
+    def load(path: str | None = None) -> "GlyphAtlas":
+        with open(path, "rb") if path else files(resources).joinpath(GLYPH_ATLAS_FILE).open("rb") as atlas_file:
+            atlas = np.load(atlas_file)
+            return GlyphAtlas(atlas["bitmaps"], atlas["labels"].tolist())
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, bitmaps=self.bitmaps, labels=np.array(self.labels))
@@ -1,9 +1,10 @@
+import asyncio
 import logging
 import time
 
 from pynput.keyboard import Key, Controller, Listener, KeyCode
 
-from core.brain import TaskExecutionCallback, Keyboard, HoldInput
+from core.brain import AsyncKeyboard, TaskExecutionCallback, Keyboard, HoldInput, KEY_INTERVAL_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,7 @@ class PynputKeyboard(Keyboard):
         if isinstance(key, str):
             logger.debug(f"Pressing '{key}'.")
             keyboard_controller.tap(to_pynput(key))
-            time.sleep(0.1)
+            time.sleep(KEY_INTERVAL_SECONDS)
         else:
             logger.debug(f"Holding '{key.key}' for '{key.hold_seconds}' seconds.")
             keyboard_controller.press(to_pynput(key.key))
@@ -53,6 +54,24 @@ class PynputKeyboard(Keyboard):
             listener.join()
 
 
+class AsyncPynputKeyboard(AsyncKeyboard):
+    async def send(self, key: str | HoldInput):
+        if isinstance(key, str):
+            logger.debug(f"Pressing '{key}'.")
+            keyboard_controller.tap(to_pynput(key))
+            await asyncio.sleep(KEY_INTERVAL_SECONDS)
+        else:
+            logger.debug(f"Holding '{key.key}' for '{key.hold_seconds}' seconds.")
+            keyboard_controller.press(to_pynput(key.key))
+            try:
+                await asyncio.sleep(key.hold_seconds)
+            finally:
+                keyboard_controller.release(to_pynput(key.key))
+
+    async def wait_for(self, key: str):
+        await asyncio.to_thread(keyboard.wait_for, key)
+
+
 keyboard = PynputKeyboard()
 
 
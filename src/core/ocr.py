@@ -0,0 +1,290 @@
+import enum
+import hashlib
+import json
+import logging
+import queue
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from pytesseract import pytesseract
+
+from core import glyphs
+from core.brain import LazyTaskStatement, TaskStatement
+
+logger = logging.getLogger(__name__)
+
+OCR_LANGUAGE = "eng"
+# A statement has a title and up to three lines of description, which are read in parallel.
+OCR_WORKERS = 4
+HASH_BLOCK_SIZE = 3
+# Below this intersection over union, a glyph is considered unknown and the statement is read by tesseract instead.
+# Characters missing from the atlas match glyphs of other characters up to 0.88, like "i" and "l".
+MIN_GLYPH_CONFIDENCE = 0.9
+# A glyph is also unknown when it matches a glyph of another character almost as well as its best match.
+MIN_GLYPH_MARGIN = 0.05
+
+
+class OcrEngineType(enum.Enum):
+    PYTESSERACT = enum.auto()
+    TESSEROCR = enum.auto()
+    GLYPHS = enum.auto()
+
+
+class OcrEngine(ABC):
+    @abstractmethod
+    def image_to_string(self, img: np.ndarray) -> str:
+        raise NotImplementedError
+
+    def image_to_line(self, img: np.ndarray) -> str:
+        """Read an image holding a single line of text."""
+        return self.image_to_string(img).strip()
+
+    def images_to_lines(self, imgs: list[np.ndarray]) -> list[str]:
+        return [self.image_to_line(img) for img in imgs]
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def version(self) -> str:
+        """What the texts read depend on, so texts read by another engine are not taken for texts read by this one."""
+        return type(self).__name__
+
+
+class TesseractEngine(OcrEngine, ABC):
+    """Tesseract runs outside the GIL, so lines are read in parallel."""
+
+    def __init__(self, workers: int = OCR_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+
+    def images_to_lines(self, imgs: list[np.ndarray]) -> list[str]:
+        return list(self._executor.map(self.image_to_line, imgs))
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    @property
+    def version(self) -> str:
+        return f"{type(self).__name__} {OCR_LANGUAGE}"
+
+
+class PytesseractEngine(TesseractEngine):
+    """Runs a new tesseract process for every image, which reloads the trained data each time."""
+
+    def image_to_string(self, img: np.ndarray) -> str:
+        return pytesseract.image_to_string(img, lang=OCR_LANGUAGE)
+
+    def image_to_line(self, img: np.ndarray) -> str:
+        return pytesseract.image_to_string(img, lang=OCR_LANGUAGE, config="--psm 7").strip()
+
+
+class TesserocrEngine(TesseractEngine):
+    """Keeps the tesseract C API, and its trained data, loaded for the whole session. Every worker has its own."""
+
+    def __init__(self, workers: int = OCR_WORKERS):
+        # tesserocr is optional, as it needs to be built against the installed tesseract.
+        from tesserocr import PSM, PyTessBaseAPI
+
+        self._single_line = PSM.SINGLE_LINE
+        self._all_apis = [PyTessBaseAPI(lang=OCR_LANGUAGE) for _ in range(workers)]
+        self._apis: queue.SimpleQueue = queue.SimpleQueue()
+        for api in self._all_apis:
+            self._apis.put(api)
+        super().__init__(workers)
+
+    def image_to_string(self, img: np.ndarray) -> str:
+        return self._read(img)
+
+    def image_to_line(self, img: np.ndarray) -> str:
+        return self._read(img, page_segmentation=self._single_line).strip()
+
+    def _read(self, img: np.ndarray, page_segmentation=None) -> str:
+        image = Image.fromarray(img.astype(np.uint8) * 255 if img.dtype == bool else img)
+        api = self._apis.get()
+        default_page_segmentation = api.GetPageSegMode()
+        try:
+            if page_segmentation is not None:
+                api.SetPageSegMode(page_segmentation)
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        finally:
+            api.SetPageSegMode(default_page_segmentation)
+            self._apis.put(api)
+
+    def close(self) -> None:
+        super().close()
+        for api in self._all_apis:
+            api.End()
+
+
+class GlyphEngine(OcrEngine):
+    """
+    Matches the glyphs of the game font against an atlas built from labeled captures. The game always draws text the
+    same way, so most glyphs are found by an exact lookup. Statements with a glyph too far from the atlas, or as close to
+    two characters, are read by the fallback engine.
+    """
+
+    def __init__(
+        self,
+        atlas: glyphs.GlyphAtlas,
+        fallback: OcrEngine,
+        min_confidence: float = MIN_GLYPH_CONFIDENCE,
+        min_margin: float = MIN_GLYPH_MARGIN,
+    ):
+        self.atlas = atlas
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self.min_margin = min_margin
+        self.fallbacks = 0
+
+    def _is_known(self, confidence: float, margin: float) -> bool:
+        return confidence >= self.min_confidence and margin >= self.min_margin
+
+    def image_to_string(self, img: np.ndarray) -> str:
+        lines = [self.atlas.read(line) for line in glyphs.read_lines(img > 0)]
+        confidence = min((confidence for _, confidence, _ in lines), default=0)
+        margin = min((margin for _, _, margin in lines), default=0)
+        if not self._is_known(confidence, margin):
+            logger.debug(
+                f"Glyphs matched with a confidence of {confidence:.2f} and a margin of {margin:.2f}, falling back to "
+                f"{type(self.fallback).__name__}."
+            )
+            self.fallbacks += 1
+            return self.fallback.image_to_string(img)
+
+        return "\n".join(text for text, _, _ in lines)
+
+    def image_to_line(self, img: np.ndarray) -> str:
+        return self.images_to_lines([img])[0]
+
+    def images_to_lines(self, imgs: list[np.ndarray]) -> list[str]:
+        lines = [self.atlas.read(glyphs.split_glyphs(img > 0)) for img in imgs]
+        texts = [text for text, _, _ in lines]
+        unknown = [i for i, (_, confidence, margin) in enumerate(lines) if not self._is_known(confidence, margin)]
+        if unknown:
+            logger.debug(f"{len(unknown)} lines have unknown glyphs, falling back to {type(self.fallback).__name__}.")
+            self.fallbacks += 1
+            for i, text in zip(unknown, self.fallback.images_to_lines([imgs[i] for i in unknown])):
+                texts[i] = text
+        return texts
+
+    def close(self) -> None:
+        self.fallback.close()
+
+    @property
+    def version(self) -> str:
+        atlas = hashlib.blake2b(self.atlas.bitmaps.tobytes(), digest_size=8)
+        atlas.update("".join(self.atlas.labels).encode())
+        return (
+            f"{type(self).__name__} {atlas.hexdigest()} {self.min_confidence} {self.min_margin}, "
+            f"or {self.fallback.version}"
+        )
+
+
+def create_engine(engine_type: OcrEngineType) -> OcrEngine:
+    if engine_type == OcrEngineType.GLYPHS:
+        try:
+            atlas = glyphs.GlyphAtlas.load()
+        except FileNotFoundError:
+            logger.warning("Could not find the glyph atlas, falling back to tesseract.", exc_info=True)
+        else:
+            return GlyphEngine(atlas, create_engine(OcrEngineType.TESSEROCR))
+
+    if engine_type in (OcrEngineType.TESSEROCR, OcrEngineType.GLYPHS):
+        try:
+            return TesserocrEngine()
+        except (ImportError, RuntimeError):
+            logger.warning("Could not load tesserocr, falling back to pytesseract.", exc_info=True)
+
+    return PytesseractEngine()
+
+
+def perceptual_hash(masked: np.ndarray) -> str:
+    """
+    Hash of the mask downscaled by blocks of a few pixels, so a couple of stray pixels do not change it, while two
+    different characters still do.
+    """
+    height = masked.shape[0] - masked.shape[0] % HASH_BLOCK_SIZE
+    width = masked.shape[1] - masked.shape[1] % HASH_BLOCK_SIZE
+    blocks = (masked[:height, :width] > 0).reshape(
+        height // HASH_BLOCK_SIZE, HASH_BLOCK_SIZE, width // HASH_BLOCK_SIZE, HASH_BLOCK_SIZE
+    )
+    downscaled = blocks.mean(axis=(1, 3)) > 0.5
+    return hashlib.blake2b(np.packbits(downscaled).tobytes(), digest_size=16).hexdigest()
+
+
+class StatementCache:
+    """
+    Least recently used statements, keyed by the perceptual hash of their mask. Statements are only saved for the engine
+    that read them, and the hash they are keyed by.
+    """
+
+    def __init__(self, max_size: int = 256, path: str | None = None, engine_version: str = ""):
+        self.max_size = max_size
+        self.path = path
+        self.engine_version = engine_version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._statements: OrderedDict[str, TaskStatement] = OrderedDict()
+
+        if self.path is not None and Path(self.path).exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def get(self, key: str) -> TaskStatement | None:
+        statement = self._statements.get(key)
+        if statement is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._statements.move_to_end(key)
+        return statement
+
+    def put(self, key: str, statement: TaskStatement) -> None:
+        self._statements[key] = statement
+        self._statements.move_to_end(key)
+        while len(self._statements) > self.max_size:
+            self._statements.popitem(last=False)
+
+    def evict(self, key: str) -> None:
+        if self._statements.pop(key, None) is not None:
+            self.evictions += 1
+
+    def version(self) -> dict[str, str | int]:
+        return {"engine": self.engine_version, "hash_block_size": HASH_BLOCK_SIZE}
+
+    def load(self) -> None:
+        with open(self.path) as cache_file:
+            cache = json.load(cache_file)
+        if cache.get("version") != self.version():
+            logger.info(f"Statements of {self.path} were read by another engine, they will be read again.")
+            return
+
+        for key, statement in cache["statements"].items():
+            self.put(key, TaskStatement(statement["title"], statement["description"]))
+        logger.info(f"Loaded {len(self)} statements from {self.path}.")
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+
+        # Descriptions that were never needed are not read just to be saved.
+        statements = {
+            key: {"title": s.title, "description": s.description}
+            for key, s in self._statements.items()
+            if not isinstance(s, LazyTaskStatement) or s.is_description_read
+        }
+        with open(self.path, "w") as cache_file:
+            json.dump({"version": self.version(), "statements": statements}, cache_file, indent=2)
+        logger.info(f"Saved {len(statements)} statements to {self.path}.")
+
+    def __str__(self) -> str:
+        return f"{len(self)} statements, {self.hits} hits, {self.misses} misses, {self.evictions} evicted"
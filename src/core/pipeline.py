@@ -0,0 +1,332 @@
+import enum
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from core import brain, clock, sensor
+from core.bot import Bot
+from core.brain import HoldInput, TaskStatement, VisibleTask
+
+logger = logging.getLogger(__name__)
+
+# Observations are dropped once the decision is this far behind, as only the latest frames matter.
+OBSERVATION_QUEUE_SIZE = 2
+ACTION_QUEUE_SIZE = 1
+# How long a stage waits on a queue before checking whether the pipeline stopped.
+QUEUE_TIMEOUT_SECONDS = 0.1
+WORKER_JOIN_TIMEOUT_SECONDS = 5
+
+
+class WorkerType(enum.Enum):
+    THREAD = SimpleNamespace(Worker=threading.Thread, Queue=queue.Queue, Event=threading.Event)
+    PROCESS = SimpleNamespace(Worker=multiprocessing.Process, Queue=multiprocessing.Queue, Event=multiprocessing.Event)
+
+
+class PipelineStoppedException(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Observation:
+    """What perception saw on a frame, with the same attributes the bot reads on a sensor.Frame."""
+
+    captured_at: float
+    """time.time() before the frame was captured."""
+    tasks: list[VisibleTask | None]
+    statement_request: int = 0
+    """Statement request answered by this observation, or 0 if the statement was not read."""
+    current_statement: TaskStatement | None = None
+    current_statement_key: str | None = None
+
+    @property
+    def has_found_tasks(self) -> bool:
+        return bool(self.tasks)
+
+    @property
+    def current_statement_title(self) -> str | None:
+        return None if self.current_statement is None else self.current_statement.title
+
+
+@dataclass
+class Plan:
+    """Keys sent by a task execution callback, with the pauses between them, to be sent by the actuation stage."""
+
+    steps: list[tuple[str, str | HoldInput | float]] = field(default_factory=list)
+
+    def execute(self, keyboard: brain.Keyboard) -> None:
+        for step, argument in self.steps:
+            if step == "send":
+                keyboard.send(argument)
+            elif step == "wait_for":
+                keyboard.wait_for(argument)
+            else:
+                time.sleep(argument)
+
+
+class PlanningKeyboard(brain.Keyboard):
+    def __init__(self, plan: Plan):
+        self.plan = plan
+
+    def send(self, key: str | HoldInput):
+        self.plan.steps.append(("send", key))
+
+    def wait_for(self, key: str):
+        self.plan.steps.append(("wait_for", key))
+
+
+class PlanningClock(clock.Clock):
+    """
+    Records the pauses of a callback instead of sleeping, while keeping the time the callback expects to see. Other
+    threads, which may be analysing frames meanwhile, still see the clock it replaces.
+    """
+
+    def __init__(self, plan: Plan, replaced: clock.Clock):
+        self.plan = plan
+        self.replaced = replaced
+        self._planner = threading.get_ident()
+        self._slept = timedelta()
+
+    def now(self) -> datetime:
+        if threading.get_ident() != self._planner:
+            return self.replaced.now()
+        return self.replaced.now() + self._slept
+
+    def sleep(self, seconds: float) -> None:
+        if threading.get_ident() != self._planner:
+            self.replaced.sleep(seconds)
+            return
+        self.plan.steps.append(("sleep", seconds))
+        self._slept += timedelta(seconds=seconds)
+
+
+def plan(callback: Callable[[brain.Keyboard], None]) -> Plan:
+    """Run a task execution callback, so the brain is updated right away, but only record the keys it sends."""
+    recorded = Plan()
+    replaced = clock.current
+    clock.current = PlanningClock(recorded, replaced)
+    try:
+        callback(PlanningKeyboard(recorded))
+    finally:
+        clock.current = replaced
+    return recorded
+
+
+def materialize(statement: TaskStatement | None) -> TaskStatement | None:
+    """
+    Statement that can be sent to the decision stage. The description is only read when the brain will need it, that is
+    when the title is not a known task.
+    """
+    if statement is None:
+        return None
+    if brain.find_task_instructions(statement.title) is not None:
+        return TaskStatement(statement.title, "")
+    return TaskStatement(statement.title, statement.description)
+
+
+def _put_latest(observations, observation: Observation) -> None:
+    """Queue the observation, dropping the oldest one if the decision is behind."""
+    while True:
+        try:
+            observations.put_nowait(observation)
+            return
+        except queue.Full:
+            try:
+                observations.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def perceive(
+    create_camera: Callable,
+    capture_mode: sensor.CaptureMode,
+    sensor_session: Callable[[], AbstractContextManager],
+    observations,
+    statement_request,
+    statement_wanted,
+    rejected_statements,
+    stopped,
+) -> None:
+    """
+    Perception stage: captures and analyses frames as fast as it can. The statement is only read while the decision
+    stage requests it, once it stopped moving. Statements the decision stage rejected are forgotten before reading.
+    """
+    stability = sensor.StatementStability()
+    with sensor_session():
+        camera = create_camera()
+        camera.start()
+        try:
+            _perceive(
+                camera,
+                capture_mode,
+                stability,
+                observations,
+                statement_request,
+                statement_wanted,
+                rejected_statements,
+                stopped,
+            )
+        finally:
+            camera.stop()
+
+
+def _perceive(
+    camera, capture_mode, stability, observations, statement_request, statement_wanted, rejected_statements, stopped
+) -> None:
+    answered_request = 0
+    while not stopped.is_set():
+        captured_at = time.time()
+        frame = sensor.create_frame(camera.get_latest_frame(), capture_mode)
+        sensor.analyse_waiting_tasks(frame)
+
+        # Checked before the request, which is always increased before the statement is wanted again.
+        request = statement_request.value if statement_wanted.value else 0
+        if request not in (0, answered_request):
+            answered_request = request
+            stability.reset()
+        if request == 0 or not stability.has_settled(frame):
+            _put_latest(observations, Observation(captured_at, frame.tasks))
+            continue
+
+        _forget_rejected(rejected_statements)
+        sensor.read_task_statement(frame)
+        statement = materialize(frame.current_statement)
+        _put_latest(
+            observations, Observation(captured_at, frame.tasks, request, statement, frame.current_statement_key)
+        )
+
+
+def _forget_rejected(rejected_statements) -> None:
+    while True:
+        try:
+            sensor.forget_statement(rejected_statements.get_nowait())
+        except queue.Empty:
+            return
+
+
+def actuate(create_keyboard: Callable[[], brain.Keyboard], actions, done, stopped) -> None:
+    """Actuation stage: sends the keys of every plan, then tells when it is done."""
+    keyboard = create_keyboard()
+    while not stopped.is_set():
+        try:
+            action = actions.get(timeout=QUEUE_TIMEOUT_SECONDS)
+        except queue.Empty:
+            continue
+        action.execute(keyboard)
+        done.put(time.time())
+
+
+class PipelinedBot(Bot):
+    """
+    Bot whose perception, decision and actuation run in separate workers, connected by bounded queues. Frames are
+    captured and analysed while the keys of the previous decision are sent.
+
+    The decision still waits for its keys to be sent before deciding again, and it ignores every frame captured before
+    then, so it never acts on a frame which does not show the outcome of its last action.
+    """
+
+    def __init__(
+        self,
+        create_camera: Callable,
+        create_keyboard: Callable[[], brain.Keyboard],
+        capture_mode: sensor.CaptureMode,
+        sensor_session: Callable[[], AbstractContextManager] = nullcontext,
+        worker_type: WorkerType = WorkerType.PROCESS,
+    ):
+        super().__init__(None, None, capture_mode, log_frames=False)
+        workers = worker_type.value
+        self.observations = workers.Queue(maxsize=OBSERVATION_QUEUE_SIZE)
+        self.actions = workers.Queue(maxsize=ACTION_QUEUE_SIZE)
+        self.done = workers.Queue()
+        self.rejected_statements = workers.Queue()
+        self.stopped = workers.Event()
+        # Every statement requested gets a new number, so an observation never answers an older request. The statement
+        # is no longer wanted once the decision acts.
+        self.statement_request = multiprocessing.Value("q", 0)
+        self.statement_wanted = multiprocessing.Value("b", False)
+        self.acted_at = 0.0
+        self.stale_observations = 0
+        self.workers = [
+            workers.Worker(
+                target=perceive,
+                args=(
+                    create_camera,
+                    capture_mode,
+                    sensor_session,
+                    self.observations,
+                    self.statement_request,
+                    self.statement_wanted,
+                    self.rejected_statements,
+                    self.stopped,
+                ),
+                name="perception",
+                daemon=True,
+            ),
+            workers.Worker(
+                target=actuate,
+                args=(create_keyboard, self.actions, self.done, self.stopped),
+                name="actuation",
+                daemon=True,
+            ),
+        ]
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        for worker in self.workers:
+            worker.join(WORKER_JOIN_TIMEOUT_SECONDS)
+
+    def _next_observation(self) -> Observation:
+        while True:
+            try:
+                observation = self.observations.get(timeout=QUEUE_TIMEOUT_SECONDS)
+            except queue.Empty:
+                if not all(worker.is_alive() for worker in self.workers):
+                    raise PipelineStoppedException()
+                continue
+
+            if observation.captured_at >= self.acted_at:
+                return observation
+            self.stale_observations += 1
+
+    def observe(self) -> Observation:
+        return self._next_observation()
+
+    def request_statement(self) -> None:
+        self.statement_request.value += 1
+        self.statement_wanted.value = True
+
+    def observe_statement(self) -> Observation:
+        request = self.statement_request.value
+        while True:
+            observation = self._next_observation()
+            if observation.statement_request == request:
+                return observation
+
+    def act(self, callback: Callable[[brain.Keyboard], None]) -> None:
+        self.statement_wanted.value = False
+        self.actions.put(plan(callback))
+        while True:
+            try:
+                self.acted_at = self.done.get(timeout=QUEUE_TIMEOUT_SECONDS)
+                return
+            except queue.Empty:
+                if not all(worker.is_alive() for worker in self.workers):
+                    raise PipelineStoppedException()
+
+    def reject_statement(self, frame: Observation) -> None:
+        # The statement cache lives in the perception worker, which forgets the statement before reading it again.
+        if frame.current_statement_key is not None:
+            self.rejected_statements.put(frame.current_statement_key)
+
+    def __str__(self) -> str:
+        return f"{self.stale_observations} observations captured before the last action were ignored"
@@ -0,0 +1,141 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from core import brain, clock, ocr, sensor, session
+from core.bot import Bot, Decision
+from core.brain import HoldInput, KEY_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class EndOfReplay(Exception):
+    pass
+
+
+class ReplayCamera:
+    """
+    Camera playing back a captured session on the virtual clock. The latest frame is the last one taken before the
+    clock, so time spent sleeping while executing a task skips frames, like it would in game.
+    """
+
+    def __init__(self, frames: session.SessionReader | session.FolderSession, replay_clock: clock.VirtualClock):
+        self.frames = frames
+        self.clock = replay_clock
+        self.position = -1
+
+    @property
+    def current_frame(self) -> str:
+        return self.frames.name(self.position) if self.position >= 0 else ""
+
+    def get_latest_frame(self) -> np.ndarray:
+        self.position = max(self.position + 1, self.frames.find(self.clock.now()))
+        if self.position >= len(self.frames):
+            raise EndOfReplay()
+
+        self.clock.advance_to(self.frames.timestamps[self.position])
+        return self.frames[self.position]
+
+    def flush(self) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class KeyPress:
+    at: datetime
+    frame: str
+    key: str
+    hold_seconds: float = 0
+
+
+class RecordingKeyboard(brain.Keyboard):
+    """
+    Keyboard recording every key instead of pressing it. Tapping or holding a key moves the virtual clock as long as it
+    takes in game.
+    """
+
+    def __init__(self, camera: ReplayCamera):
+        self.camera = camera
+        self.presses: list[KeyPress] = []
+
+    def send(self, key: str | HoldInput):
+        if isinstance(key, str):
+            self.presses.append(KeyPress(self.camera.clock.now(), self.camera.current_frame, key))
+            self.camera.clock.sleep(KEY_INTERVAL_SECONDS)
+        else:
+            self.presses.append(KeyPress(self.camera.clock.now(), self.camera.current_frame, key.key, key.hold_seconds))
+            self.camera.clock.sleep(key.hold_seconds)
+
+    def wait_for(self, key: str):
+        self.presses.append(KeyPress(self.camera.clock.now(), self.camera.current_frame, f"wait for {key}"))
+
+
+@dataclass
+class ReplayResult:
+    session: str
+    started_at: datetime
+    frames: int
+    loops: int
+    seconds: float
+    decisions: list[Decision] = field(default_factory=list)
+    presses: list[KeyPress] = field(default_factory=list)
+
+    @property
+    def decisions_per_second(self) -> float:
+        # Every loop decides what to do with its frame, even when it is to wait.
+        return self.loops / self.seconds if self.seconds else 0
+
+    def trace(self) -> list[str]:
+        events = sorted(
+            [(d.at, f"task {d.task}: {d.action}") for d in self.decisions]
+            + [
+                (p.at, f"{p.frame} {p.key}" + (f" for {p.hold_seconds}s" if p.hold_seconds else ""))
+                for p in self.presses
+            ],
+            key=lambda event: event[0],
+        )
+        return [f"{(at - self.started_at).total_seconds():8.3f}s {event}" for at, event in events]
+
+
+def replay_session(path: Path, capture_mode: sensor.CaptureMode, ocr_engine_type: ocr.OcrEngineType) -> ReplayResult:
+    """
+    Play a captured session, either a session file or a folder of captures, through the loop of the bot.
+    Everything the bot remembers is module state, so a process replays a single session at a time, starting from a
+    clean state.
+    """
+    frames = session.open_session(path)
+    if not len(frames):
+        raise FileNotFoundError(f"No frames found in {path}.")
+
+    replay_clock = clock.VirtualClock(frames.timestamps[0])
+    clock.current = replay_clock
+    brain.active_tasks = [None] * len(sensor.WAITING_TASK_REGIONS)
+    sensor.ocr_engine = ocr.create_engine(ocr_engine_type)
+    sensor.statement_cache = ocr.StatementCache()
+    sensor.slot_tracker = sensor.SlotTracker()
+    sensor.rush_overlay_smoother = sensor.RushOverlaySmoother()
+
+    camera = ReplayCamera(frames, replay_clock)
+    keyboard = RecordingKeyboard(camera)
+    bot = Bot(camera, keyboard, capture_mode, log_frames=False)
+
+    loops = 0
+    started_at = time.perf_counter()
+    try:
+        while True:
+            bot.loop()
+            loops += 1
+    except EndOfReplay:
+        pass
+    finally:
+        frames.close()
+        sensor.ocr_engine.close()
+        clock.current = clock.SystemClock()
+    seconds = time.perf_counter() - started_at
+
+    logger.info(f"Replayed {len(frames)} frames of {path} in {loops} loops and {seconds:.3f} seconds.")
+    return ReplayResult(str(path), frames.timestamps[0], len(frames), loops, seconds, bot.decisions, keyboard.presses)
@@ -0,0 +1,228 @@
+import asyncio
+import dataclasses
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from core import brain, clock, sensor
+from core.bot import Bot
+from core.brain import AsyncKeyboard, HoldInput
+from core.pipeline import Observation, Plan, materialize, plan
+
+logger = logging.getLogger(__name__)
+
+# An idle decision is taken again after this long, even if no frame changed and no timer went off.
+IDLE_RECHECK_SECONDS = 0.25
+
+
+class SyncKeyboardAdapter(AsyncKeyboard):
+    """Runs a blocking brain.Keyboard in a thread, so it can be used by the asyncio runtime."""
+
+    def __init__(self, keyboard: brain.Keyboard):
+        self.keyboard = keyboard
+
+    async def send(self, key: str | HoldInput):
+        await asyncio.to_thread(self.keyboard.send, key)
+
+    async def wait_for(self, key: str):
+        await asyncio.to_thread(self.keyboard.wait_for, key)
+
+
+async def perform(recorded: Plan, keyboard: AsyncKeyboard) -> None:
+    """Send the keys of a plan, pausing without blocking the event loop."""
+    for step, argument in recorded.steps:
+        if step == "send":
+            await keyboard.send(argument)
+        elif step == "wait_for":
+            await keyboard.wait_for(argument)
+        else:
+            await asyncio.sleep(argument)
+
+
+def task_deadlines(tasks: list[brain.Task | None]) -> dict[datetime, str]:
+    """Moments at which the brain will choose differently without any frame changing, like when a task is cooked."""
+    now = clock.now()
+    deadlines = {}
+    for task in tasks:
+        if task is None:
+            continue
+        if task.is_just_arrived:
+            deadlines[task.created_at + timedelta(seconds=brain.CREATION_DELAY_IN_SECONDS)] = (
+                f"Task {task.index} arrived"
+            )
+        if task.is_cooking:
+            deadlines[task.cooked_at] = f"Task {task.index} is cooked"
+        if task.is_completed and not task.is_expired:
+            deadlines[task.expire_at] = f"Task {task.index} expired"
+    return {moment: event for moment, event in deadlines.items() if moment > now}
+
+
+class AsyncBot(Bot):
+    """
+    Bot running on asyncio. Frames are captured and analysed continuously in a thread, while keys are sent by
+    coroutines, so holding a key does not stop the analysis. The decision runs the loop of Bot in another thread.
+
+    A decision waits for its keys to be sent, but the next one already uses the frames analysed while they were, except
+    for the slot of the task acted on, which keeps what was seen before acting until a frame captured after shows it.
+    Statements are only read from frames captured after their task was selected. When the brain has nothing to do, the
+    decision waits for the tasks on screen to change, or for a timer set on the next moment a task is ready, cooked or
+    expired, instead of deciding again on every frame.
+    """
+
+    def __init__(self, camera, keyboard: AsyncKeyboard | brain.Keyboard, capture_mode: sensor.CaptureMode):
+        super().__init__(camera, None, capture_mode, log_frames=False)
+        self.async_keyboard = keyboard if isinstance(keyboard, AsyncKeyboard) else SyncKeyboardAdapter(keyboard)
+        # Like in the pipeline, every statement requested gets a new number, and is no longer wanted once acting.
+        self.statement_request = 0
+        self.statement_wanted = False
+        self.acting_since = 0.0
+        self.acted_at = 0.0
+        self.busy_slot: int | None = None
+        self.timers_fired = 0
+        self.observed_while_acting = 0
+        self._observation: Observation | None = None
+        self._returned: Observation | None = None
+        self._consumed: Observation | None = None
+        self._decisions_seen = 0
+        self._rejected_statements: list[str] = []
+        self._woken = False
+        self._timers: list[asyncio.TimerHandle] = []
+        self._event_loop: asyncio.AbstractEventLoop | None = None
+        self._observed: asyncio.Condition | None = None
+
+    async def run(self, loops: int | None = None) -> None:
+        """Play until cancelled, or for a number of decision loops."""
+        self._event_loop = asyncio.get_running_loop()
+        self._observed = asyncio.Condition()
+        analysis = asyncio.create_task(self._analyse_frames())
+        try:
+            played = 0
+            while loops is None or played < loops:
+                await asyncio.to_thread(self.loop)
+                played += 1
+        finally:
+            analysis.cancel()
+            for timer in self._timers:
+                timer.cancel()
+
+    async def _analyse_frames(self) -> None:
+        answered_request = 0
+        while True:
+            request = self.statement_request if self.statement_wanted else 0
+            if request not in (0, answered_request):
+                answered_request = request
+                self.statement_stability.reset()
+            observation = await asyncio.to_thread(self._analyse, request)
+            async with self._observed:
+                self._observation = observation
+                self._observed.notify_all()
+
+    def _analyse(self, request: int) -> Observation:
+        captured_at = time.time()
+        frame = sensor.create_frame(self.camera.get_latest_frame(), self.capture_mode)
+        sensor.analyse_waiting_tasks(frame)
+        if request == 0 or not self.statement_stability.has_settled(frame):
+            return Observation(captured_at, frame.tasks)
+
+        while self._rejected_statements:
+            sensor.forget_statement(self._rejected_statements.pop())
+        sensor.read_task_statement(frame)
+        return Observation(
+            captured_at, frame.tasks, request, materialize(frame.current_statement), frame.current_statement_key
+        )
+
+    def _wake(self, event: str) -> None:
+        logger.info(f"{event}, deciding again.")
+        self.timers_fired += 1
+        self._woken = True
+        self._event_loop.create_task(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._observed:
+            self._observed.notify_all()
+
+    def _set_timers(self, deadlines: dict[datetime, str]) -> None:
+        for timer in self._timers:
+            timer.cancel()
+        now = clock.now()
+        self._timers = [
+            self._event_loop.call_later((moment - now).total_seconds(), self._wake, event)
+            for moment, event in deadlines.items()
+        ]
+
+    def _hide_busy_slot(self, observation: Observation) -> Observation:
+        """Observation captured while acting, with the slot acted on as it was seen before."""
+        if observation.captured_at >= self.acted_at or self.busy_slot is None or self._returned is None:
+            return observation
+
+        tasks = list(observation.tasks)
+        tasks[self.busy_slot] = self._returned.tasks[self.busy_slot]
+        return dataclasses.replace(observation, tasks=tasks)
+
+    async def _next_observation(
+        self, accept: Callable[[Observation], bool], idle: bool, deadlines: dict[datetime, str], since: float
+    ) -> Observation:
+        self._woken = False
+        self._set_timers(deadlines)
+        idle_until = self._event_loop.time() + IDLE_RECHECK_SECONDS
+        last_tasks = None if self._returned is None else self._returned.tasks
+
+        def is_ready() -> bool:
+            observation = self._observation
+            if observation is None or observation is self._consumed or observation.captured_at < since:
+                return False
+            if not accept(observation):
+                return False
+            tasks = self._hide_busy_slot(observation).tasks
+            return not idle or tasks != last_tasks or self._woken or self._event_loop.time() >= idle_until
+
+        async with self._observed:
+            await self._observed.wait_for(is_ready)
+            self._consumed = self._observation
+            observation = self._hide_busy_slot(self._consumed)
+            if observation is not self._consumed:
+                self.observed_while_acting += 1
+            self._returned = observation
+            return observation
+
+    def _call(self, coroutine):
+        """Run a coroutine on the event loop from the decision thread, and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._event_loop).result()
+
+    def observe(self) -> Observation:
+        idle = self._decisions_seen == len(self.decisions)
+        self._decisions_seen = len(self.decisions)
+        return self._call(
+            self._next_observation(lambda _: True, idle, task_deadlines(brain.active_tasks), self.acting_since)
+        )
+
+    def request_statement(self) -> None:
+        self.statement_request += 1
+        self.statement_wanted = True
+
+    def observe_statement(self) -> Observation:
+        request = self.statement_request
+        return self._call(self._next_observation(lambda o: o.statement_request == request, False, {}, self.acted_at))
+
+    def act(self, callback: Callable[[brain.Keyboard], None]) -> None:
+        self.statement_wanted = False
+        self.busy_slot = self.decisions[-1].task - 1 if self.decisions else None
+        self._call(self._act(plan(callback)))
+
+    def reject_statement(self, frame: Observation) -> None:
+        # Forgotten by the analysis, so the statement cache is only used from its thread.
+        if frame.current_statement_key is not None:
+            self._rejected_statements.append(frame.current_statement_key)
+
+    async def _act(self, recorded: Plan) -> None:
+        acting_since = time.time()
+        await perform(recorded, self.async_keyboard)
+        self.acting_since = acting_since
+        self.acted_at = time.time()
+
+    def __str__(self) -> str:
+        return (
+            f"{self.timers_fired} decisions woken by a timer, {self.observed_while_acting} taken on frames analysed"
+            f" while keys were sent"
+        )
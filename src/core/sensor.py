@@ -1,15 +1,19 @@
+import enum
 import logging
 import re
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import cache
 
 import cv2
 import numpy as np
 from numpy import float64
-from pytesseract import pytesseract
 
 from botkit import sensor_util, img_logger
 from botkit.profiling import timeit
-from core.brain import TaskStatement, VisibleTask, TaskStatus
+from core import clock, glyphs
+from core.brain import LazyTaskStatement, TaskStatement, VisibleTask, TaskStatus
+from core.ocr import OcrEngine, PytesseractEngine, StatementCache, perceptual_hash
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +38,8 @@ WAITING_TASK_REGIONS = [
 WAITING_TASK_MASK = sensor_util.HsvColorBoundary(np.array([0, 0, 250]), np.array([5, 5, 255]))
 WAITING_TASK_BLINK_MASK = sensor_util.HsvColorBoundary(np.array([0, 0, 49]), np.array([5, 5, 51]))
 EXPECTED_WAITING_TASK_BACKGROUND_DARKNESS = np.array([255], dtype=np.uint8) - np.array([28], dtype=np.uint8)
+# The overlay fades in and out over a few frames, so the background can move by a level without the overlay changing.
+RUSH_OVERLAY_LEVEL_TOLERANCE = 1
 
 STATUS_TASK_1_REGION = sensor_util.Region.of_corners(216, 85, 242, 116)
 STATUS_TASK_2_REGION = sensor_util.Region.of_corners(216, 144, 242, 175)
@@ -54,27 +60,71 @@ STATUS_TASK_REGIONS = [
     STATUS_TASK_8_REGION,
 ]
 STATUS_TASK_MASK = sensor_util.HsvColorBoundary(np.array([0, 0, 25]), np.array([255, 100, 160]))
+# The waiting clock is a filled disc surrounded by a blank gap. Its radius is the one HoughCircles was looking for, and
+# its center moves a bit as the clock bounces.
+STATUS_RING_RADII = range(8, 12)
+STATUS_RING_CENTERS_X = np.arange(10.5, 15)
+STATUS_RING_CENTERS_Y = np.arange(10.5, 21)
+STATUS_RING_THRESHOLD = 0.6
 
 CURRENT_STATEMENT_REGION = sensor_util.Region.of_corners(270, 562, 1035, 677)
 CURRENT_STATEMENT_MASK_1 = sensor_util.HsvColorBoundary(np.array([0, 0, 0]), np.array([255, 255, 20]))
 CURRENT_STATEMENT_MASK_2 = sensor_util.HsvColorBoundary(np.array([0, 20, 0]), np.array([255, 40, 111]))
 
+
+# Only these regions of the window are read, so the ROI frame packs them in a compact mosaic. Every slot is a region of
+# its own, as the columns of slots are mostly made of the gaps between them.
+REGIONS_OF_INTEREST = [*WAITING_TASK_REGIONS, *STATUS_TASK_REGIONS, CURRENT_STATEMENT_REGION]
+
+# The statement box is animated when a task is selected. After this delay, it is read even if it still moves.
+STATEMENT_SETTLE_TIMEOUT = timedelta(seconds=1)
+
+# The title is drawn at the top of the statement box, and the description lines from this row.
+STATEMENT_DESCRIPTION_TOP = 42
+# Lines shorter than a capital letter are leftovers of the previous statement.
+STATEMENT_MIN_LINE_HEIGHT = 16
+
+# A statement is made of a few dozen glyphs aligned on the baselines of its lines, while the leftovers of a previous
+# statement are hundreds of specks of a few pixels.
+STATEMENT_MAX_COMPONENTS = 150
+STATEMENT_MIN_GLYPH_HEIGHT = 10
+STATEMENT_MIN_ALIGNED_GLYPHS = 3
+
 TITLE_PATTERN = re.compile(r"(\w[\w\s()/\-.&]+)")
-DESCRIPTION_PATTERN = re.compile(r".+")
 
 
 class NoStatementFoundException(Exception):
     pass
 
 
+class CaptureMode(enum.Enum):
+    FULL_WINDOW = enum.auto()
+    REGIONS_OF_INTEREST = enum.auto()
+
+
+class StatusDetection(enum.Enum):
+    RING_TEMPLATE = enum.auto()
+    HOUGH_CIRCLES = enum.auto()
+
+
+STATUS_DETECTION = StatusDetection.RING_TEMPLATE
+
+ocr_engine: OcrEngine = PytesseractEngine()
+statement_cache = StatementCache()
+
+
 @dataclass
 class Frame:
     img: np.ndarray = field(repr=False)
 
     tasks: list[VisibleTask | None] | None = None
     current_statement: TaskStatement | None = None
+    current_statement_key: str | None = None
+    """Perceptual hash under which the statement is cached."""
 
     _rush_overlay_ratio: float64 | None = None
+    _rush_overlay_lut: np.ndarray | None = None
+    _hsv: dict[tuple, np.ndarray] = field(default_factory=dict, repr=False)
 
     @property
     def has_found_tasks(self) -> bool:
@@ -86,58 +136,341 @@ class Frame:
             return None
         return self.current_statement.title
 
+    def crop(self, region: sensor_util.Region) -> np.ndarray:
+        return sensor_util.crop(self.img, region)
+
+    def stack(self, regions: list[sensor_util.Region]) -> np.ndarray:
+        return stack_regions(self.img, regions)
+
+    def hsv(self, region: sensor_util.Region) -> np.ndarray:
+        """Overlay corrected HSV image of a region, converted once per frame and shared by all its masks."""
+        key = region.corners
+        if key not in self._hsv:
+            self._hsv[key] = to_hsv(self.fix_rush_overlay_greyscale(self.crop(region)))
+        return self._hsv[key]
+
+    def hsv_stack(self, regions: list[sensor_util.Region], indexes: list[int]) -> np.ndarray:
+        """Overlay corrected HSV images of some of the stacked regions, converted once per frame."""
+        key = (tuple(region.corners for region in regions), tuple(indexes))
+        if key not in self._hsv:
+            self._hsv[key] = to_hsv(self.fix_rush_overlay_greyscale(self.stack(regions)[indexes]))
+        return self._hsv[key]
+
     def fix_rush_overlay_greyscale(self, img: np.ndarray) -> np.ndarray:
         if self._rush_overlay_ratio is None:
             self._detect_rush_overlay_strength()
 
-        if self._rush_overlay_ratio:
-            return (255 - (255 - img) / self._rush_overlay_ratio).astype(np.uint8)
-        return img
+        if self._rush_overlay_lut is None:
+            return img
+        # The crops are views of the frame, which is still read afterward, so the table is applied to a new image.
+        contiguous = np.ascontiguousarray(img)
+        return cv2.LUT(contiguous.reshape(-1, contiguous.shape[-1]), self._rush_overlay_lut).reshape(img.shape)
 
     def _detect_rush_overlay_strength(self) -> None:
-        waiting_task_background_color = self.img[WAITING_TASK_1_REGION.top, WAITING_TASK_1_REGION.left, 0]
-        actual_waiting_task_background_darkness = np.array([255], dtype=np.uint8) - waiting_task_background_color
-        self._rush_overlay_ratio = actual_waiting_task_background_darkness / EXPECTED_WAITING_TASK_BACKGROUND_DARKNESS
+        waiting_task_background_color = self.crop(WAITING_TASK_1_REGION)[0, 0, 0]
+        if rush_overlay_smoother is not None:
+            waiting_task_background_color = rush_overlay_smoother.smooth(waiting_task_background_color)
+
+        self._rush_overlay_ratio = _rush_overlay_ratio(waiting_task_background_color)
+        self._rush_overlay_lut = _rush_overlay_lut(int(waiting_task_background_color))
 
         if self._rush_overlay_ratio[0] > 0.1:
             logger.info(f"Rush hour detected. Overlay strength: {1 - self._rush_overlay_ratio}")
 
 
+def _rush_overlay_ratio(waiting_task_background_color: np.uint8) -> np.ndarray:
+    actual_waiting_task_background_darkness = np.array([255], dtype=np.uint8) - waiting_task_background_color
+    return actual_waiting_task_background_darkness / EXPECTED_WAITING_TASK_BACKGROUND_DARKNESS
+
+
+@cache
+def _rush_overlay_lut(waiting_task_background_color: int) -> np.ndarray | None:
+    """
+    Lookup table undoing the rush hour overlay. It is the float correction applied to every possible value, so it
+    gives exactly the same pixels. None when there is nothing to correct.
+    """
+    ratio = _rush_overlay_ratio(np.uint8(waiting_task_background_color))
+    if not ratio or ratio[0] == 1:
+        return None
+
+    levels = np.arange(256, dtype=np.uint8)
+    return (255 - (255 - levels) / ratio).astype(np.uint8)
+
+
+# Number of colour conversions since the start, to follow how many each loop does.
+colour_conversions = 0
+
+
+def to_hsv(img: np.ndarray) -> np.ndarray:
+    """Convert an image, or a stack of images, to HSV in a single call."""
+    global colour_conversions
+    colour_conversions += 1
+
+    rgb = np.ascontiguousarray(img).reshape(-1, *img.shape[-2:])
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV).reshape(img.shape)
+
+
+def in_range(hsv: np.ndarray, boundary: sensor_util.HsvColorBoundary) -> np.ndarray:
+    """Mask an HSV image, or a stack of them, like sensor_util.mask does with an RGB one."""
+    masked = cv2.inRange(hsv.reshape(-1, *hsv.shape[-2:]), boundary.lower, boundary.upper)
+    return masked.reshape(hsv.shape[:-1])
+
+
+class RushOverlaySmoother:
+    """Keeps the overlay of the previous frames while the background only moves by a level or so."""
+
+    def __init__(self, tolerance: int = RUSH_OVERLAY_LEVEL_TOLERANCE):
+        self.tolerance = tolerance
+        self.changes = 0
+        self._color: np.uint8 | None = None
+
+    def smooth(self, waiting_task_background_color: np.uint8) -> np.uint8:
+        if self._color is None or abs(int(waiting_task_background_color) - int(self._color)) > self.tolerance:
+            self._color = waiting_task_background_color
+            self.changes += 1
+        return self._color
+
+
+# Set by the bot to keep the same overlay correction across frames. None measures the overlay on every frame.
+rush_overlay_smoother: RushOverlaySmoother | None = None
+
+
+class RoiFrame(Frame):
+    """
+    Frame holding only the regions of interest of the window, packed in a mosaic. Regions are given in window
+    coordinates, like for a full frame, and are translated to the mosaic.
+    """
+
+    @classmethod
+    def of_window(cls, window: np.ndarray) -> "RoiFrame":
+        mosaic = np.zeros((_ROI_MOSAIC_HEIGHT, _ROI_MOSAIC_WIDTH, *window.shape[2:]), dtype=window.dtype)
+        for roi, left, top in _ROI_LAYOUT:
+            cropped = sensor_util.crop(window, roi)
+            mosaic[top : top + cropped.shape[0], left : left + cropped.shape[1]] = cropped
+        return cls(mosaic)
+
+    def crop(self, region: sensor_util.Region) -> np.ndarray:
+        return sensor_util.crop(self.img, _to_mosaic(region))
+
+    def stack(self, regions: list[sensor_util.Region]) -> np.ndarray:
+        return stack_regions(self.img, [_to_mosaic(region) for region in regions])
+
+
+def _layout_regions_of_interest() -> tuple[list[tuple[sensor_util.Region, int, int]], int, int]:
+    """
+    Shelf packing: from the tallest region to the shortest, regions are placed left to right on a shelf as wide as the
+    widest region, and a new shelf is started below when the next one does not fit.
+
+    :return: the region, left and top of every region in the mosaic, with the width and height of the mosaic.
+    """
+    regions = sorted(REGIONS_OF_INTEREST, key=lambda roi: roi.corners[3] - roi.corners[1], reverse=True)
+    width = max(roi.corners[2] - roi.corners[0] for roi in regions)
+    layout = []
+    left = shelf_top = shelf_height = 0
+    for roi in regions:
+        roi_width, roi_height = roi.corners[2] - roi.corners[0], roi.corners[3] - roi.corners[1]
+        if left + roi_width > width:
+            left, shelf_top, shelf_height = 0, shelf_top + shelf_height, 0
+        layout.append((roi, left, shelf_top))
+        left += roi_width
+        shelf_height = max(shelf_height, roi_height)
+    return layout, width, shelf_top + shelf_height
+
+
+_ROI_LAYOUT, _ROI_MOSAIC_WIDTH, _ROI_MOSAIC_HEIGHT = _layout_regions_of_interest()
+
+
+def _to_mosaic(region: sensor_util.Region) -> sensor_util.Region:
+    left, top, right, bottom = region.corners
+    for roi, mosaic_left, mosaic_top in _ROI_LAYOUT:
+        roi_left, roi_top, roi_right, roi_bottom = roi.corners
+        if roi_left <= left and roi_top <= top and right <= roi_right and bottom <= roi_bottom:
+            return sensor_util.Region.of_corners(
+                left - roi_left + mosaic_left,
+                top - roi_top + mosaic_top,
+                right - roi_left + mosaic_left,
+                bottom - roi_top + mosaic_top,
+            )
+
+    raise ValueError(f"{region} is not in the regions of interest.")
+
+
+def create_frame(window: np.ndarray, capture_mode: CaptureMode = CaptureMode.FULL_WINDOW) -> Frame:
+    if capture_mode == CaptureMode.REGIONS_OF_INTEREST:
+        return RoiFrame.of_window(window)
+    return Frame(window)
+
+
+class SlotTracker:
+    """
+    Remembers the pixels and the result of every task slot, so a slot is only analysed again when its waiting task or
+    status region changed since the previous frame.
+    """
+
+    def __init__(self):
+        self.skipped = 0
+        self.recomputed = 0
+        self._waiting_slots: np.ndarray | None = None
+        self._status_slots: np.ndarray | None = None
+        self._tasks: list[VisibleTask | None] = [None] * len(WAITING_TASK_REGIONS)
+
+    def changed_slots(self, frame: Frame) -> list[int]:
+        waiting_slots = frame.stack(WAITING_TASK_REGIONS)
+        status_slots = frame.stack(STATUS_TASK_REGIONS)
+
+        # The rush hour overlay is measured on the first slot, and changes how every slot is corrected.
+        if self._waiting_slots is None or np.any(waiting_slots[0, 0, 0] != self._waiting_slots[0, 0, 0]):
+            changed = np.ones(len(WAITING_TASK_REGIONS), dtype=bool)
+        else:
+            changed = np.any(waiting_slots != self._waiting_slots, axis=(1, 2, 3))
+            changed |= np.any(status_slots != self._status_slots, axis=(1, 2, 3))
+
+        self._waiting_slots = waiting_slots.copy()
+        self._status_slots = status_slots.copy()
+
+        changed_slots = np.flatnonzero(changed).tolist()
+        self.recomputed += len(changed_slots)
+        self.skipped += len(changed) - len(changed_slots)
+        return changed_slots
+
+    def previous_tasks(self) -> list[VisibleTask | None]:
+        return list(self._tasks)
+
+    def remember(self, tasks: list[VisibleTask | None]) -> None:
+        self._tasks = list(tasks)
+
+    def __str__(self) -> str:
+        return f"{self.recomputed} slots recomputed, {self.skipped} skipped"
+
+
+# Set by the bot to reuse the slots that did not change between frames. None analyses every slot of every frame.
+slot_tracker: SlotTracker | None = None
+
+
 @timeit(name="analyse_waiting_tasks", print_each_call=True)
 def analyse_waiting_tasks(frame: Frame, log_steps="") -> None:
-    frame.tasks = [None, None, None, None, None, None, None, None]
-
-    for i, region in enumerate(WAITING_TASK_REGIONS):
-        task_number = i + 1
-        cropped_task = sensor_util.crop(frame.img, region)
-        if np.any(cropped_task[0, 0] != cropped_task[0, 0].flat[0]):
-            logger.debug(f"Task {task_number} is not present.")
-            continue
+    if slot_tracker is None:
+        frame.tasks = [None] * len(WAITING_TASK_REGIONS)
+        waiting_tasks = np.flatnonzero(find_waiting_tasks(frame, log_steps=log_steps)).tolist()
+    else:
+        frame.tasks = slot_tracker.previous_tasks()
+        slots = slot_tracker.changed_slots(frame)
+        for i in slots:
+            frame.tasks[i] = None
+        waiting_tasks = np.flatnonzero(find_waiting_tasks(frame, slots, log_steps=log_steps)).tolist()
+
+    for i, status in zip(waiting_tasks, find_task_statuses(frame, waiting_tasks, log_steps=log_steps)):
+        frame.tasks[i] = VisibleTask(i + 1, status)
+
+    if slot_tracker is not None:
+        slot_tracker.remember(frame.tasks)
+
+
+def find_waiting_tasks(frame: Frame, indexes: list[int] | None = None, log_steps="") -> np.ndarray:
+    """
+    Detect all the waiting task slots at once. The slots are stacked in a single (8, H, W, C) view, then the overlay
+    correction and both masks are applied in one pass over the slots that are not empty, instead of once per slot.
+
+    :param indexes: the slots to look at, all of them by default.
+    :return: a boolean vector telling which slots have a waiting task.
+    """
+    slots = frame.stack(WAITING_TASK_REGIONS)
+    waiting = np.zeros(len(slots), dtype=bool)
+
+    # An empty slot has a coloured background, while a waiting task has a grey one.
+    corners = slots[:, 0, 0]
+    grey = np.all(corners == corners[:, :1], axis=1)
+    if indexes is not None:
+        grey &= np.isin(np.arange(len(slots)), indexes)
+    candidates = np.flatnonzero(grey)
+    if not candidates.size:
+        return waiting
+
+    hsv_slots = frame.hsv_stack(WAITING_TASK_REGIONS, candidates.tolist())
+    masked = np.bitwise_or(in_range(hsv_slots, WAITING_TASK_MASK), in_range(hsv_slots, WAITING_TASK_BLINK_MASK))
 
-        cropped_task = frame.fix_rush_overlay_greyscale(cropped_task)
-        if log_steps:
-            img_logger.log_now(cropped_task, f"{log_steps}_{task_number}_cropped.tiff")
+    if log_steps:
+        candidate_slots = frame.fix_rush_overlay_greyscale(slots[candidates])
+        for i, candidate in enumerate(candidates):
+            img_logger.log_now(candidate_slots[i], f"{log_steps}_{candidate + 1}_cropped.tiff")
+            img_logger.log_now(masked[i], f"{log_steps}_{candidate + 1}_masked.tiff")
+
+    waiting[candidates] = np.count_nonzero(masked.reshape(len(candidates), -1), axis=1) > 100
+    return waiting
+
+
+def stack_regions(img: np.ndarray, regions: list[sensor_util.Region]) -> np.ndarray:
+    """
+    View regions of the same size, equally spaced along a column or a row, as a single (n, H, W, C) array. No pixel is
+    copied.
+    """
+    first = regions[0]
+    step_y = regions[1].top - first.top if len(regions) > 1 else 0
+    step_x = regions[1].left - first.left if len(regions) > 1 else 0
+    if (
+        step_y < 0
+        or step_x < 0
+        or any(
+            region.left != first.left + i * step_x or region.top != first.top + i * step_y
+            for i, region in enumerate(regions)
+        )
+    ):
+        raise ValueError("Regions must be equally spaced to be stacked.")
+
+    height, width = sensor_util.crop(img, first).shape[:2]
+    origin = img[first.top :, first.left :]
+    return np.lib.stride_tricks.as_strided(
+        origin,
+        shape=(len(regions), height, width, *img.shape[2:]),
+        strides=(step_y * img.strides[0] + step_x * img.strides[1], *img.strides),
+        writeable=False,
+    )
 
-        masked_active = sensor_util.mask(cropped_task, WAITING_TASK_MASK)
-        masked_blink = sensor_util.mask(cropped_task, WAITING_TASK_BLINK_MASK)
-        masked = np.add(masked_active, masked_blink)
-        if log_steps:
-            img_logger.log_now(masked, f"{log_steps}_{task_number}_masked.tiff")
-        if not (np.sum(masked) > 255 * 100):
-            continue
 
-        frame.tasks[i] = VisibleTask(task_number, find_task_status(frame, i, log_steps=log_steps))
+def find_task_statuses(frame: Frame, indexes: list[int], log_steps="") -> list[TaskStatus]:
+    if STATUS_DETECTION == StatusDetection.HOUGH_CIRCLES:
+        return [find_task_status(frame, i, log_steps=log_steps) for i in indexes]
 
+    if not indexes:
+        return []
 
-def find_task_status(frame: Frame, i: int, log_steps="") -> TaskStatus:
-    cropped_status = sensor_util.crop(frame.img, STATUS_TASK_REGIONS[i])
-    cropped_status = frame.fix_rush_overlay_greyscale(cropped_status)
+    masked = in_range(frame.hsv_stack(STATUS_TASK_REGIONS, indexes), STATUS_TASK_MASK)
+    n, height, width = masked.shape
 
     if log_steps:
-        img_logger.log_now(cropped_status, f"{log_steps}_{i+1}_status_cropped.tiff")
+        cropped_statuses = frame.fix_rush_overlay_greyscale(frame.stack(STATUS_TASK_REGIONS)[indexes])
+        for j, i in enumerate(indexes):
+            img_logger.log_now(cropped_statuses[j], f"{log_steps}_{i+1}_status_cropped.tiff")
+            img_logger.log_now(masked[j], f"{log_steps}_{i+1}_status_masked.tiff")
+
+    scores = (masked.reshape(n, -1) > 0).astype(np.float32) @ _ring_templates(height, width)
+    return [TaskStatus.WAITING if score > STATUS_RING_THRESHOLD else TaskStatus.READY for score in scores.max(axis=1)]
+
+
+@cache
+def _ring_templates(height: int, width: int) -> np.ndarray:
+    """
+    Every column is a ring template: the outer band of a disc, which must be filled, and the band right around it,
+    which must be empty. The dot product of a mask with a template is 1 for a perfect match.
+    """
+    ys, xs = np.mgrid[0:height, 0:width]
+    templates = []
+    for radius in STATUS_RING_RADII:
+        for center_y in STATUS_RING_CENTERS_Y:
+            for center_x in STATUS_RING_CENTERS_X:
+                distances = np.hypot(ys - center_y, xs - center_x)
+                ring = (distances > radius - 2) & (distances <= radius)
+                gap = (distances > radius) & (distances <= radius + 2)
+                templates.append((ring / ring.sum() - gap / gap.sum()).ravel())
+    return np.array(templates, dtype=np.float32).T
+
 
-    masked = sensor_util.mask(cropped_status, STATUS_TASK_MASK)
+def find_task_status(frame: Frame, i: int, log_steps="") -> TaskStatus:
+    masked = in_range(frame.hsv(STATUS_TASK_REGIONS[i]), STATUS_TASK_MASK)
     if log_steps:
+        # Copied, as circles are drawn on it.
+        cropped_status = frame.fix_rush_overlay_greyscale(frame.crop(STATUS_TASK_REGIONS[i])).copy()
+        img_logger.log_now(cropped_status, f"{log_steps}_{i+1}_status_cropped.tiff")
         img_logger.log_now(masked, f"{log_steps}_{i+1}_status_masked.tiff")
 
     circles = cv2.HoughCircles(
@@ -157,20 +490,39 @@ def find_task_status(frame: Frame, i: int, log_steps="") -> TaskStatus:
     return TaskStatus.WAITING
 
 
+class StatementStability:
+    """
+    Follows the statement box across frames, so it is only read once its text stopped moving. Reading it during its
+    animation wastes an OCR call, or worse, reads a truncated statement.
+    """
+
+    def __init__(self, timeout: timedelta = STATEMENT_SETTLE_TIMEOUT):
+        self.timeout = timeout
+        self._started_at: datetime | None = None
+        self._previous_key: str | None = None
+
+    def reset(self) -> None:
+        self._started_at = clock.now()
+        self._previous_key = None
+
+    def has_settled(self, frame: Frame) -> bool:
+        if self._started_at is None:
+            self.reset()
+
+        key = perceptual_hash(mask_statement(frame))
+        settled = key == self._previous_key
+        self._previous_key = key
+
+        if not settled and clock.now() - self._started_at > self.timeout:
+            logger.warning(f"Statement did not settle after {self.timeout}, will read it anyway.")
+            return True
+
+        return settled
+
+
 @timeit(name="read_task_statement", print_each_call=True)
 def read_task_statement(frame: Frame, log_steps="") -> None:
-    cropped = sensor_util.crop(frame.img, CURRENT_STATEMENT_REGION)
-    cropped = frame.fix_rush_overlay_greyscale(cropped)
-
-    if log_steps:
-        img_logger.log_now(cropped, log_steps + "_cropped.png")
-    masked_1 = sensor_util.mask(cropped, CURRENT_STATEMENT_MASK_1)
-    masked_2 = sensor_util.mask(cropped, CURRENT_STATEMENT_MASK_2)
-    masked = np.logical_or(masked_1, masked_2)
-    if log_steps:
-        img_logger.log_now(masked_1, log_steps + "_masked1.png")
-        img_logger.log_now(masked_2, log_steps + "_masked2.png")
-        img_logger.log_now(masked, log_steps + "_masked.png")
+    masked = mask_statement(frame, log_steps=log_steps)
 
     # Statement mask finds white text on a black background, so if there is too much white, we assume
     # that there is no task statement.
@@ -178,30 +530,100 @@ def read_task_statement(frame: Frame, log_steps="") -> None:
         logger.warning("No task statement found.")
         return
 
-    statement: str | None = pytesseract.image_to_string(masked, lang="eng")
-    logger.info(f"Extracted `{statement}` from image.")
-    if not statement:
+    if not looks_like_statement(masked):
+        logger.info("Statement box only holds fragments of text.")
         return
 
-    statement_split = statement.split("\n")
-    title = description = None
-    for txt in statement_split:
-        if title is None:
-            match = TITLE_PATTERN.search(txt)
-            if match is not None:
-                title = match.group()
-                continue
-        else:
-            match = DESCRIPTION_PATTERN.match(txt)
-            if match is not None:
-                if description is None:
-                    description = txt
-                    continue
-
-                description += " " + txt
-                continue
+    key = perceptual_hash(masked)
+    statement = statement_cache.get(key)
+    if statement is not None:
+        logger.info(f"Statement {statement} was already read.")
+        frame.current_statement = statement
+        frame.current_statement_key = key
+        return
 
-    if title is None or description is None:
+    statement = _extract_statement(masked)
+    if statement is None:
         return
 
-    frame.current_statement = TaskStatement(title, description)
+    statement_cache.put(key, statement)
+    frame.current_statement = statement
+    frame.current_statement_key = key
+
+
+def forget_statement(key: str | None) -> None:
+    """Forget a statement the brain could not understand, as it may be misread, so it is read again next time."""
+    if key is not None:
+        statement_cache.evict(key)
+
+
+def looks_like_statement(masked: np.ndarray) -> bool:
+    """
+    Tell whether the statement box holds a statement from the connected components of its mask, without any OCR. There
+    must not be too many of them, and glyph sized ones must line up on a baseline, both in the title and in the
+    description.
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats(masked.astype(np.uint8), connectivity=8)
+    if count - 1 > STATEMENT_MAX_COMPONENTS:
+        return False
+
+    tops, heights = stats[1:, cv2.CC_STAT_TOP], stats[1:, cv2.CC_STAT_HEIGHT]
+    glyphs_sized = heights >= STATEMENT_MIN_GLYPH_HEIGHT
+    title = glyphs_sized & (tops > 0) & (tops < STATEMENT_DESCRIPTION_TOP)
+    description = glyphs_sized & (tops >= STATEMENT_DESCRIPTION_TOP)
+    return all(
+        _count_aligned(tops[line] + heights[line]) >= STATEMENT_MIN_ALIGNED_GLYPHS for line in (title, description)
+    )
+
+
+def _count_aligned(bottoms: np.ndarray) -> int:
+    """Number of components sitting on the most common baseline, give or take a pixel."""
+    if not bottoms.size:
+        return 0
+    baseline = np.bincount(bottoms).argmax()
+    return int(np.count_nonzero(np.abs(bottoms - baseline) <= 1))
+
+
+def _extract_statement(masked: np.ndarray) -> TaskStatement | None:
+    """
+    Lines are segmented before OCR, then the title is the line at the top of the box and the description is made of the
+    lines below it. Lines cut by the top of the box are not part of the statement. Only the title is read right away,
+    the description is read if it is needed.
+    """
+    title_lines, description_lines = [], []
+    for rows, line in glyphs.segment_lines(masked):
+        if rows.start == 0 or rows.stop - rows.start < STATEMENT_MIN_LINE_HEIGHT:
+            continue
+        (title_lines if rows.start < STATEMENT_DESCRIPTION_TOP else description_lines).append(line)
+
+    if len(title_lines) != 1 or not description_lines:
+        logger.info(f"Found {len(title_lines)} title and {len(description_lines)} description lines.")
+        return None
+
+    title = ocr_engine.image_to_line(title_lines[0])
+    logger.info(f"Extracted title `{title}` from image.")
+    match = TITLE_PATTERN.search(title)
+    if match is None:
+        return None
+
+    def read_description() -> str:
+        description = " ".join(line for line in ocr_engine.images_to_lines(description_lines) if line)
+        logger.info(f"Extracted description `{description}` from image.")
+        return description
+
+    return LazyTaskStatement(match.group(), read_description)
+
+
+def mask_statement(frame: Frame, log_steps="") -> np.ndarray:
+    if log_steps:
+        cropped = frame.fix_rush_overlay_greyscale(frame.crop(CURRENT_STATEMENT_REGION))
+        img_logger.log_now(cropped, log_steps + "_cropped.png")
+    hsv = frame.hsv(CURRENT_STATEMENT_REGION)
+    masked_1 = in_range(hsv, CURRENT_STATEMENT_MASK_1)
+    masked_2 = in_range(hsv, CURRENT_STATEMENT_MASK_2)
+    masked = np.logical_or(masked_1, masked_2)
+    if log_steps:
+        img_logger.log_now(masked_1, log_steps + "_masked1.png")
+        img_logger.log_now(masked_2, log_steps + "_masked2.png")
+        img_logger.log_now(masked, log_steps + "_masked.png")
+    return masked
@@ -0,0 +1,249 @@
+import logging
+import mmap
+import struct
+import zlib
+from bisect import bisect_right
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SESSION_SUFFIX = ".session"
+FRAMES_PER_CHUNK = 16
+# Level 1 compresses a chunk of frames about as well as level 6, in a fraction of the time.
+COMPRESSION_LEVEL = 1
+
+CHUNK_MAGIC = b"CSDC"
+# Magic, frame count, height, width and channels. The timestamp and compressed size of every frame follow.
+CHUNK_HEADER = struct.Struct("<4sIIII")
+
+FRAME_PATTERNS = ("*.tiff", "*.png")
+# Captured frames are named after the moment they were taken, like 2025-10-20T194832.111818.tiff.
+FRAME_TIMESTAMP_FORMAT = "%Y-%m-%dT%H%M%S.%f"
+# Frames without a timestamp are assumed to be taken at the pace of use_cases.run_capture.
+FRAME_INTERVAL = timedelta(seconds=0.5)
+
+
+class CorruptedSessionException(Exception):
+    pass
+
+
+def frame_timestamp(path: Path) -> datetime | None:
+    try:
+        return datetime.strptime(path.stem, FRAME_TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def list_frames(folder: Path) -> list[tuple[datetime, Path]]:
+    """Frames of a folder of captures, in the order they were taken."""
+    paths = sorted(path for pattern in FRAME_PATTERNS for path in folder.glob(pattern))
+    timestamps = [frame_timestamp(path) for path in paths]
+    if None in timestamps:
+        start = datetime(2000, 1, 1)
+        return [(start + i * FRAME_INTERVAL, path) for i, path in enumerate(paths)]
+    return sorted(zip(timestamps, paths))
+
+
+class SessionWriter:
+    """
+    Appends frames to a session file, which stores compressed chunks of frames instead of a TIFF file per frame.
+
+    Every chunk starts with a header holding its frame count, frame shape, and the timestamp and compressed size of its
+    frames. Frames barely change during a chunk, so all but the first are stored as their difference with the first,
+    which compresses better. Frames are compressed one by one, so reading one only needs it and the first of its
+    chunk. Chunks are only ever appended, so a session cut short is still readable up to its last complete chunk.
+    """
+
+    def __init__(self, path: Path, frames_per_chunk: int = FRAMES_PER_CHUNK, level: int = COMPRESSION_LEVEL):
+        self.path = Path(path)
+        self.frames_per_chunk = frames_per_chunk
+        self.level = level
+        self.frames = 0
+        self._file = open(self.path, "ab")
+        self._pending: list[np.ndarray] = []
+        self._timestamps: list[float] = []
+
+    def append(self, frame: np.ndarray, taken_at: datetime | None = None) -> None:
+        if self._pending and frame.shape != self._pending[0].shape:
+            self.flush()
+
+        self._pending.append(frame.reshape(frame.shape[0], frame.shape[1], -1))
+        self._timestamps.append((taken_at or datetime.now()).timestamp())
+        self.frames += 1
+        if len(self._pending) >= self.frames_per_chunk:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+
+        key = self._pending[0].astype(np.uint8, copy=False)
+        compressed = [zlib.compress(key, self.level)] + [
+            zlib.compress(np.subtract(frame, key, dtype=np.uint8), self.level) for frame in self._pending[1:]
+        ]
+        self._file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, len(compressed), *key.shape))
+        self._file.write(np.array(self._timestamps, dtype="<f8").tobytes())
+        self._file.write(np.array([len(frame) for frame in compressed], dtype="<u8").tobytes())
+        self._file.write(b"".join(compressed))
+        self._file.flush()
+        self._pending.clear()
+        self._timestamps.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "SessionWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SessionReader:
+    """
+    Random access to the frames of a session file. The index is rebuilt from the chunk headers, and the file is
+    memory-mapped, so only the frames read are loaded. The first frame of the last chunk read is kept, as frames are
+    mostly read in order.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.path.stat().st_size else None
+        self._frames: list[tuple[int, int]] = []
+        self._shapes: list[tuple[int, int, int]] = []
+        self._keys: list[int] = []
+        self._cached_key: tuple[int, np.ndarray] | None = None
+        self.timestamps: list[datetime] = []
+        self._index()
+
+    def _index(self) -> None:
+        offset = 0
+        size = len(self._mmap) if self._mmap is not None else 0
+        while offset + CHUNK_HEADER.size <= size:
+            magic, count, *shape = CHUNK_HEADER.unpack_from(self._mmap, offset)
+            if magic != CHUNK_MAGIC:
+                raise CorruptedSessionException(f"No chunk found at {offset} in {self.path}.")
+
+            data_offset = offset + CHUNK_HEADER.size + count * 16
+            if data_offset > size:
+                logger.warning(f"Last chunk of {self.path} is incomplete, ignoring its {count} frames.")
+                break
+            header = np.frombuffer(self._mmap[offset + CHUNK_HEADER.size : data_offset], dtype="<f8").reshape(2, count)
+            timestamps, sizes = header[0], header[1].view("<u8")
+            ends = data_offset + np.cumsum(sizes)
+            if ends[-1] > size:
+                logger.warning(f"Last chunk of {self.path} is incomplete, ignoring its {count} frames.")
+                break
+
+            key = len(self._frames)
+            starts = np.concatenate(([data_offset], ends[:-1]))
+            self._frames += [(int(start), int(end)) for start, end in zip(starts, ends)]
+            self._shapes += [tuple(shape)] * count
+            self._keys += [key] * count
+            self.timestamps += [datetime.fromtimestamp(timestamp) for timestamp in timestamps]
+            offset = int(ends[-1])
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Session has {len(self)} frames.")
+        i %= len(self)
+
+        key = self._read_key(self._keys[i])
+        frame = key.copy() if i == self._keys[i] else np.add(self._decompress(i), key, dtype=np.uint8)
+        return frame[:, :, 0] if frame.shape[2] == 1 else frame
+
+    def _decompress(self, i: int) -> np.ndarray:
+        start, end = self._frames[i]
+        with memoryview(self._mmap) as view:
+            data = zlib.decompress(view[start:end])
+        return np.frombuffer(data, dtype=np.uint8).reshape(self._shapes[i])
+
+    def _read_key(self, i: int) -> np.ndarray:
+        if self._cached_key is None or self._cached_key[0] != i:
+            self._cached_key = i, self._decompress(i)
+        return self._cached_key[1]
+
+    def name(self, i: int) -> str:
+        return self.timestamps[i].strftime(FRAME_TIMESTAMP_FORMAT)
+
+    def find(self, moment: datetime) -> int:
+        """Index of the last frame taken at or before the moment, or -1 if there is none."""
+        return bisect_right(self.timestamps, moment) - 1
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        self._cached_key = None
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "SessionReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FolderSession:
+    """Frames of a folder of captures, read like a session file."""
+
+    def __init__(self, folder: Path):
+        frames = list_frames(Path(folder))
+        self.timestamps = [taken_at for taken_at, _ in frames]
+        self.paths = [path for _, path in frames]
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        return cv2.cvtColor(cv2.imread(str(self.paths[i])), cv2.COLOR_BGR2RGB)
+
+    def name(self, i: int) -> str:
+        return self.paths[i].name
+
+    def find(self, moment: datetime) -> int:
+        return bisect_right(self.timestamps, moment) - 1
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "FolderSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_session(path: Path) -> SessionReader | FolderSession:
+    path = Path(path)
+    return FolderSession(path) if path.is_dir() else SessionReader(path)
+
+
+def convert_folder(folder: Path, path: Path) -> int:
+    """
+    Convert a folder of captured TIFF files to a session. Frames are stored in RGB, like the camera gives them.
+
+    :return: the number of frames converted.
+    """
+    with FolderSession(folder) as frames, SessionWriter(path) as writer:
+        for taken_at, frame in zip(frames.timestamps, frames):
+            writer.append(frame, taken_at)
+    logger.info(f"Converted {len(frames)} frames of {folder} to {path}.")
+    return len(frames)
@@ -0,0 +1,186 @@
+import re
+from collections import Counter, defaultdict, deque
+from collections.abc import Iterable, Iterator
+from itertools import combinations
+from typing import Generic, TypeVar
+
+from botkit.text import normalized_levenshtein_distance
+
+T = TypeVar("T")
+
+# Keys sharing the most trigrams with a text are the only ones compared to it.
+FUZZY_CANDIDATES = 5
+# Words of a dictionary further than this many edits from every word of a text are not candidates to correct it. An OCR
+# misread as bad as "� zon" for "bacon" is 3 edits away.
+AUTOCORRECT_MAX_DISTANCE = 3
+
+
+class KeywordAutomaton(Generic[T]):
+    """
+    Aho-Corasick automaton over keywords, each tied to a value. Finds every keyword occurring in a text in a single pass
+    over the text, however many keywords there are. Matching is case-sensitive, like `keyword in text`.
+    """
+
+    def __init__(self, keywords: Iterable[tuple[str, T]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[tuple[str, T]]] = [[]]
+
+        for keyword, value in keywords:
+            if not keyword:
+                raise ValueError("Keywords cannot be empty.")
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append((keyword, value))
+
+        self._link_failures()
+
+    def _link_failures(self) -> None:
+        """
+        Breadth first, so the failure of a state is linked before the states below it. States of the first character
+        fail to the root.
+        """
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # Keywords ending at the failure state also end here.
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find_all(self, text: str) -> Iterator[tuple[int, str, T]]:
+        """Every keyword found in the text, with the index where it ends, in the order they end."""
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword, value in self._outputs[state]:
+                yield i + 1, keyword, value
+
+    def __len__(self) -> int:
+        """Number of states."""
+        return len(self._goto)
+
+
+class TitleIndex(Generic[T]):
+    """
+    Finds which of many items have a title keyword in a title. Items are given in priority order, and the ones
+    matching are returned in that order, so the first one is the one a linear scan over the items would find.
+    """
+
+    def __init__(self, items: Iterable[tuple[T, Iterable[str]]]):
+        self.items: list[T] = []
+        keywords = []
+        for priority, (item, item_keywords) in enumerate(items):
+            self.items.append(item)
+            keywords += [(keyword, priority) for keyword in item_keywords]
+        self.automaton = KeywordAutomaton(keywords)
+
+    def match(self, title: str) -> list[T]:
+        priorities = {priority for _, _, priority in self.automaton.find_all(title)}
+        return [self.items[priority] for priority in sorted(priorities)]
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of the text, padded so its first and last characters count as much as the others."""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Trigram inverted index over keys, to find the key closest to a text read with OCR errors. Only the few keys sharing
+    the most trigrams with the text are compared to it, with the normalized Levenshtein distance of botkit, which is 1
+    for identical texts. Keys and texts are compared lowercase, with their spaces collapsed.
+    """
+
+    def __init__(self, keys: Iterable[str], candidates: int = FUZZY_CANDIDATES):
+        self.keys = list(keys)
+        self.candidates = candidates
+        self._normalized = [normalize(key) for key in self.keys]
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        for i, key in enumerate(self._normalized):
+            for trigram in trigrams(key):
+                self._postings[trigram].append(i)
+
+    def best_match(self, text: str) -> tuple[str | None, float]:
+        """Closest key and its similarity with the text, or None and 0 if they share no trigram."""
+        text = normalize(text)
+        shared = Counter()
+        for trigram in trigrams(text):
+            shared.update(self._postings.get(trigram, ()))
+
+        best, confidence = None, 0.0
+        for i, _ in shared.most_common(self.candidates):
+            similarity = normalized_levenshtein_distance(text, self._normalized[i])
+            if similarity > confidence:
+                best, confidence = self.keys[i], similarity
+        return best, confidence
+
+
+def deletes(word: str, max_distance: int) -> set[str]:
+    """The word, and every string left after deleting up to max_distance of its characters."""
+    found = {word}
+    for distance in range(1, min(max_distance, len(word)) + 1):
+        found.update("".join(chars) for chars in combinations(word, len(word) - distance))
+    return found
+
+
+def tokens(text: str) -> set[str]:
+    """
+    Lowercase words of the text, as split on spaces and as split on punctuation, and neighbouring words merged, since the
+    OCR splits words as often as it merges them.
+    """
+    pieces = text.lower().split()
+    parts = [part for piece in pieces for part in re.split(r"[^\w()]+", piece) if part]
+    return set(pieces) | set(parts) | {first + second for first, second in zip(parts, parts[1:])}
+
+
+class DeletionIndex:
+    """
+    Symmetric delete index over the words of a dictionary, like SymSpell. Two words are at most max_distance edits apart
+    only if deleting up to max_distance characters from both gives a same string, so every word close to a token is found
+    by looking up the deletes of the token, without comparing the token to every word. Words found are only candidates:
+    some sharing a delete are further than max_distance.
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = AUTOCORRECT_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.words = set(words)
+        self.longest = max(map(len, self.words), default=0)
+        self._words_by_delete: dict[str, set[str]] = defaultdict(set)
+        for word in self.words:
+            for delete in deletes(word.lower(), max_distance):
+                self._words_by_delete[delete].add(word)
+
+    def lookup(self, token: str) -> set[str]:
+        if len(token) > self.longest + self.max_distance:
+            return set()
+        found = set()
+        for delete in deletes(token, self.max_distance):
+            found.update(self._words_by_delete.get(delete, ()))
+        return found
+
+    def candidates(self, text: str) -> set[str]:
+        """Words of the dictionary which may correct a word of the text."""
+        found = set()
+        for token in tokens(text):
+            found |= self.lookup(token)
+        return found
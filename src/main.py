@@ -20,6 +20,14 @@ if __name__ == "__main__":
     choice.add_argument("--autoplay", action="store_true", help="Whether to autoplay the game;")
     choice.add_argument("--capture", action="store_true", help="to capture a game session;")
     choice.add_argument("--optimize-menu", action="store_true", help="to optimize the menu,")
+    choice.add_argument(
+        "--replay", nargs="+", type=Path, metavar="SESSION", help="to replay captured sessions through the bot,"
+    )
+    choice.add_argument(
+        "--convert", nargs="+", type=Path, metavar="FOLDER", help="to convert folders of captures to sessions,"
+    )
+    choice.add_argument("--bundle", action="store_true", help="or to precompile the resources of the brain.")
+    parser.add_argument("--workers", type=int, help="Processes replaying sessions in parallel.")
 
     args = parser.parse_args()
 
@@ -30,6 +38,12 @@ if __name__ == "__main__":
             use_cases.run_capture()
         elif args.optimize_menu:
             use_cases.optimize_menu()
+        elif args.replay:
+            use_cases.run_replay(args.replay, args.workers)
+        elif args.convert:
+            use_cases.convert_captures(args.convert)
+        elif args.bundle:
+            use_cases.bundle_resources()
         else:
             parser.print_help()
             exit(0)
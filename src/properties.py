@@ -8,6 +8,31 @@ elif sys.platform == "win32":
     GAME_WINDOW_TITLE = "Cook, Serve, Delicious!"
     GAME_WINDOW_MARGIN = (12, 46, 12, 13)
 
+# "FULL_WINDOW" keeps the whole window, so logged frames can be used to debug the bot, or replayed as fixtures.
+# "REGIONS_OF_INTEREST" only keeps the task slots and the statement of every frame, which are also the only parts logged.
+CAPTURE_MODE = "FULL_WINDOW"
+# Whether frames are captured by another process, which shares them through memory, so capturing does not compete with
+# the analysis for the GIL.
+CAPTURE_PROCESS = False
+# Whether frames are analysed by another process while the keys of the last decision are sent by a third one. Takes
+# precedence over CAPTURE_PROCESS, as the perception process captures its own frames.
+PIPELINE = False
+# Whether the bot runs on asyncio, so frames are still analysed while keys are held and the next decision can use them
+# for the other slots, and cooked tasks are served on timers. Ignored with PIPELINE.
+ASYNC_RUNTIME = False
+
+# "GLYPHS" matches the game font against src/core/resources/glyph_atlas.npz, and uses tesserocr for unknown glyphs. The
+# atlas does not cover every character yet, so statements holding others are always read by tesserocr.
+# "TESSEROCR" keeps tesseract loaded for the whole session, but needs the optional tesserocr extra.
+# "PYTESSERACT" runs a new tesseract process for every statement.
+OCR_ENGINE = "TESSEROCR"
+OCR_CACHE_SIZE = 512
+# Statements already read are kept between sessions in this file. Use None to start from an empty cache every time.
+OCR_CACHE_PATH: None | str = "logs/statement_cache.json"
+INSTRUCTION_CACHE_SIZE = 512
+# Instructions found from descriptions are kept between sessions in this file, until equipments.json or tasks.json
+# change. Use None to start from an empty cache every time.
+INSTRUCTION_CACHE_PATH: None | str = "logs/instruction_cache.json"
 
 SCREENSHOT_LOGGER_LOGS_PATH = "logs"
 SCREENSHOT_LOGGER_ENABLED = True
@@ -1,143 +1,188 @@
+import asyncio
 import json
 import logging
 import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from functools import partial
 from importlib.resources import files
-
-import numpy as np
+from itertools import repeat
+from pathlib import Path
 
 import properties
 from botkit import img_logger, sensor_util
 from botkit.profiling import timeit
 from botkit.sensor_util import create_camera
-from core import motor, sensor, brain, resources, menu_optimization
+from core import brain, bundle, sensor, resources, menu_optimization, ocr, replay, session
+from core.bot import Bot
+from core.frame_ring import RingCamera
+from core.pipeline import PipelinedBot
+from core.runtime import AsyncBot
 from core.menu_optimization import MenuOption, Booster, Detractor
 
 logger = logging.getLogger(__name__)
 
 
 def run_capture() -> None:
+    # pynput needs a display, so the motor is only imported when the game is played.
+    from core import motor
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(message)s",
         handlers=[logging.FileHandler("logs/capture.log", mode="w")],
     )
 
-    def loop() -> None:
-        img_logger.submit(camera.capture_now())
-        img_logger.publish()
-        time.sleep(0.5)
-
-    camera = None
-    try:
-        img_logger.start()
+    with ExitStack() as stack:
+        # Created first, so no session file is left behind when the game is not found.
         camera = sensor_util.create_camera(properties.GAME_WINDOW_TITLE)
         camera.start()
+        stack.callback(camera.stop)
+
+        writer = session.SessionWriter(
+            Path("logs") / f"{datetime.now():{session.FRAME_TIMESTAMP_FORMAT}}{session.SESSION_SUFFIX}"
+        )
+        stack.callback(lambda: logger.info(f"Captured {writer.frames} frames to {writer.path}."))
+        stack.callback(writer.close)
 
         motor.wait_for_game_to_start()
         while True:
-            loop()
+            writer.append(camera.capture_now(), datetime.now())
+            time.sleep(0.5)
+
 
+@contextmanager
+def sensor_session() -> Iterator[None]:
+    """Configure the sensor for a game session, then close its OCR engine and save its statements once done."""
+    sensor.ocr_engine = ocr.create_engine(ocr.OcrEngineType[properties.OCR_ENGINE])
+    sensor.statement_cache = ocr.StatementCache(
+        properties.OCR_CACHE_SIZE, properties.OCR_CACHE_PATH, sensor.ocr_engine.version
+    )
+    sensor.slot_tracker = sensor.SlotTracker()
+    sensor.rush_overlay_smoother = sensor.RushOverlaySmoother()
+    try:
+        yield
     finally:
-        camera.stop()
-        img_logger.finalize()
+        sensor.ocr_engine.close()
+        logger.info(f"Statement cache: {sensor.statement_cache}")
+        logger.info(f"Slot tracker: {sensor.slot_tracker}")
+        sensor.statement_cache.save()
 
 
 def run_bot() -> None:
+    from core import motor
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(message)s",
         handlers=[logging.FileHandler("logs/bot.log", mode="w")],
     )
 
-    def capture() -> np.ndarray:
-        frame = camera.get_latest_frame()
-        img_logger.submit(frame)
-        img_logger.publish()
-        return frame
-
-    @timeit(name="loop", print_each_call=True)
-    def loop() -> None:
-        """
-        1. Find and store new active tasks
-            - Store timestamps on when it was detected
-        2. Execute tasks
-            - Read title, find known task in dictionary
-            -
-        """
-
-        last_frame = sensor.Frame(capture())
-        sensor.analyse_waiting_tasks(last_frame)
-        if not last_frame.has_found_tasks:
-            logger.info(f"Found no waiting tasks.")
-            return
-
-        task, task_callback = brain.choose_task_to_execute(last_frame.tasks)
-        if task_callback is None:
-            return
-
-        logger.info(f"Launching task {task}")
-
-        if task_callback.is_executable:
-            motor.execute_task(task_callback)
-            camera.flush()
-            return
-
-        motor.select_task(task.index)
-        camera.flush()
-
-        task_execution = None
-        execution_retry = 0
-        while task_execution is None:
-            last_frame = None
-
-            statement_retry = 0
-            while last_frame is None or last_frame.current_statement is None:
-                last_frame = sensor.Frame(capture())
-                sensor.analyse_waiting_tasks(last_frame)
-                sensor.read_task_statement(last_frame)
-
-                if last_frame.current_statement is None:
-                    statement_retry += 1
-                    if statement_retry >= 3:
-                        logger.warning(f"No statement after 3 tries, will choose another task.")
-                        return
-                    logger.info(f"Waiting for statement to appear...")
-
-            logger.info(f"Found statement {last_frame.current_statement}")
-            task_execution = task_callback(last_frame.tasks, last_frame.current_statement)
-            if task_execution.is_unknown:
-                execution_retry += 1
-                if execution_retry >= 3:
-                    logger.warning(
-                        f"Could not find a proper execution for task {last_frame.current_statement_title}, but will execute anyway."
-                    )
-                    break
-
-                logger.warning(
-                    f"Could not find a proper execution for task {last_frame.current_statement_title}. Will retry reading statement."
-                )
-                task_execution = None
-
-        motor.execute_task(task_execution)
-        camera.flush()
+    capture_mode = sensor.CaptureMode[properties.CAPTURE_MODE]
 
     camera = None
+    bot = None
     try:
         img_logger.start()
-        camera = create_camera(properties.GAME_WINDOW_TITLE)
-        camera.start()
-
-        motor.wait_for_game_to_start()
-        while True:
-            loop()
+        brain.instruction_cache = brain.InstructionCache(
+            properties.INSTRUCTION_CACHE_SIZE, properties.INSTRUCTION_CACHE_PATH
+        )
+        with ExitStack() as stack:
+            if properties.PIPELINE:
+                bot = PipelinedBot(
+                    partial(create_camera, properties.GAME_WINDOW_TITLE),
+                    motor.PynputKeyboard,
+                    capture_mode,
+                    sensor_session,
+                )
+                bot.start()
+                stack.callback(bot.stop)
+            else:
+                stack.enter_context(sensor_session())
+                if properties.CAPTURE_PROCESS:
+                    camera = RingCamera(partial(create_camera, properties.GAME_WINDOW_TITLE))
+                else:
+                    camera = create_camera(properties.GAME_WINDOW_TITLE)
+                camera.start()
+                stack.callback(camera.stop)
+                if properties.ASYNC_RUNTIME:
+                    bot = AsyncBot(camera, motor.AsyncPynputKeyboard(), capture_mode)
+                else:
+                    bot = Bot(camera, motor.keyboard, capture_mode)
+            loop = timeit(name="loop", print_each_call=True)(bot.loop)
+
+            motor.wait_for_game_to_start()
+            if isinstance(bot, AsyncBot):
+                asyncio.run(bot.run())
+            else:
+                while True:
+                    colour_conversions = sensor.colour_conversions
+                    loop()
+                    logger.info(f"Loop did {sensor.colour_conversions - colour_conversions} colour conversions.")
 
     finally:
-        if camera is not None:
-            camera.stop()
+        if isinstance(camera, RingCamera):
+            logger.info(f"Frame ring: {camera}")
+        if isinstance(bot, PipelinedBot):
+            logger.info(f"Pipeline: {bot}")
+        if isinstance(bot, AsyncBot):
+            logger.info(f"Asyncio runtime: {bot}")
+        logger.info(f"Instruction cache: {brain.instruction_cache}")
+        brain.instruction_cache.save()
         img_logger.finalize()
         time.sleep(1)
 
 
+def run_replay(sessions: list[Path], workers: int | None = None) -> None:
+    """Replay captured sessions through the bot, in parallel processes, and print what it decided."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+        handlers=[logging.FileHandler("logs/replay.log", mode="w")],
+    )
+
+    capture_mode = sensor.CaptureMode[properties.CAPTURE_MODE]
+    ocr_engine_type = ocr.OcrEngineType[properties.OCR_ENGINE]
+    # A process only replays one session, as the brain and the sensor keep their state in their modules.
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as executor:
+        results = list(executor.map(replay.replay_session, sessions, repeat(capture_mode), repeat(ocr_engine_type)))
+
+    for result in results:
+        print(f"{result.session}:")
+        for line in result.trace():
+            print(f"  {line}")
+        print(
+            f"  {result.frames} frames, {result.loops} decisions in {result.seconds:.3f} seconds, "
+            f"{result.decisions_per_second:.1f} decisions/sec.\n"
+        )
+
+    loops = sum(result.loops for result in results)
+    seconds = sum(result.seconds for result in results)
+    print(
+        f"{len(results)} sessions, {loops} decisions, {loops / seconds if seconds else 0:.1f} decisions/sec per process."
+    )
+
+
+def convert_captures(folders: list[Path]) -> None:
+    """Convert folders of captured TIFF files to session files, next to them."""
+    for folder in folders:
+        path = folder.with_suffix(session.SESSION_SUFFIX)
+        started_at = time.perf_counter()
+        frames = session.convert_folder(folder, path)
+        print(f"Converted {frames} frames of {folder} to {path} in {time.perf_counter() - started_at:.3f} seconds.")
+
+
+def bundle_resources() -> None:
+    """Build the resources of the brain again and save them to the bundle it loads them from, like a stale bundle."""
+    started_at = time.perf_counter()
+    bundle.save(brain.BUNDLE_PATH, brain.bundle_digest(), brain.build_resources())
+    print(
+        f"Bundled the resources of the brain to {brain.BUNDLE_PATH} in {time.perf_counter() - started_at:.3f} seconds."
+    )
+
+
 def optimize_menu() -> None:
     menu_items: dict[str, MenuOption] = {}
 
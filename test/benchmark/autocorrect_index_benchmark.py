@@ -0,0 +1,89 @@
+"""
+Compares correcting noisy descriptions against the whole autocorrect dictionary of a step, like before, and against
+the candidates its deletion index finds, on the largest dictionaries. Each word of a description is compared to every
+word it may be corrected to, with the distance of botkit, which is the linear scan the index avoids. The last row merges
+the dictionaries of every equipment, to see how both grow with recipes.
+
+    python -m benchmark.autocorrect_index_benchmark [--descriptions 200]
+"""
+
+import argparse
+import random
+import time
+
+from botkit.text import autocorrect, normalized_levenshtein_distance
+
+from benchmark.bench_utils import percentiles
+from benchmark.fuzzy_title_benchmark import add_noise
+from core import brain
+from core.text_index import DeletionIndex, tokens
+
+EQUIPMENTS = ["Robbery", "Pizza", "Salad"]
+
+
+def descriptions(step: brain.EquipmentStep, count: int, rng: random.Random) -> list[str]:
+    """Random orders of the keys of the step, read with a few OCR errors."""
+    keys = list(step.keys)
+    orders = []
+    for _ in range(count):
+        chosen = rng.sample(keys, min(len(keys), rng.randint(2, 4)))
+        orders.append(add_noise(", ".join(chosen[:-1]) + " and " + chosen[-1], rng.randint(0, 3), rng))
+    return orders
+
+
+def closest_words(description: str, dictionary: set[str]) -> list[str]:
+    return [
+        max(dictionary, key=lambda word: normalized_levenshtein_distance(token, word), default=token)
+        for token in tokens(description)
+    ]
+
+
+def time_each(func, texts: list[str]) -> dict[str, float]:
+    samples = []
+    for text in texts:
+        started_at = time.perf_counter()
+        func(text)
+        samples.append(time.perf_counter() - started_at)
+    return percentiles(samples)
+
+
+def compare(name: str, dictionary: set[str], texts: list[str]) -> None:
+    index = DeletionIndex(dictionary)
+    candidates = [len(index.candidates(text)) for text in texts]
+    scan = time_each(lambda text: closest_words(text, dictionary), texts)
+    indexed = time_each(lambda text: closest_words(text, index.candidates(text)), texts)
+    lookup = time_each(index.candidates, texts)
+    full = time_each(lambda text: autocorrect(text, dictionary), texts)
+    pruned = time_each(lambda text: autocorrect(text, index.candidates(text)), texts)
+    print(
+        f"{name:<15} {len(dictionary):>5} {sum(candidates) / len(candidates):>11.1f}"
+        f" {lookup['p50']:>10.3f} {scan['p50']:>8.3f} {indexed['p50']:>11.3f}"
+        f" {full['p50']:>13.3f} {pruned['p50']:>15.3f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--descriptions", type=int, default=200, help="noisy descriptions per equipment")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(
+        f"{'p50 ms':<15} {'words':>5} {'candidates':>11} {'candidates':>10} {'scan':>8} {'index+scan':>11}"
+        f" {'autocorrect':>13} {'index+autocorr':>15}"
+    )
+    everything = set()
+    texts = []
+    for equipment in EQUIPMENTS:
+        step = brain.EQUIPMENTS[equipment].steps[0]
+        equipment_texts = descriptions(step, args.descriptions, rng)
+        compare(equipment, step.autocorrect_dictionary, equipment_texts)
+        texts += equipment_texts
+    for equipment in brain.EQUIPMENTS.values():
+        for step in equipment.steps:
+            everything |= step.autocorrect_dictionary
+    compare("All equipments", everything, texts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import json
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from core import brain
+
+RESOURCES_PATH = Path(__file__).parent.parent / "resources"
+
+
+def load_images(path: Path = RESOURCES_PATH, pattern: str = "**/*.tiff") -> dict[str, np.ndarray]:
+    """Load every matching image once, in RGB like the camera returns them."""
+    return {
+        image_path.relative_to(path).as_posix(): cv2.cvtColor(cv2.imread(str(image_path)), cv2.COLOR_BGR2RGB)
+        for image_path in sorted(path.glob(pattern))
+    }
+
+
+def measure(func: Callable, *args, repeat: int = 200) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples: list[float]) -> str:
+    return f"median {statistics.median(samples) * 1000:.3f} ms, min {min(samples) * 1000:.3f} ms"
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50, p95 and p99 of the samples, in milliseconds."""
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {f"p{p}": quantiles[p - 1] * 1000 for p in (50, 95, 99)}
+
+
+def known_titles() -> list[str]:
+    """Titles of the labelled fixtures and every title keyword, alone and within a longer title."""
+    with open(RESOURCES_PATH / "statements.json") as statements_file:
+        statements = json.load(statements_file)
+    titles = [statement["title"] for statement in statements.values() if statement is not None]
+    titles += [keyword for equipment in brain.EQUIPMENTS.values() for keyword in equipment.title_keywords]
+    return titles + [f"Extra {title} w/ Cheese" for title in titles]
@@ -0,0 +1,65 @@
+"""
+Compares importing core.brain when its resources are loaded from the bundle, and when they are built again from
+tasks.json and equipments.json. Every import runs in a new interpreter, after the modules the brain depends on are
+imported, so only the brain and its resources are timed.
+
+    python -m benchmark.brain_import_benchmark [--repeat 20]
+"""
+
+import argparse
+import compileall
+import statistics
+import subprocess
+import sys
+
+from benchmark.bench_utils import measure, summarize
+from core import brain, bundle
+
+IMPORT = """
+import time
+import dataclasses, enum, hashlib, importlib.resources, inspect, json
+import botkit.text, core.bundle, core.clock, core.resources, core.text_index
+started_at = time.perf_counter()
+import core.brain
+print(time.perf_counter() - started_at)
+"""
+
+
+def time_import() -> float:
+    output = subprocess.run([sys.executable, "-c", IMPORT], check=True, capture_output=True, text=True).stdout
+    return float(output)
+
+
+def time_imports(repeat: int, stale: bool) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        if stale:
+            brain.BUNDLE_PATH.unlink(missing_ok=True)
+        samples.append(time_import())
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="imports timed in each case")
+    args = parser.parse_args()
+
+    # Otherwise an interpreter not writing bytecode would time the compilation of brain.py on every import.
+    compileall.compile_file(brain.__file__, quiet=1)
+    digest = brain.bundle_digest()
+    print(f"Build resources: {summarize(measure(brain.build_resources, repeat=args.repeat))}")
+    print(f"Load bundle: {summarize(measure(bundle.load, brain.BUNDLE_PATH, digest, repeat=args.repeat))}")
+
+    try:
+        built = time_imports(args.repeat, stale=True)
+        bundled = time_imports(args.repeat, stale=False)
+    finally:
+        bundle.save(brain.BUNDLE_PATH, digest, brain.build_resources())
+
+    print(f"Import without bundle: {summarize(built)}")
+    print(f"Import with bundle: {summarize(bundled)}")
+    print(f"{statistics.median(built) / statistics.median(bundled):.1f}x faster with the bundle.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import cv2
+
+from benchmark.bench_utils import load_images, measure, summarize
+from core import sensor
+from core.sensor import CaptureMode
+
+
+def sensor_loop(window, capture_mode: CaptureMode) -> None:
+    frame = sensor.create_frame(window, capture_mode)
+    # The logger keeps a copy of every frame and writes it as a tiff.
+    cv2.imencode(".tiff", frame.img.copy())
+    sensor.analyse_waiting_tasks(frame)
+    sensor.mask_statement(frame)
+
+
+if __name__ == "__main__":
+    windows = list(load_images().values())
+
+    for capture_mode in CaptureMode:
+        frame_bytes = sensor.create_frame(windows[0], capture_mode).img.nbytes
+        samples = [s for window in windows for s in measure(sensor_loop, window, capture_mode, repeat=20)]
+        print(f"{capture_mode.name}: {frame_bytes / 1024:.0f} KiB per frame, {summarize(samples)} per loop")
@@ -0,0 +1,53 @@
+import itertools
+import time
+
+import cv2
+
+from benchmark.bench_utils import load_images, measure, summarize
+from core import sensor
+from core.frame_ring import FrameRing, RingCamera
+
+FRAMES = list(load_images().values())
+LOOPS = 200
+CAPTURE_FPS = 60
+
+
+class FixtureSource:
+    """Plays the fixtures over and over at the pace of a camera, converting them like a capture would."""
+
+    def __init__(self):
+        self.frames = itertools.cycle(FRAMES)
+        self.next_frame_at = time.perf_counter()
+
+    def get_latest_frame(self):
+        self.next_frame_at = max(self.next_frame_at + 1 / CAPTURE_FPS, time.perf_counter())
+        time.sleep(max(self.next_frame_at - time.perf_counter(), 0))
+        return cv2.cvtColor(cv2.cvtColor(next(self.frames), cv2.COLOR_RGB2BGRA), cv2.COLOR_BGRA2RGB)
+
+
+def analyse(camera) -> float:
+    started_at = time.perf_counter()
+    for _ in range(LOOPS):
+        frame = sensor.Frame(camera.get_latest_frame())
+        sensor.analyse_waiting_tasks(frame)
+        sensor.mask_statement(frame)
+    return LOOPS / (time.perf_counter() - started_at)
+
+
+if __name__ == "__main__":
+    ring = FrameRing.create()
+    try:
+        print(f"Ring write: {summarize(measure(ring.write, FRAMES[0]))} per frame")
+        print(f"Ring read: {summarize(measure(ring.latest))} per frame")
+    finally:
+        ring.close()
+
+    print(f"Capture in the analysis thread: {analyse(FixtureSource()):.1f} loops/sec")
+
+    camera = RingCamera(FixtureSource)
+    camera.start()
+    try:
+        loops_per_second = analyse(camera)
+    finally:
+        camera.stop()
+    print(f"Capture in another process: {loops_per_second:.1f} loops/sec, {camera}")
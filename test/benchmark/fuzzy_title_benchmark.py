@@ -0,0 +1,77 @@
+"""
+Reads every title of tasks.json back through synthetic OCR noise, and measures how often and how fast the fuzzy title
+index of the brain finds the right task. Titles of other fixtures must not be taken for a task.
+
+    python -m benchmark.fuzzy_title_benchmark [--variants 20]
+"""
+
+import argparse
+import random
+import time
+
+from benchmark.bench_utils import known_titles, percentiles
+from core import brain
+
+# Characters the OCR mistakes for one another.
+CONFUSIONS = {"l": "I1", "I": "l1", "i": "l", "O": "0", "o": "0e", "e": "c", "c": "e", "S": "5", "s": "5", "B": "8"}
+
+
+def add_noise(title: str, edits: int, rng: random.Random) -> str:
+    chars = list(title)
+    for _ in range(edits):
+        i = rng.randrange(len(chars))
+        kind = rng.choice(["confuse", "drop", "space", "merge"])
+        if kind == "confuse":
+            chars[i] = rng.choice(CONFUSIONS.get(chars[i], "il"))
+        elif kind == "drop" and len(chars) > 1:
+            del chars[i]
+        elif kind == "space":
+            chars.insert(i, " ")
+        elif kind == "merge" and chars[i] == "m":
+            chars[i : i + 1] = ["r", "n"]
+    return "".join(chars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", type=int, default=20, help="noisy reads of every title per noise level")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    titles = list(brain.TASKS_INSTRUCTIONS)
+    print(f"{len(titles)} task titles, confidence threshold {brain.FUZZY_TITLE_CONFIDENCE}")
+    print(f"{'edits':>5} {'reads':>6} {'right':>7} {'accepted':>9} {'wrong accepted':>15} {'p50 ms':>8} {'p99 ms':>8}")
+    for edits in range(4):
+        reads = right = accepted = wrong = 0
+        samples = []
+        for title in titles:
+            for _ in range(args.variants if edits else 1):
+                noisy = add_noise(title, edits, rng)
+                started_at = time.perf_counter()
+                match, confidence = brain.TASK_TITLES.best_match(noisy)
+                samples.append(time.perf_counter() - started_at)
+                reads += 1
+                right += match == title
+                if confidence >= brain.FUZZY_TITLE_CONFIDENCE:
+                    accepted += 1
+                    wrong += match != title
+        latency = percentiles(samples)
+        print(
+            f"{edits:>5} {reads:>6} {right / reads:>7.1%} {accepted / reads:>9.1%} {wrong:>15}"
+            f" {latency['p50']:>8.3f} {latency['p99']:>8.3f}"
+        )
+
+    others = sorted({title for title in known_titles() if title.lower() not in brain.TASKS_INSTRUCTIONS})
+    taken = [
+        (title, match)
+        for title in others
+        for match, confidence in [brain.TASK_TITLES.best_match(title)]
+        if confidence >= brain.FUZZY_TITLE_CONFIDENCE
+    ]
+    print(f"\nOther titles taken for a task: {len(taken)}/{len(others)}")
+    for title, match in taken:
+        print(f"  '{title}' taken for '{match}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+from benchmark.bench_utils import load_images, measure, summarize
+from core import ocr, sensor
+from core.ocr import OcrEngineType
+
+if __name__ == "__main__":
+    statements = {name: sensor.mask_statement(sensor.Frame(img)) for name, img in load_images().items()}
+    ghosts = {name: masked for name, masked in statements.items() if not sensor.looks_like_statement(masked)}
+    print(f"{len(ghosts)}/{len(statements)} statement boxes are rejected before OCR: {', '.join(ghosts)}")
+
+    samples = [s for masked in statements.values() for s in measure(sensor.looks_like_statement, masked)]
+    print(f"Rejector: {summarize(samples)} per statement box")
+
+    engine = ocr.create_engine(OcrEngineType.TESSEROCR)
+    try:
+        samples = [s for masked in ghosts.values() for s in measure(engine.image_to_string, masked, repeat=5)]
+        print(f"OCR avoided: {summarize(samples)} per rejected statement box")
+    finally:
+        engine.close()
@@ -0,0 +1,55 @@
+import random
+import time
+
+from core import brain
+
+DESCRIPTIONS_PER_STEP = 2000
+SEPARATORS = [", ", " and ", " "]
+
+
+def legacy_scan(step: brain.EquipmentStep, description: str) -> list[str]:
+    """Former keyword search, masking every keyword found in keyword order, kept to compare with the compiled one."""
+    search_description = description
+    found_keywords: dict[int, str] = {}
+    for keyword in step.step_keywords:
+        while (found_index := search_description.find(keyword)) != -1:
+            found_keywords[found_index] = keyword
+            search_description = search_description.replace(keyword, "_" * len(keyword), 1)
+    return [v for k, v in sorted(found_keywords.items(), key=lambda x: x[0])]
+
+
+def synthetic_descriptions(step: brain.EquipmentStep, rng: random.Random) -> list[str]:
+    descriptions = []
+    for _ in range(DESCRIPTIONS_PER_STEP):
+        description = rng.choice(step.step_keywords)
+        for _ in range(rng.randint(0, 7)):
+            description += rng.choice(SEPARATORS) + rng.choice(step.step_keywords)
+        descriptions.append(description)
+    return descriptions
+
+
+def throughput(scan, step: brain.EquipmentStep, descriptions: list[str]) -> float:
+    started_at = time.perf_counter()
+    for description in descriptions:
+        scan(step, description)
+    return len(descriptions) / (time.perf_counter() - started_at)
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    print(f"{'step':<24} {'keywords':>8} {'legacy/s':>10} {'compiled/s':>11} {'speedup':>8} {'different':>10}")
+    for equipment in brain.EQUIPMENTS.values():
+        for i, step in enumerate(equipment.steps):
+            if step.step_format is not None:
+                continue
+            descriptions = synthetic_descriptions(step, rng)
+            legacy = throughput(legacy_scan, step, descriptions)
+            compiled = throughput(brain.EquipmentStep._find_task_elements_by_keywords, step, descriptions)
+            different = sum(
+                legacy_scan(step, description) != step._find_task_elements_by_keywords(description)
+                for description in descriptions
+            )
+            print(
+                f"{f'{equipment.name} {i}':<24} {len(step.step_keywords):>8} {legacy:>10.0f} {compiled:>11.0f}"
+                f" {compiled / legacy:>7.1f}x {different:>10}"
+            )
@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+
+from benchmark.bench_utils import load_images
+from core import brain, ocr, sensor
+from core.brain import TaskStatus, VisibleTask
+from core.ocr import OcrEngine, OcrEngineType
+
+brain.CREATION_DELAY_IN_SECONDS = 0
+
+
+class TimedEngine(OcrEngine):
+    def __init__(self, engine: OcrEngine):
+        self.engine = engine
+        self.elapsed = 0.0
+
+    def image_to_string(self, img: np.ndarray) -> str:
+        return self._timed(self.engine.image_to_string, img)
+
+    def image_to_line(self, img: np.ndarray) -> str:
+        return self._timed(self.engine.image_to_line, img)
+
+    def images_to_lines(self, imgs: list[np.ndarray]) -> list[str]:
+        return self._timed(self.engine.images_to_lines, imgs)
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+    def close(self) -> None:
+        self.engine.close()
+
+
+if __name__ == "__main__":
+    engine = TimedEngine(ocr.create_engine(OcrEngineType.TESSEROCR))
+    sensor.ocr_engine = engine
+    print(f"{len(brain.TASKS_INSTRUCTIONS)} recipes of tasks.json are known by their title alone.")
+
+    lazy, eager, orders, title_only = 0.0, 0.0, 0, 0
+    title_only_lazy, title_only_eager = 0.0, 0.0
+    try:
+        for img in load_images().values():
+            sensor.statement_cache = ocr.StatementCache()
+            engine.elapsed = 0
+            frame = sensor.Frame(img)
+            sensor.read_task_statement(frame)
+            statement = frame.current_statement
+            if statement is None:
+                continue
+
+            visible_tasks = [VisibleTask(1, TaskStatus.READY)]
+            _, callback = brain.choose_task_to_execute(visible_tasks)
+            try:
+                callback(visible_tasks, statement)
+            except Exception:
+                # Only the OCR time matters here, not whether the description was understood.
+                pass
+            brain.active_tasks = [None] * len(brain.active_tasks)
+
+            orders += 1
+            known_by_title = not statement.is_description_read
+            lazy += engine.elapsed
+            title_only_lazy += engine.elapsed if known_by_title else 0
+            statement.description
+            eager += engine.elapsed
+            title_only_eager += engine.elapsed if known_by_title else 0
+            title_only += known_by_title
+    finally:
+        engine.close()
+
+    print(f"{title_only}/{orders} orders of the test resources were known by their title.")
+    print(f"Eager: {eager / orders * 1000:.1f} ms of OCR per order")
+    print(f"Lazy: {lazy / orders * 1000:.1f} ms of OCR per order")
+    if title_only:
+        print(f"Orders known by their title, eager: {title_only_eager / title_only * 1000:.1f} ms of OCR per order")
+        print(f"Orders known by their title, lazy: {title_only_lazy / title_only * 1000:.1f} ms of OCR per order")
@@ -0,0 +1,21 @@
+from benchmark.bench_utils import load_images, measure, summarize
+from core import glyphs, ocr, sensor
+from core.ocr import OcrEngineType
+
+if __name__ == "__main__":
+    statements = {name: sensor.mask_statement(sensor.Frame(img)) for name, img in load_images().items()}
+    lines = {name: [line for _, line in glyphs.segment_lines(masked)] for name, masked in statements.items()}
+
+    for engine_type in OcrEngineType:
+        engine = ocr.create_engine(engine_type)
+        if engine_type == OcrEngineType.TESSEROCR and not isinstance(engine, ocr.TesserocrEngine):
+            print(f"{engine_type.name}: not available.")
+            continue
+
+        try:
+            samples = [s for masked in statements.values() for s in measure(engine.image_to_string, masked, repeat=5)]
+            print(f"{engine_type.name} whole box: {summarize(samples)} per statement over {len(statements)} images")
+            samples = [s for segmented in lines.values() for s in measure(engine.images_to_lines, segmented, repeat=5)]
+            print(f"{engine_type.name} lines: {summarize(samples)} per statement over {len(statements)} images")
+        finally:
+            engine.close()
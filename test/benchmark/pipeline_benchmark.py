@@ -0,0 +1,212 @@
+"""
+Plays a simulated game with the sequential bot, the pipelined bot and the asyncio bot, and compares the orders they
+complete per minute. Orders are the burger fixtures the brain knows how to make without cooking, which arrive in the
+free slots of a frame composed from the fixtures.
+
+    python -m benchmark.pipeline_benchmark [--seconds 30]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import logging
+import threading
+import time
+
+import numpy as np
+
+import properties
+from benchmark.bench_utils import load_images
+from core import brain, ocr, sensor
+from core.bot import Bot
+from core.brain import HoldInput, TaskType
+from core.pipeline import PipelinedBot, WorkerType
+from core.runtime import AsyncBot
+
+SLOTS = 4
+# A new customer takes this long to walk to a freed slot.
+ARRIVAL_SECONDS = 1.5
+CAPTURE_FPS = 60
+# Like motor.PynputKeyboard, which waits after every key so the game registers it.
+KEY_SECONDS = 0.1
+
+IMAGES = load_images()
+BASE = IMAGES["burger/blt.tiff"]
+NO_STATEMENT = IMAGES["5-tasks.tiff"][sensor.CURRENT_STATEMENT_REGION.top : sensor.CURRENT_STATEMENT_REGION.bottom]
+
+
+def slot_band(i: int) -> tuple[slice, slice]:
+    return slice(70 + 60 * i, 130 + 60 * i), slice(None, 250)
+
+
+READY_SLOT = BASE[slot_band(0)].copy()
+EMPTY_SLOT = BASE[slot_band(1)].copy()
+
+
+def statement_region(img: np.ndarray) -> np.ndarray:
+    return img[sensor.CURRENT_STATEMENT_REGION.top : sensor.CURRENT_STATEMENT_REGION.bottom].copy()
+
+
+def instructions_of(statement: brain.TaskStatement) -> brain.TaskInstructions | None:
+    """Instructions the brain would find for the statement, like Task.read_statement_callback."""
+    instructions = brain.TASKS_INSTRUCTIONS.get(statement.title.lower())
+    if instructions is not None:
+        return instructions
+    for equipment in brain.EQUIPMENT_TITLES.match(statement.title):
+        return equipment.find_instructions(statement.description)
+    return None
+
+
+def simple_orders() -> list[np.ndarray]:
+    """Statement regions of the burger fixtures the brain completes in a single execution."""
+    orders = []
+    for name, img in IMAGES.items():
+        if not name.startswith("burger/"):
+            continue
+        frame = sensor.Frame(img)
+        sensor.read_task_statement(frame)
+        if frame.current_statement is None:
+            continue
+        instructions = instructions_of(frame.current_statement)
+        if instructions is not None and instructions.type == TaskType.SIMPLE:
+            orders.append(statement_region(img))
+    return orders
+
+
+class SimulatedGame:
+    """
+    Orders waiting in the slots of the game. Pressing the number of a slot shows its order, and enter completes the
+    order shown, which frees its slot for the next customer.
+    """
+
+    def __init__(self, orders: list[np.ndarray]):
+        self.orders = itertools.cycle(orders)
+        self.lock = threading.Lock()
+        self.slots: list[np.ndarray | None] = [None] * SLOTS
+        self.freed_at = [time.perf_counter()] * SLOTS
+        self.selected: int | None = None
+        self.completed = 0
+
+    def _arrive(self) -> None:
+        now = time.perf_counter()
+        for i in range(SLOTS):
+            if self.slots[i] is None and self.freed_at[i] + ARRIVAL_SECONDS <= now:
+                self.slots[i] = next(self.orders)
+
+    def render(self) -> np.ndarray:
+        with self.lock:
+            self._arrive()
+            frame = BASE.copy()
+            for i, order in enumerate(self.slots):
+                frame[slot_band(i)] = EMPTY_SLOT if order is None else READY_SLOT
+            shown = NO_STATEMENT if self.selected is None else self.slots[self.selected]
+            frame[sensor.CURRENT_STATEMENT_REGION.top : sensor.CURRENT_STATEMENT_REGION.bottom] = shown
+        return frame
+
+    def press(self, key: str) -> None:
+        with self.lock:
+            if key.isdigit() and 1 <= int(key) <= SLOTS and self.slots[int(key) - 1] is not None:
+                self.selected = int(key) - 1
+            elif key == "enter" and self.selected is not None:
+                self.slots[self.selected] = None
+                self.freed_at[self.selected] = time.perf_counter()
+                self.selected = None
+                self.completed += 1
+
+
+class GameCamera:
+    def __init__(self, game: SimulatedGame):
+        self.game = game
+        self.next_frame_at = time.perf_counter()
+
+    def start(self) -> None:
+        pass
+
+    def get_latest_frame(self) -> np.ndarray:
+        self.next_frame_at = max(self.next_frame_at + 1 / CAPTURE_FPS, time.perf_counter())
+        time.sleep(max(self.next_frame_at - time.perf_counter(), 0))
+        return self.game.render()
+
+    def flush(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class GameKeyboard(brain.Keyboard):
+    def __init__(self, game: SimulatedGame):
+        self.game = game
+
+    def send(self, key: str | HoldInput):
+        if isinstance(key, HoldInput):
+            self.game.press(key.key)
+            time.sleep(key.hold_seconds)
+        else:
+            self.game.press(key)
+            time.sleep(KEY_SECONDS)
+
+    def wait_for(self, key: str):
+        pass
+
+
+def play(bot: Bot, game: SimulatedGame, seconds: float) -> float:
+    """Orders completed per minute."""
+    brain.active_tasks = [None] * len(sensor.WAITING_TASK_REGIONS)
+    sensor.slot_tracker = sensor.SlotTracker()
+    sensor.rush_overlay_smoother = sensor.RushOverlaySmoother()
+    started_at = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if isinstance(bot, AsyncBot):
+            with contextlib.suppress(TimeoutError):
+                asyncio.run(asyncio.wait_for(bot.run(), seconds))
+        else:
+            while time.perf_counter() - started_at < seconds:
+                bot.loop()
+    return game.completed * 60 / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=30, help="time played by each bot")
+    parser.add_argument("--ocr-engine", default=properties.OCR_ENGINE, choices=[e.name for e in ocr.OcrEngineType])
+    args = parser.parse_args()
+
+    sensor.ocr_engine = ocr.create_engine(ocr.OcrEngineType[args.ocr_engine])
+    logging.disable(logging.INFO)
+    try:
+        orders = simple_orders()
+        print(f"{len(orders)} kinds of orders, a customer every {ARRIVAL_SECONDS}s in every free slot.")
+
+        game = SimulatedGame(orders)
+        camera = GameCamera(game)
+        bot = Bot(camera, GameKeyboard(game), sensor.CaptureMode.FULL_WINDOW, log_frames=False)
+        print(f"Sequential: {play(bot, game, args.seconds):.1f} orders/min")
+
+        # The simulated game lives in this process, so the stages are threads.
+        game = SimulatedGame(orders)
+        bot = PipelinedBot(
+            lambda: GameCamera(game),
+            lambda: GameKeyboard(game),
+            sensor.CaptureMode.FULL_WINDOW,
+            worker_type=WorkerType.THREAD,
+        )
+        bot.start()
+        try:
+            print(f"Pipelined: {play(bot, game, args.seconds):.1f} orders/min, {bot}")
+        finally:
+            bot.stop()
+
+        # Keys are sent from a thread by the adapter, like any blocking keyboard.
+        game = SimulatedGame(orders)
+        bot = AsyncBot(GameCamera(game), GameKeyboard(game), sensor.CaptureMode.FULL_WINDOW)
+        print(f"Asyncio: {play(bot, game, args.seconds):.1f} orders/min, {bot}")
+    finally:
+        logging.disable(logging.NOTSET)
+        sensor.ocr_engine.close()
+
+
+if __name__ == "__main__":
+    main()
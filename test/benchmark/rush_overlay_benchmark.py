@@ -0,0 +1,31 @@
+import numpy as np
+
+from benchmark.bench_utils import load_images, measure, summarize
+from core import sensor
+
+
+def fix_rush_overlay_greyscale_float(frame: sensor.Frame, img: np.ndarray) -> np.ndarray:
+    """Correction as it was before the lookup table."""
+    return (255 - (255 - img) / frame._rush_overlay_ratio).astype(np.uint8)
+
+
+if __name__ == "__main__":
+    frames = [sensor.Frame(img) for img in load_images(pattern="*rush*.tiff").values()]
+    crops = {
+        "statement": sensor.CURRENT_STATEMENT_REGION,
+        "waiting task": sensor.WAITING_TASK_1_REGION,
+        "status": sensor.STATUS_TASK_1_REGION,
+    }
+
+    for name, region in crops.items():
+        float_samples, lut_samples = [], []
+        for frame in frames:
+            cropped = frame.crop(region)
+            assert np.array_equal(
+                frame.fix_rush_overlay_greyscale(cropped), fix_rush_overlay_greyscale_float(frame, cropped)
+            )
+            float_samples += measure(fix_rush_overlay_greyscale_float, frame, cropped)
+            lut_samples += measure(frame.fix_rush_overlay_greyscale, cropped)
+
+        print(f"{name} float: {summarize(float_samples)}")
+        print(f"{name} lookup table: {summarize(lut_samples)}")
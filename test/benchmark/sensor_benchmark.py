@@ -0,0 +1,163 @@
+"""
+Measures every stage of the sensor on the test resources, and optionally on a capture directory, then compares the
+results, the accuracy against statements.json and the latencies with a baseline. Fails on any regression.
+
+    python -m benchmark.sensor_benchmark [--captures logs] [--save-baseline]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+import properties
+from benchmark.bench_utils import RESOURCES_PATH, load_images, measure, percentiles
+from core import ocr, sensor
+
+BASELINE_PATH = Path(__file__).parent / "sensor_baseline.json"
+# A stage is a regression when its p50 is this much slower than the baseline.
+REGRESSION_THRESHOLD = 0.25
+STAGES = ["analyse_waiting_tasks", "find_task_statuses", "read_task_statement", "read_description"]
+COLUMN_WIDTH = 26
+
+
+def format_percentiles(samples: list[float]) -> str:
+    if not samples:
+        return f"{'-':>{COLUMN_WIDTH}}"
+    latency = percentiles(samples)
+    return f"{latency['p50']:.3f}/{latency['p95']:.3f}/{latency['p99']:.3f}".rjust(COLUMN_WIDTH)
+
+
+def run_stages(img: np.ndarray) -> dict:
+    """Run every stage once on a new frame, and return what the sensor saw."""
+    frame = sensor.Frame(img)
+    sensor.analyse_waiting_tasks(frame)
+    sensor.read_task_statement(frame)
+    statement = frame.current_statement
+    return {
+        "tasks": [None if task is None else task.status.name for task in frame.tasks],
+        "title": None if statement is None else statement.title,
+        "description": None if statement is None else statement.description,
+    }
+
+
+def measure_stages(img: np.ndarray, repeat: int) -> dict[str, list[float]]:
+    waiting_tasks = np.flatnonzero(sensor.find_waiting_tasks(sensor.Frame(img))).tolist()
+
+    def read_task_statement():
+        # The cache would skip the OCR after the first read.
+        sensor.statement_cache = ocr.StatementCache()
+        frame = sensor.Frame(img)
+        sensor.read_task_statement(frame)
+        return frame.current_statement
+
+    statement = read_task_statement()
+    return {
+        "analyse_waiting_tasks": measure(lambda: sensor.analyse_waiting_tasks(sensor.Frame(img)), repeat=repeat),
+        "find_task_statuses": measure(
+            lambda: sensor.find_task_statuses(sensor.Frame(img), waiting_tasks), repeat=repeat
+        ),
+        "read_task_statement": measure(read_task_statement, repeat=repeat),
+        "read_description": (
+            [] if statement is None else measure(lambda: read_task_statement().description, repeat=repeat)
+        ),
+    }
+
+
+def accuracy(results: dict, labels: dict) -> dict[str, int]:
+    """Statements of labeled frames read exactly."""
+    labeled = {name: label for name, label in labels.items() if label is not None and name in results}
+    return {
+        "labeled": len(labeled),
+        "titles": sum(results[name]["title"] == label["title"] for name, label in labeled.items()),
+        "descriptions": sum(results[name]["description"] == label["description"] for name, label in labeled.items()),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    failures = []
+    for read, expected in baseline.get("accuracy", {}).items():
+        if read != "labeled" and results["accuracy"][read] < expected:
+            failures.append(f"{read} read exactly: {results['accuracy'][read]}, baseline is {expected}")
+    for name, expected in baseline["results"].items():
+        if name in results["results"] and results["results"][name] != expected:
+            failures.append(f"{name}: saw {results['results'][name]}, expected {expected}")
+
+    for stage, expected in baseline["stages"].items():
+        actual = results["stages"].get(stage)
+        if actual is not None and actual["p50"] > expected["p50"] * (1 + threshold):
+            failures.append(f"{stage}: p50 of {actual['p50']:.3f} ms, baseline is {expected['p50']:.3f} ms")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--captures", type=Path, help="directory of captured frames to measure too")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of every stage on every frame")
+    parser.add_argument("--ocr-engine", default=properties.OCR_ENGINE, choices=[e.name for e in ocr.OcrEngineType])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    images = load_images()
+    if args.captures is not None:
+        images |= {f"captures/{name}": img for name, img in load_images(args.captures).items()}
+    with open(RESOURCES_PATH / "statements.json") as statements_file:
+        labels = json.load(statements_file)
+
+    sensor.ocr_engine = ocr.create_engine(ocr.OcrEngineType[args.ocr_engine])
+    samples_by_stage: dict[str, list[float]] = defaultdict(list)
+    results = {"results": {}, "stages": {}}
+    # The sensor logs, and timeit prints, every call.
+    logging.disable(logging.INFO)
+    try:
+        print(f"{'fixture':<48}" + "".join(f"{stage:>{COLUMN_WIDTH}}" for stage in STAGES) + "   (p50/p95/p99 ms)")
+        for name, img in images.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                results["results"][name] = run_stages(img)
+                samples = measure_stages(img, args.repeat)
+            for stage, stage_samples in samples.items():
+                samples_by_stage[stage] += stage_samples
+            print(f"{name:<48}" + "".join(format_percentiles(s) for s in samples.values()))
+    finally:
+        logging.disable(logging.NOTSET)
+        sensor.ocr_engine.close()
+
+    print()
+    for stage in STAGES:
+        results["stages"][stage] = percentiles(samples_by_stage[stage])
+        print(f"{stage:<24}" + "".join(f"{p}: {ms:8.3f} ms  " for p, ms in results["stages"][stage].items()))
+
+    results["accuracy"] = accuracy(results["results"], labels)
+    read = results["accuracy"]
+    print(
+        f"\nTitles read exactly: {read['titles']}/{read['labeled']}, "
+        f"descriptions read exactly: {read['descriptions']}/{read['labeled']}"
+    )
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"Saved baseline to {args.baseline}.")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, use --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        failures = compare(results, json.load(baseline_file), args.threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import cv2
+
+from benchmark.bench_utils import load_images
+from core import session
+
+if __name__ == "__main__":
+    images = list(load_images().values())
+    # Frames of a session all have the same size.
+    shape = Counter(img.shape for img in images).most_common(1)[0][0]
+    frames = [img for img in images if img.shape == shape]
+    frame_bytes = sum(frame.nbytes for frame in frames)
+    start = datetime(2000, 1, 1)
+
+    with tempfile.TemporaryDirectory() as folder:
+        folder = Path(folder)
+
+        started_at = time.perf_counter()
+        for i, frame in enumerate(frames):
+            taken_at = start + i * timedelta(seconds=0.5)
+            cv2.imwrite(
+                str(folder / f"{taken_at:{session.FRAME_TIMESTAMP_FORMAT}}.tiff"),
+                cv2.cvtColor(frame, cv2.COLOR_RGB2BGR),
+            )
+        tiff_write = time.perf_counter() - started_at
+        tiff_size = sum(path.stat().st_size for path in folder.glob("*.tiff"))
+
+        started_at = time.perf_counter()
+        with session.SessionWriter(folder / "frames.session") as writer:
+            for i, frame in enumerate(frames):
+                writer.append(frame, start + i * timedelta(seconds=0.5))
+        session_write = time.perf_counter() - started_at
+        session_size = (folder / "frames.session").stat().st_size
+
+        order = list(range(len(frames)))
+        random.Random(42).shuffle(order)
+        reads = {}
+        for name, open_frames in (
+            ("TIFF", lambda: session.FolderSession(folder)),
+            ("session", lambda: session.SessionReader(folder / "frames.session")),
+        ):
+            with open_frames() as reader:
+                started_at = time.perf_counter()
+                for _ in reader:
+                    pass
+                sequential = time.perf_counter() - started_at
+
+                started_at = time.perf_counter()
+                for i in order:
+                    reader[i]
+                reads[name] = sequential, time.perf_counter() - started_at
+
+    print(f"{len(frames)} frames of {shape[1]}x{shape[0]}, {frame_bytes / 2**20:.1f} MiB")
+    for name, seconds, size in (("TIFF", tiff_write, tiff_size), ("session", session_write, session_size)):
+        print(f"{name} write: {frame_bytes / 2**20 / seconds:8.1f} MiB/s, {size / 2**20:6.1f} MiB on disk")
+    for name, (sequential, shuffled) in reads.items():
+        print(
+            f"{name} read: {frame_bytes / 2**20 / sequential:8.1f} MiB/s in order, "
+            f"{frame_bytes / 2**20 / shuffled:8.1f} MiB/s in random order"
+        )
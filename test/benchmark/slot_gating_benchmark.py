@@ -0,0 +1,30 @@
+import sys
+import time
+from pathlib import Path
+
+from benchmark.bench_utils import RESOURCES_PATH, load_images
+from core import sensor
+
+# The loop runs faster than the game changes the task column, so recorded sessions hold every picture a few frames.
+FRAMES_PER_IMAGE = 5
+
+
+def replay(session: list, slot_tracker: sensor.SlotTracker | None) -> float:
+    sensor.slot_tracker = slot_tracker
+    start = time.perf_counter()
+    for img in session:
+        sensor.analyse_waiting_tasks(sensor.Frame(img))
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    # Replays a recorded session, like the logs of the bot, or the test resources in order.
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else RESOURCES_PATH
+    session = [img for img in load_images(path).values() for _ in range(FRAMES_PER_IMAGE)]
+
+    every_slot = min(replay(session, None) for _ in range(5))
+    trackers = [sensor.SlotTracker() for _ in range(5)]
+    gated = min(replay(session, tracker) for tracker in trackers)
+    tracker = trackers[0]
+    print(f"Every slot: {every_slot * 1000:.1f} ms over {len(session)} frames")
+    print(f"Gated: {gated * 1000:.1f} ms over {len(session)} frames, {tracker}")
@@ -0,0 +1,85 @@
+import numpy as np
+
+from benchmark.bench_utils import load_images
+from core import ocr, sensor
+from core.brain import TaskStatement
+from core.ocr import OcrEngine, OcrEngineType
+
+# Recorded frames of the animation are rare, so it is replayed as a wipe revealing the statement from the left.
+ANIMATION_FRAMES = 4
+SETTLED_FRAMES = 3
+MAX_RETRY = 3
+
+
+class CountingEngine(OcrEngine):
+    def __init__(self, engine: OcrEngine):
+        self.engine = engine
+        self.calls = 0
+
+    def image_to_string(self, img: np.ndarray) -> str:
+        self.calls += 1
+        return self.engine.image_to_string(img)
+
+
+def animate(img: np.ndarray) -> list[np.ndarray]:
+    region = sensor.CURRENT_STATEMENT_REGION
+    left, top, right, bottom = region.corners
+    frames = []
+    for step in range(1, ANIMATION_FRAMES + 1):
+        frame = img.copy()
+        revealed = left + (right - left) * step // (ANIMATION_FRAMES + 1)
+        frame[top:bottom, revealed:right] = img[top, left]
+        frames.append(frame)
+    return frames + [img] * SETTLED_FRAMES
+
+
+def read_order(frames: list[np.ndarray], expected: TaskStatement, stability: sensor.StatementStability | None) -> bool:
+    """
+    Reads the statement of an order like the bot does. A wrong statement has no known execution, so the bot reads it
+    again, like when no statement is found.
+
+    :return: whether the expected statement was read.
+    """
+    if stability is not None:
+        stability.reset()
+
+    retry = 0
+    for img in frames:
+        frame = sensor.Frame(img)
+        if stability is not None and not stability.has_settled(frame):
+            continue
+
+        sensor.read_task_statement(frame)
+        statement = frame.current_statement
+        if statement is not None and (statement.title, statement.description) == (expected.title, expected.description):
+            return True
+
+        retry += 1
+        if retry >= MAX_RETRY:
+            return False
+    return False
+
+
+def read_statement(img: np.ndarray) -> TaskStatement | None:
+    frame = sensor.Frame(img)
+    sensor.read_task_statement(frame)
+    return frame.current_statement
+
+
+if __name__ == "__main__":
+    engine = CountingEngine(ocr.create_engine(OcrEngineType.GLYPHS))
+    sensor.ocr_engine = engine
+    try:
+        orders = [(img, read_statement(img)) for img in load_images().values()]
+        orders = [(img, statement) for img, statement in orders if statement is not None]
+
+        for name, stability in (("Next frame", None), ("Settled", sensor.StatementStability())):
+            engine.calls = 0
+            read = 0
+            for img, statement in orders:
+                sensor.statement_cache = ocr.StatementCache()
+                read += read_order(animate(img), statement, stability)
+
+            print(f"{name}: {engine.calls / len(orders):.2f} OCR calls per order, {read}/{len(orders)} orders read")
+    finally:
+        engine.close()
@@ -0,0 +1,29 @@
+import numpy as np
+
+from benchmark.bench_utils import load_images, measure, summarize
+from core import sensor
+from core.sensor import StatusDetection
+
+
+def find_statuses(frames: list[tuple[sensor.Frame, list[int]]], detection: StatusDetection) -> list:
+    sensor.STATUS_DETECTION = detection
+    return [sensor.find_task_statuses(frame, indexes) for frame, indexes in frames]
+
+
+if __name__ == "__main__":
+    frames = []
+    for img in load_images().values():
+        frame = sensor.Frame(img)
+        frames.append((frame, np.flatnonzero(sensor.find_waiting_tasks(frame)).tolist()))
+    slots = sum(len(indexes) for _, indexes in frames)
+
+    hough = find_statuses(frames, StatusDetection.HOUGH_CIRCLES)
+    ring = find_statuses(frames, StatusDetection.RING_TEMPLATE)
+    agreements = sum(
+        h == r for hough_statuses, ring_statuses in zip(hough, ring) for h, r in zip(hough_statuses, ring_statuses)
+    )
+    print(f"Ring template agrees with HoughCircles on {agreements}/{slots} slots over {len(frames)} frames.")
+
+    for detection in StatusDetection:
+        samples = measure(find_statuses, frames, detection)
+        print(f"{detection.name}: {summarize([s / len(frames) for s in samples])} per frame")
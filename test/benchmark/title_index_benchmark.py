@@ -0,0 +1,21 @@
+from benchmark.bench_utils import known_titles, measure, summarize
+from core import brain
+
+TITLES = known_titles()
+
+
+def scan() -> None:
+    for title in TITLES:
+        next((equipment for equipment in brain.EQUIPMENTS.values() if equipment.match_title(title)), None)
+
+
+def index() -> None:
+    for title in TITLES:
+        next(iter(brain.EQUIPMENT_TITLES.match(title)), None)
+
+
+if __name__ == "__main__":
+    keywords = sum(len(equipment.title_keywords) for equipment in brain.EQUIPMENTS.values())
+    print(f"{len(TITLES)} titles, {keywords} keywords, {len(brain.EQUIPMENT_TITLES.automaton)} automaton states")
+    print(f"Scan of every equipment: {summarize(measure(scan))} for all titles")
+    print(f"Title index: {summarize(measure(index))} for all titles")
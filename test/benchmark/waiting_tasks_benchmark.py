@@ -0,0 +1,34 @@
+import numpy as np
+
+from benchmark.bench_utils import load_images, measure, summarize
+from botkit import sensor_util
+from core import sensor
+
+
+def find_waiting_tasks_per_slot(frame: sensor.Frame) -> np.ndarray:
+    """Slot by slot detection, as it was done before the batched detection."""
+    present = np.zeros(len(sensor.WAITING_TASK_REGIONS), dtype=bool)
+    for i, region in enumerate(sensor.WAITING_TASK_REGIONS):
+        cropped_task = sensor_util.crop(frame.img, region)
+        if np.any(cropped_task[0, 0] != cropped_task[0, 0].flat[0]):
+            continue
+
+        cropped_task = frame.fix_rush_overlay_greyscale(cropped_task)
+        masked_active = sensor_util.mask(cropped_task, sensor.WAITING_TASK_MASK)
+        masked_blink = sensor_util.mask(cropped_task, sensor.WAITING_TASK_BLINK_MASK)
+        present[i] = np.sum(np.add(masked_active, masked_blink)) > 255 * 100
+    return present
+
+
+if __name__ == "__main__":
+    frames = [sensor.Frame(img) for img in load_images().values()]
+
+    for frame in frames:
+        assert np.array_equal(sensor.find_waiting_tasks(frame), find_waiting_tasks_per_slot(frame))
+    print(f"Batched and per slot detections agree on {len(frames)} frames.")
+
+    per_slot = measure(lambda: [find_waiting_tasks_per_slot(frame) for frame in frames])
+    batched = measure(lambda: [sensor.find_waiting_tasks(frame) for frame in frames])
+    print(f"Per slot: {summarize([s / len(frames) for s in per_slot])} per frame")
+    print(f"Batched:  {summarize([s / len(frames) for s in batched])} per frame")
+    print(f"Speedup:  x{np.median(per_slot) / np.median(batched):.1f}")
@@ -7,7 +7,7 @@ import pytest
 from freezegun import freeze_time
 
 from core import brain
-from core.brain import TaskStatement, Task, VisibleTask, TaskStatus
+from core.brain import LazyTaskStatement, TaskStatement, Task, VisibleTask, TaskStatus
 from suite_utils import enable_stdout_logs
 
 enable_stdout_logs(logging.INFO)
@@ -126,6 +126,63 @@ def test_unknown_statement():
     assert execution_callback.is_unknown
 
 
+def test_title_misread_by_ocr_is_taken_for_known_task():
+    keyboard = MagicMock()
+    read_description = MagicMock(return_value="Fillet the Fish, thea Season and cook.")
+    statement = LazyTaskStatement("Grey TaiI Fisb", read_description)
+    expected_recipe = ["left", "down", "right", "s", "enter"]
+    visible_tasks = [VisibleTask(1, TaskStatus.READY)]
+
+    with freeze_time(SOME_TIME):
+        task, callback = brain.choose_task_to_execute(visible_tasks)
+        callback(visible_tasks, statement)(keyboard)
+
+    keyboard.send.assert_has_calls([mock.call(key) for key in expected_recipe])
+    read_description.assert_not_called()
+
+
+def test_known_title_does_not_read_description():
+    read_description = MagicMock(return_value="Fillet the Fish, thea Season and cook.")
+    statement = LazyTaskStatement("Grey Tail Fish", read_description)
+    visible_tasks = [VisibleTask(1, TaskStatus.READY)]
+
+    with freeze_time(SOME_TIME):
+        _, callback = brain.choose_task_to_execute(visible_tasks)
+        callback(visible_tasks, statement)
+
+    read_description.assert_not_called()
+
+
+def test_equipment_title_reads_description_once():
+    keyboard = MagicMock()
+    read_description = MagicMock(return_value="Bacon, Lettuce and Tomatoes")
+    statement = LazyTaskStatement("BLT", read_description)
+    visible_tasks = [VisibleTask(1, TaskStatus.READY)]
+
+    with freeze_time(SOME_TIME):
+        _, callback = brain.choose_task_to_execute(visible_tasks)
+        callback(visible_tasks, statement)(keyboard)
+
+    assert statement.description == "Bacon, Lettuce and Tomatoes"
+    read_description.assert_called_once()
+
+
+def test_comparing_lazy_statements_does_not_read_their_description():
+    read_description = MagicMock(return_value="Bacon, Lettuce and Tomatoes")
+    statement = LazyTaskStatement("BLT", read_description)
+    task = Task(1, SOME_TIME, TaskStatus.READY)
+    task.statement = statement
+    same_task = Task(1, SOME_TIME, TaskStatus.READY)
+    same_task.statement = statement
+
+    assert statement == LazyTaskStatement("BLT", read_description)
+    assert hash(statement) == hash(LazyTaskStatement("BLT", read_description))
+    assert statement != LazyTaskStatement("BLT", MagicMock(return_value="Bacon, Lettuce and Tomatoes"))
+    assert statement != TaskStatement("BLT", "Bacon, Lettuce and Tomatoes")
+    assert task == same_task
+    read_description.assert_not_called()
+
+
 def test_robbery():
     keyboard = MagicMock()
     statement = TaskStatement(
@@ -140,3 +197,67 @@ def test_robbery():
         callback(visible_tasks, statement)(keyboard)
 
     keyboard.send.assert_has_calls([mock.call(key) for key in expected_recipe])
+
+
+def test_longest_keyword_wins_over_shorter_one_at_same_position():
+    step = brain.EQUIPMENTS["Lobster"].steps[1]
+
+    instructions = step.find_instructions("one cup of butter and cocktail, two cocktail cups")
+
+    assert instructions.keys == ["b", "c", "c", "c", "enter"]
+
+
+def test_instructions_found_once_per_normalized_description():
+    cache = brain.InstructionCache()
+    lobster = brain.EQUIPMENTS["Lobster"]
+
+    first = cache.find_instructions(lobster, "boil chilled lobster")
+    second = cache.find_instructions(lobster, "Boil  chilled lobster")
+
+    assert second is first
+    assert first.has_next_step
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_instruction_cache_evicts_least_recently_used():
+    cache = brain.InstructionCache(max_size=1)
+    lobster = brain.EQUIPMENTS["Lobster"]
+    cache.find_instructions(lobster, "boil chilled lobster")
+
+    cache.find_instructions(lobster, "no sauce")
+    cache.find_instructions(lobster, "boil chilled lobster")
+
+    assert cache.misses == 3
+    assert len(cache) == 1
+
+
+def test_instruction_cache_is_saved_between_sessions(tmp_path):
+    path = str(tmp_path / "instruction_cache.json")
+    cache = brain.InstructionCache(path=path)
+    instructions = cache.find_instructions(brain.EQUIPMENTS["Lobster"], "one cup of butter and cocktail")
+    cache.find_instructions(brain.EQUIPMENTS["Lobster"], "nothing to do with a lobster")
+    cache.save()
+
+    reloaded = brain.InstructionCache(path=path)
+
+    assert reloaded.find_instructions(brain.EQUIPMENTS["Lobster"], "one cup of butter and cocktail") == instructions
+    assert reloaded.find_instructions(brain.EQUIPMENTS["Lobster"], "nothing to do with a lobster") is None
+    assert reloaded.misses == 0
+
+
+def test_instruction_cache_is_invalidated_when_resources_change(tmp_path, monkeypatch):
+    path = str(tmp_path / "instruction_cache.json")
+    cache = brain.InstructionCache(path=path)
+    cache.find_instructions(brain.EQUIPMENTS["Lobster"], "no sauce")
+    cache.save()
+    monkeypatch.setattr(brain, "resources_digest", lambda: {"equipments.json": "changed", "tasks.json": "changed"})
+
+    reloaded = brain.InstructionCache(path=path)
+
+    assert len(reloaded) == 0
+
+
+def test_hold_inputs_are_saved_like_tasks_json():
+    instructions = brain.TASKS_INSTRUCTIONS["fast fries"]
+
+    assert brain.TaskInstructions.from_dict(instructions.to_dict()) == instructions
@@ -0,0 +1,91 @@
+import pickle
+
+from core import brain, bundle
+
+DIGEST = {"tasks.json": "a"}
+
+
+class Builder:
+    def __init__(self, content):
+        self.content = content
+        self.builds = 0
+
+    def __call__(self):
+        self.builds += 1
+        return self.content
+
+
+def test_bundle_is_built_when_missing(tmp_path):
+    path = tmp_path / "test.bundle"
+    build = Builder({"fries": 1})
+
+    content = bundle.load_or_build(path, DIGEST, build)
+
+    assert content == {"fries": 1}
+    assert build.builds == 1
+    assert path.exists()
+
+
+def test_fresh_bundle_is_loaded_without_building(tmp_path):
+    path = tmp_path / "test.bundle"
+    bundle.load_or_build(path, DIGEST, Builder({"fries": 1}))
+    build = Builder({"fries": 2})
+
+    content = bundle.load_or_build(path, DIGEST, build)
+
+    assert content == {"fries": 1}
+    assert build.builds == 0
+
+
+def test_bundle_is_rebuilt_when_sources_change(tmp_path):
+    path = tmp_path / "test.bundle"
+    bundle.load_or_build(path, DIGEST, Builder({"fries": 1}))
+    build = Builder({"fries": 2})
+
+    content = bundle.load_or_build(path, {"tasks.json": "b"}, build)
+
+    assert content == {"fries": 2}
+    assert build.builds == 1
+    assert bundle.load(path, {"tasks.json": "b"}) == {"fries": 2}
+
+
+def test_bundle_is_rebuilt_when_its_builder_changes(tmp_path):
+    path = tmp_path / "test.bundle"
+    builder = tmp_path / "builder.py"
+    builder.write_text("MAX_DISTANCE = 3\n")
+    bundle.load_or_build(path, DIGEST | bundle.source_digest(builder), Builder({"fries": 1}))
+    builder.write_text("MAX_DISTANCE = 2\n")
+    build = Builder({"fries": 2})
+
+    content = bundle.load_or_build(path, DIGEST | bundle.source_digest(builder), build)
+
+    assert content == {"fries": 2}
+    assert build.builds == 1
+
+
+def test_brain_bundle_depends_on_the_code_building_it():
+    assert {"equipments.json", "tasks.json", "brain.py", "text_index.py"} == set(brain.bundle_digest())
+
+
+def test_corrupted_bundle_is_rebuilt(tmp_path):
+    path = tmp_path / "test.bundle"
+    path.write_bytes(b"not a pickle")
+    build = Builder({"fries": 1})
+
+    content = bundle.load_or_build(path, DIGEST, build)
+
+    assert content == {"fries": 1}
+    assert build.builds == 1
+
+
+def test_bundled_resources_find_the_same_instructions_as_built_ones():
+    built = brain.build_resources()
+    bundled = pickle.loads(pickle.dumps(built))
+
+    assert bundled.tasks_instructions == built.tasks_instructions
+    assert bundled.task_titles.best_match("Fast Frles") == built.task_titles.best_match("Fast Frles")
+    for name, equipment in built.equipments.items():
+        assert bundled.equipments[name] == equipment
+        assert bundled.equipment_titles.match(name) == built.equipment_titles.match(name)
+        for step, bundled_step in zip(equipment.steps, bundled.equipments[name].steps):
+            assert bundled_step.autocorrect_dictionary == step.autocorrect_dictionary
@@ -0,0 +1,22 @@
+from datetime import datetime, timedelta
+
+from core import clock
+
+SOME_TIME = datetime(2000, 1, 1)
+
+
+def test_virtual_clock_sleeps_without_waiting():
+    virtual_clock = clock.VirtualClock(SOME_TIME)
+
+    virtual_clock.sleep(2.5)
+
+    assert virtual_clock.now() == SOME_TIME + timedelta(seconds=2.5)
+
+
+def test_virtual_clock_never_goes_back():
+    virtual_clock = clock.VirtualClock(SOME_TIME)
+
+    virtual_clock.advance_to(SOME_TIME + timedelta(seconds=3))
+    virtual_clock.advance_to(SOME_TIME + timedelta(seconds=1))
+
+    assert virtual_clock.now() == SOME_TIME + timedelta(seconds=3)
@@ -0,0 +1,17 @@
+import pytest
+
+from core import brain, sensor
+from suite_utils import SENSOR_STATE
+
+
+@pytest.fixture
+def restore_bot_state(monkeypatch):
+    """Sensor and brain module state as it was before the test, which starts without any active task."""
+    for name in SENSOR_STATE:
+        monkeypatch.setattr(sensor, name, getattr(sensor, name))
+    monkeypatch.setattr(brain, "active_tasks", [None] * len(sensor.WAITING_TASK_REGIONS))
+
+
+@pytest.fixture
+def no_creation_delay(monkeypatch):
+    monkeypatch.setattr(brain, "CREATION_DELAY_IN_SECONDS", 0)
@@ -0,0 +1,199 @@
+import time
+
+import numpy as np
+import pytest
+
+from core import bot, sensor
+from core.frame_ring import FrameRing, RingCamera
+from suite_utils import KeyList
+
+SHAPE = (72, 128, 3)
+
+
+class SyntheticSource:
+    """Frames filled with their number, so a reader can tell which frame it got."""
+
+    def __init__(self, shape: tuple[int, int, int] = SHAPE):
+        self.shape = shape
+        self.captured = 0
+
+    def get_latest_frame(self) -> np.ndarray:
+        frame = np.full(self.shape, self.captured % 256, dtype=np.uint8)
+        self.captured += 1
+        return frame
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing.create(slots=3, max_shape=SHAPE)
+    yield ring
+    ring.close()
+
+
+def test_latest_frame_is_a_view_on_the_ring(ring):
+    source = SyntheticSource()
+    for _ in range(2):
+        ring.write(source.get_latest_frame())
+
+    frame = ring.latest()
+
+    assert frame.number == 1
+    assert np.all(frame.img == 1)
+    assert not frame.img.flags.writeable
+    assert np.shares_memory(frame.img, np.ndarray(ring.memory.size, dtype=np.uint8, buffer=ring.memory.buf))
+
+
+def test_empty_ring_has_no_frame(ring):
+    assert ring.latest() is None
+
+
+def test_frame_overwritten_once_ring_went_around(ring):
+    source = SyntheticSource()
+    first = ring.write(source.get_latest_frame())
+
+    for _ in range(ring.slots - 1):
+        ring.write(source.get_latest_frame())
+    assert ring.is_current(first)
+
+    ring.write(source.get_latest_frame())
+    assert not ring.is_current(first)
+
+
+def test_writer_lapping_the_ring_skips_frame_held_by_reader(ring):
+    source = SyntheticSource()
+    ring.write(source.get_latest_frame())
+    held = ring.latest()
+
+    for _ in range(3 * ring.slots):
+        ring.write(source.get_latest_frame())
+
+    assert ring.is_current(held.number)
+    assert np.all(held.img == 0)
+    assert np.all(ring.latest().img == 3 * ring.slots)
+
+
+def test_released_slot_is_written_again(ring):
+    source = SyntheticSource()
+    ring.write(source.get_latest_frame())
+    held = ring.latest()
+    ring.release()
+
+    for _ in range(ring.slots):
+        ring.write(source.get_latest_frame())
+
+    assert not ring.is_current(held.number)
+
+
+@pytest.mark.parametrize("slots", [1, 2])
+def test_ring_needs_a_slot_besides_the_latest_and_the_one_held(slots):
+    with pytest.raises(ValueError):
+        FrameRing.create(slots=slots, max_shape=SHAPE)
+
+
+def test_writer_never_writes_the_latest_slot_the_reader_may_lease_next(ring):
+    source = SyntheticSource()
+    ring.write(source.get_latest_frame())
+    held = ring.latest()
+
+    for _ in range(3 * ring.slots):
+        previous = ring.written - 1
+        ring.write(source.get_latest_frame())
+        assert ring.is_current(previous)
+        assert ring.is_current(held.number)
+
+
+def test_smaller_frames_keep_their_shape(ring):
+    ring.write(np.ones((10, 20), dtype=np.uint8))
+
+    assert ring.latest().img.shape == (10, 20)
+
+
+def test_frame_too_large_for_slots_is_rejected(ring):
+    with pytest.raises(ValueError):
+        ring.write(np.zeros((SHAPE[0] + 1, SHAPE[1], 3), dtype=np.uint8))
+
+
+def test_attached_ring_reads_frames_written_by_creator(ring):
+    ring.write(np.full(SHAPE, 7, dtype=np.uint8))
+    attached = FrameRing.attach(ring.name, ring.lock, ring.slots, ring.max_shape)
+
+    try:
+        assert np.all(attached.latest().img == 7)
+    finally:
+        attached.close()
+
+
+def test_camera_returns_frames_of_capture_process_in_order():
+    camera = RingCamera(SyntheticSource, slots=3, max_shape=SHAPE, interval=0.001)
+    camera.start()
+    try:
+        values = []
+        for _ in range(5):
+            img = camera.get_latest_frame()
+            values.append(int(img[0, 0, 0]))
+            time.sleep(0.005)
+    finally:
+        camera.stop()
+
+    assert values == sorted(values)
+    assert len(set(values)) == 5
+    assert len(camera.ages) == 5
+    assert camera.dropped > 0
+
+
+def test_frame_analysed_while_capture_process_laps_the_ring_is_not_overwritten():
+    camera = RingCamera(SyntheticSource, slots=3, max_shape=SHAPE, interval=0.001)
+    camera.start()
+    try:
+        img = camera.get_latest_frame()
+        value = int(img[0, 0, 0])
+        written = camera.ring.written
+        while camera.ring.written < written + 4 * camera.slots:
+            time.sleep(0.001)
+        unchanged = bool(np.all(img == value))
+        camera.get_latest_frame()
+    finally:
+        camera.stop()
+
+    assert unchanged
+    assert camera.overwritten == 0
+
+
+def test_frame_consumes_ring_without_copy(ring):
+    ring.write(np.zeros(SHAPE, dtype=np.uint8))
+    img = ring.latest().img
+
+    frame = sensor.Frame(img)
+
+    assert frame.img is img
+
+
+def test_camera_only_returns_frames_captured_after_flush():
+    camera = RingCamera(SyntheticSource, slots=3, max_shape=SHAPE, interval=0.001)
+    camera.start()
+    try:
+        camera.get_latest_frame()
+        camera.flush()
+        flushed_at = time.time()
+        camera.get_latest_frame()
+        frame = camera.ring.latest()
+    finally:
+        camera.stop()
+
+    assert frame.captured_at >= flushed_at - 0.001
+
+
+def test_bot_logs_a_copy_of_frames_from_the_ring(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(bot.img_logger, "submit", submitted.append)
+    monkeypatch.setattr(bot.img_logger, "publish", lambda: None)
+    camera = RingCamera(SyntheticSource, slots=3, max_shape=SHAPE, interval=0.001)
+    camera.start()
+    try:
+        frame = bot.Bot(camera, KeyList(), sensor.CaptureMode.FULL_WINDOW).capture()
+        logged_copy = not np.shares_memory(submitted[0], frame.img) and np.array_equal(submitted[0], frame.img)
+        del frame
+    finally:
+        camera.stop()
+
+    assert logged_copy
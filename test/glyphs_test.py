@@ -0,0 +1,104 @@
+import functools
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from core import sensor
+from core.glyphs import LINE_PADDING, GlyphAtlas, read_lines, segment_lines
+from core.ocr import MIN_GLYPH_CONFIDENCE, MIN_GLYPH_MARGIN, GlyphEngine, OcrEngine
+
+with open("resources/statements.json") as statements_file:
+    STATEMENTS = {name: statement for name, statement in json.load(statements_file).items() if statement is not None}
+
+
+class StubEngine(OcrEngine):
+    def __init__(self, text: str):
+        self.text = text
+
+    def image_to_string(self, img: np.ndarray) -> str:
+        return self.text
+
+
+@functools.cache
+def mask_statement(path: str) -> np.ndarray:
+    img = cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB)
+    return sensor.mask_statement(sensor.Frame(img))
+
+
+def test_read_lines_finds_title_and_description():
+    lines = read_lines(mask_statement(r"resources/medium-cola.tiff"))
+
+    assert len(lines) == 2
+    assert len(lines[0]) == len('"MediumCola"')
+    assert len(lines[1]) == len("AMediumColawithIce,please.")
+
+
+def test_segment_lines_crops_every_line_tightly():
+    lines = segment_lines(mask_statement(r"resources/red_deluxe_pasta.tiff"))
+
+    assert len(lines) == 3
+    for rows, line in lines:
+        assert line.shape[0] == rows.stop - rows.start + 2 * LINE_PADDING
+        assert line[LINE_PADDING].any() and line[-LINE_PADDING - 1].any()
+        assert line[:, LINE_PADDING].any() and line[:, -LINE_PADDING - 1].any()
+        assert not line[:LINE_PADDING].any() and not line[:, :LINE_PADDING].any()
+
+
+def test_glyph_engine_reads_known_lines():
+    engine = GlyphEngine(GlyphAtlas.load(), StubEngine("fallback"))
+    lines = [line for _, line in segment_lines(mask_statement(r"resources/medium-cola.tiff"))]
+
+    assert engine.images_to_lines(lines) == ['"Medium Cola"', "A Medium Cola with Ice, please."]
+
+
+def test_glyph_engine_reads_known_statement():
+    engine = GlyphEngine(GlyphAtlas.load(), StubEngine("fallback"))
+
+    text = engine.image_to_string(mask_statement(r"resources/burger/the_triple_1.tiff"))
+
+    assert text == '"The Triple"\nThree meat patties...'
+    assert engine.fallbacks == 0
+
+
+def test_glyph_engine_falls_back_on_unknown_glyphs():
+    atlas = GlyphAtlas.build(
+        [(mask_statement(r"resources/medium-cola.tiff"), "Medium Cola", "A Medium Cola with Ice, please.")]
+    )
+    engine = GlyphEngine(atlas, StubEngine("fallback"))
+
+    text = engine.image_to_string(mask_statement(r"resources/burger/the_triple_1.tiff"))
+
+    assert text == "fallback"
+    assert engine.fallbacks == 1
+
+
+@pytest.mark.parametrize("character", sorted(set(GlyphAtlas.load().labels)))
+def test_characters_missing_from_atlas_are_unknown(character):
+    atlas = GlyphAtlas.load()
+    labels = np.array(atlas.labels)
+    without = GlyphAtlas(atlas.bitmaps[labels != character], labels[labels != character].tolist())
+
+    _, scores, margins = without.match(atlas.bitmaps[labels == character])
+
+    assert not np.any((scores >= MIN_GLYPH_CONFIDENCE) & (margins >= MIN_GLYPH_MARGIN))
+
+
+@pytest.mark.parametrize("held_out", sorted(STATEMENTS))
+def test_glyph_engine_reads_held_out_captures_right_or_falls_back(held_out):
+    expected = STATEMENTS[held_out]
+    atlas = GlyphAtlas.build(
+        (mask_statement(f"resources/{name}"), statement["title"], statement["description"])
+        for name, statement in STATEMENTS.items()
+        if statement != expected
+    )
+    engine = GlyphEngine(atlas, StubEngine("fallback"))
+
+    text = engine.image_to_string(mask_statement(f"resources/{held_out}"))
+
+    title, _, description = text.partition("\n")
+    assert text == "fallback" or (
+        title in (expected["title"], f'"{expected["title"]}"')
+        and description.replace("\n", " ") == expected["description"]
+    )
@@ -0,0 +1,195 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from core import brain, glyphs, ocr, sensor
+from core.bot import Bot
+from core.brain import LazyTaskStatement, TaskStatement
+from core.ocr import GlyphEngine, OcrEngine, OcrEngineType, PytesseractEngine, StatementCache, perceptual_hash
+from suite_utils import KeyList, StillCamera
+
+SOME_STATEMENT = TaskStatement("Medium Cola", "A Medium Cola with Ice, please.")
+SOME_OTHER_STATEMENT = TaskStatement("The Triple", "Meat (3x) and Cheese")
+
+
+def some_mask() -> np.ndarray:
+    masked = np.zeros((115, 765), dtype=bool)
+    masked[10:30, 20:24] = True
+    masked[10:14, 20:40] = True
+    masked[60:80, 100:104] = True
+    return masked
+
+
+def test_perceptual_hash_ignores_stray_pixels():
+    masked = some_mask()
+    noisy = masked.copy()
+    noisy[50, 300] = True
+    noisy[11, 22] = False
+
+    assert perceptual_hash(noisy) == perceptual_hash(masked)
+
+
+def test_perceptual_hash_sees_different_text():
+    masked = some_mask()
+    other = masked.copy()
+    other[60:80, 110:114] = True
+
+    assert perceptual_hash(other) != perceptual_hash(masked)
+
+
+def test_statement_cache_counts_hits_and_misses():
+    cache = StatementCache()
+
+    assert cache.get("a") is None
+    cache.put("a", SOME_STATEMENT)
+
+    assert cache.get("a") == SOME_STATEMENT
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_statement_cache_evicts_least_recently_used():
+    cache = StatementCache(max_size=2)
+    cache.put("a", SOME_STATEMENT)
+    cache.put("b", SOME_OTHER_STATEMENT)
+    cache.get("a")
+
+    cache.put("c", SOME_STATEMENT)
+
+    assert cache.get("a") == SOME_STATEMENT
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_statement_cache_is_saved_between_sessions(tmp_path):
+    path = str(tmp_path / "statement_cache.json")
+    cache = StatementCache(path=path)
+    cache.put("a", SOME_STATEMENT)
+    cache.save()
+
+    reloaded = StatementCache(path=path)
+
+    assert reloaded.get("a") == SOME_STATEMENT
+
+
+def test_statement_cache_does_not_read_descriptions_to_save_them(tmp_path):
+    path = str(tmp_path / "statement_cache.json")
+    cache = StatementCache(path=path)
+    cache.put("a", SOME_STATEMENT)
+    cache.put("b", LazyTaskStatement("The Triple", lambda: pytest.fail("Description should not be read.")))
+    cache.save()
+
+    reloaded = StatementCache(path=path)
+
+    assert reloaded.get("a") == SOME_STATEMENT
+    assert reloaded.get("b") is None
+
+
+def test_statement_cache_evicts_rejected_statement():
+    cache = StatementCache()
+    cache.put("a", SOME_STATEMENT)
+
+    cache.evict("a")
+    cache.evict("b")
+
+    assert cache.get("a") is None
+    assert cache.evictions == 1
+
+
+def test_statement_cache_ignores_statements_read_by_another_engine(tmp_path):
+    path = str(tmp_path / "statement_cache.json")
+    cache = StatementCache(path=path, engine_version="GlyphEngine")
+    cache.put("a", SOME_STATEMENT)
+    cache.save()
+
+    assert StatementCache(path=path, engine_version="GlyphEngine").get("a") == SOME_STATEMENT
+    assert StatementCache(path=path, engine_version="TesserocrEngine eng").get("a") is None
+
+
+class MisreadingEngine(OcrEngine):
+    """Misreads the first title, then reads like the engine it wraps."""
+
+    def __init__(self, engine: OcrEngine):
+        self.engine = engine
+        self.titles_read = 0
+
+    def image_to_string(self, img):
+        return self.engine.image_to_string(img)
+
+    def image_to_line(self, img):
+        self.titles_read += 1
+        return "Zzqx Wvvk" if self.titles_read == 1 else self.engine.image_to_line(img)
+
+    def images_to_lines(self, imgs):
+        return self.engine.images_to_lines(imgs)
+
+
+def test_misread_statement_is_read_again_once_rejected(monkeypatch):
+    engine = MisreadingEngine(ocr.create_engine(OcrEngineType.GLYPHS))
+    monkeypatch.setattr(sensor, "ocr_engine", engine)
+    monkeypatch.setattr(sensor, "statement_cache", StatementCache())
+    monkeypatch.setattr(sensor, "slot_tracker", sensor.SlotTracker())
+    monkeypatch.setattr(sensor, "rush_overlay_smoother", sensor.RushOverlaySmoother())
+    monkeypatch.setattr(brain, "active_tasks", [None] * len(sensor.WAITING_TASK_REGIONS))
+    monkeypatch.setattr(brain, "CREATION_DELAY_IN_SECONDS", 0)
+    keyboard = KeyList()
+    bot = Bot(StillCamera(Path("resources/burger/blt.tiff")), keyboard, sensor.CaptureMode.FULL_WINDOW, False)
+
+    bot.loop()
+    bot.loop()
+
+    assert engine.titles_read == 2
+    assert sensor.statement_cache.evictions == 1
+    assert bot.decisions[-1].action == "simple_task_execution 'BLT'"
+    assert keyboard.keys == ["1", "b", "l", "t", "enter"]
+
+
+def test_pytesseract_engine_is_created():
+    engine = ocr.create_engine(OcrEngineType.PYTESSERACT)
+
+    assert isinstance(engine, PytesseractEngine)
+    engine.close()
+
+
+def test_tesserocr_engine_is_created_when_installed():
+    pytest.importorskip("tesserocr")
+
+    engine = ocr.create_engine(OcrEngineType.TESSEROCR)
+
+    assert isinstance(engine, ocr.TesserocrEngine)
+    engine.close()
+
+
+def test_tesserocr_engine_falls_back_to_pytesseract_when_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+
+    engine = ocr.create_engine(OcrEngineType.TESSEROCR)
+
+    assert isinstance(engine, PytesseractEngine)
+    engine.close()
+
+
+def test_glyph_engine_falls_back_to_tesseract_when_atlas_is_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+
+    def missing_atlas():
+        raise FileNotFoundError("glyph_atlas.npz")
+
+    monkeypatch.setattr(glyphs.GlyphAtlas, "load", missing_atlas)
+
+    engine = ocr.create_engine(OcrEngineType.GLYPHS)
+
+    assert isinstance(engine, PytesseractEngine)
+    engine.close()
+
+
+def test_glyph_engine_reads_unknown_glyphs_with_tesseract(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+
+    engine = ocr.create_engine(OcrEngineType.GLYPHS)
+
+    assert isinstance(engine, GlyphEngine)
+    assert isinstance(engine.fallback, PytesseractEngine)
+    engine.close()
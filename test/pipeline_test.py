@@ -0,0 +1,151 @@
+import queue
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from core import brain, clock, ocr, pipeline, sensor
+from core.brain import TaskStatement, TaskStatus, VisibleTask
+from core.pipeline import Observation, PipelinedBot, WorkerType
+from suite_utils import CountingStability, KeyList, StillCamera, glyph_sensor
+
+pytestmark = pytest.mark.usefixtures("restore_bot_state", "no_creation_delay")
+
+
+def test_plan_records_keys_and_pauses_without_sleeping():
+    seen = []
+
+    def callback(keyboard):
+        keyboard.send("a")
+        seen.append(clock.now())
+        clock.sleep(5)
+        seen.append(clock.now())
+        keyboard.send("b")
+
+    started = time.perf_counter()
+    recorded = pipeline.plan(callback)
+
+    assert time.perf_counter() - started < 1
+    assert recorded.steps == [("send", "a"), ("sleep", 5), ("send", "b")]
+    assert seen[1] - seen[0] >= timedelta(seconds=5)
+    assert isinstance(clock.current, clock.SystemClock)
+
+
+def test_plan_updates_brain_right_away():
+    visible_tasks = [VisibleTask(1, TaskStatus.READY)]
+    task, callback = brain.choose_task_to_execute(visible_tasks)
+    execution = callback(visible_tasks, TaskStatement("Cherry Vanilla", "Two Vanilla Scoops with a Cherry, please."))
+
+    recorded = pipeline.plan(execution)
+
+    assert [argument for step, argument in recorded.steps if step == "send"] == ["v", "v", "h", "enter"]
+    assert task.is_completed
+
+
+def test_oldest_observation_dropped_when_decision_is_behind():
+    observations = queue.Queue(maxsize=2)
+    for captured_at in range(3):
+        pipeline._put_latest(observations, Observation(captured_at, []))
+
+    assert [observations.get_nowait().captured_at for _ in range(2)] == [1, 2]
+
+
+def test_observations_captured_before_last_action_are_ignored():
+    bot = PipelinedBot(None, None, sensor.CaptureMode.FULL_WINDOW, worker_type=WorkerType.THREAD)
+    bot.acted_at = 10.0
+    bot.observations.put(Observation(9.0, []))
+    bot.observations.put(Observation(11.0, []))
+
+    assert bot.observe().captured_at == 11.0
+    assert bot.stale_observations == 1
+
+
+class ScriptedCamera(StillCamera):
+    """Runs a step of the decision before every frame, then stops perception."""
+
+    def __init__(self, path: Path, steps: list, stopped):
+        super().__init__(path)
+        self.steps = steps
+        self.stopped = stopped
+
+    def get_latest_frame(self):
+        if self.steps:
+            self.steps.pop(0)()
+        else:
+            self.stopped.set()
+        return super().get_latest_frame()
+
+
+def test_every_statement_request_resets_stability_even_when_perception_misses_the_action():
+    bot = PipelinedBot(None, None, sensor.CaptureMode.FULL_WINDOW, worker_type=WorkerType.THREAD)
+    stability = CountingStability()
+
+    def next_order():
+        # The decision acts, then requests the statement of the next order, between two frames.
+        bot.statement_wanted.value = False
+        bot.request_statement()
+
+    camera = ScriptedCamera(Path("resources/burger/blt.tiff"), [bot.request_statement, next_order], bot.stopped)
+    with glyph_sensor():
+        pipeline._perceive(
+            camera,
+            sensor.CaptureMode.FULL_WINDOW,
+            stability,
+            bot.observations,
+            bot.statement_request,
+            bot.statement_wanted,
+            bot.rejected_statements,
+            bot.stopped,
+        )
+
+    assert stability.resets == 2
+
+
+def test_statement_of_an_earlier_request_is_not_observed():
+    bot = PipelinedBot(None, None, sensor.CaptureMode.FULL_WINDOW, worker_type=WorkerType.THREAD)
+    bot.request_statement()
+    earlier = bot.statement_request.value
+    bot.statement_wanted.value = False
+    bot.request_statement()
+    bot.observations.put(Observation(1.0, [], earlier, TaskStatement("BLT", "")))
+    bot.observations.put(Observation(2.0, [], bot.statement_request.value, TaskStatement("The Red", "")))
+
+    assert bot.observe_statement().current_statement_title == "The Red"
+
+
+def test_rejected_statements_are_forgotten_by_perception(monkeypatch):
+    monkeypatch.setattr(sensor, "statement_cache", ocr.StatementCache())
+    sensor.statement_cache.put("a", TaskStatement("Zzqx Wvvk", ""))
+    bot = PipelinedBot(None, None, sensor.CaptureMode.FULL_WINDOW, worker_type=WorkerType.THREAD)
+
+    bot.reject_statement(Observation(1.0, [], 1, TaskStatement("Zzqx Wvvk", ""), "a"))
+    pipeline._forget_rejected(bot.rejected_statements)
+
+    assert sensor.statement_cache.get("a") is None
+
+
+def test_known_statement_is_sent_without_description():
+    statement = pipeline.materialize(TaskStatement("Fast Fries", "Some fries, please."))
+
+    assert statement == TaskStatement("Fast Fries", "")
+
+
+def test_pipeline_selects_task_then_executes_its_statement():
+    keyboard = KeyList()
+    bot = PipelinedBot(
+        lambda: StillCamera(Path("resources/burger/blt.tiff")),
+        lambda: keyboard,
+        sensor.CaptureMode.FULL_WINDOW,
+        glyph_sensor,
+        WorkerType.THREAD,
+    )
+    bot.start()
+    try:
+        bot.loop()
+        bot.loop()
+    finally:
+        bot.stop()
+
+    assert keyboard.keys == ["1", "b", "l", "t", "enter"]
+    assert bot.decisions[-1].action == "simple_task_execution 'BLT'"
@@ -0,0 +1,40 @@
+import json
+import logging
+import sys
+from pathlib import Path
+
+import cv2
+
+from core import glyphs, sensor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.StreamHandler(sys.stdout),
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+RESOURCES_PATH = Path(__file__).parent.parent / "resources"
+STATEMENTS_FILE = RESOURCES_PATH / "statements.json"
+ATLAS_PATH = Path(__file__).parent.parent.parent / "src" / "core" / "resources" / glyphs.GLYPH_ATLAS_FILE
+
+
+def load_samples():
+    with open(STATEMENTS_FILE) as statements_file:
+        statements = json.load(statements_file)
+
+    for image_name, statement in statements.items():
+        if statement is None:
+            continue
+
+        img = cv2.cvtColor(cv2.imread(str(RESOURCES_PATH / image_name)), cv2.COLOR_BGR2RGB)
+        yield sensor.mask_statement(sensor.Frame(img)), statement["title"], statement["description"]
+
+
+if __name__ == "__main__":
+    atlas = glyphs.GlyphAtlas.build(load_samples())
+    atlas.save(str(ATLAS_PATH))
+    logger.info(f"Saved {len(atlas)} glyphs ({len(set(atlas.labels))} characters) to {ATLAS_PATH}.")
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from core import brain, clock, ocr, replay, sensor, session
+
+pytestmark = pytest.mark.usefixtures("restore_bot_state")
+
+
+def replay_burgers() -> replay.ReplayResult:
+    return replay.replay_session(Path("resources/burger"), sensor.CaptureMode.FULL_WINDOW, ocr.OcrEngineType.GLYPHS)
+
+
+def test_replay_is_deterministic():
+    first = replay_burgers()
+    second = replay_burgers()
+
+    assert first.trace() == second.trace()
+    assert [press.key for press in first.presses][:2] == ["1", "m"]
+
+
+def test_replay_restores_system_clock():
+    replay_burgers()
+
+    assert isinstance(clock.current, clock.SystemClock)
+
+
+def test_frames_taken_while_sleeping_are_skipped():
+    frames = session.FolderSession(Path("resources/burger"))
+    start = frames.timestamps[0]
+    replay_clock = clock.VirtualClock(start)
+    camera = replay.ReplayCamera(frames, replay_clock)
+
+    camera.get_latest_frame()
+    replay_clock.sleep(1.2)
+    camera.get_latest_frame()
+
+    assert camera.position == 2
+    assert replay_clock.now() == start + timedelta(seconds=1.2)
+
+
+def test_keys_take_time_on_the_virtual_clock():
+    frames = session.FolderSession(Path("resources/burger"))
+    start = frames.timestamps[0]
+    replay_clock = clock.VirtualClock(start)
+    keyboard = replay.RecordingKeyboard(replay.ReplayCamera(frames, replay_clock))
+
+    keyboard.send("1")
+    keyboard.send("m")
+    keyboard.send(brain.HoldInput("s", 0.5))
+
+    assert [press.at - start for press in keyboard.presses] == [
+        timedelta(0),
+        timedelta(seconds=brain.KEY_INTERVAL_SECONDS),
+        timedelta(seconds=2 * brain.KEY_INTERVAL_SECONDS),
+    ]
+    assert replay_clock.now() == start + timedelta(seconds=2 * brain.KEY_INTERVAL_SECONDS + 0.5)
+
+
+def test_replay_ends_with_last_frame():
+    frames = session.FolderSession(Path("resources/burger"))
+    camera = replay.ReplayCamera(frames, clock.VirtualClock(frames.timestamps[-1]))
+    camera.get_latest_frame()
+
+    with pytest.raises(replay.EndOfReplay):
+        camera.get_latest_frame()
+
+
+def test_replay_of_session_file_matches_its_folder(tmp_path):
+    session.convert_folder(Path("resources/burger"), tmp_path / "burger.session")
+
+    from_file = replay.replay_session(
+        tmp_path / "burger.session", sensor.CaptureMode.FULL_WINDOW, ocr.OcrEngineType.GLYPHS
+    )
+
+    assert [press.key for press in from_file.presses] == [press.key for press in replay_burgers().presses]
@@ -0,0 +1,153 @@
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from core import brain, clock, runtime, sensor
+from core.brain import HoldInput, Task, TaskInstructions, TaskStatement, TaskStatus, TaskType
+from core.pipeline import Plan
+from core.runtime import AsyncBot, SyncKeyboardAdapter
+from suite_utils import SENSOR_STATE, CountingStability, KeyList, StillCamera, glyph_sensor
+
+pytestmark = pytest.mark.usefixtures("restore_bot_state", "no_creation_delay")
+
+
+class HoldingKeyboard(brain.AsyncKeyboard):
+    def __init__(self):
+        self.keys = []
+
+    async def send(self, key):
+        if isinstance(key, HoldInput):
+            await asyncio.sleep(key.hold_seconds)
+        self.keys.append(key)
+
+    async def wait_for(self, key):
+        pass
+
+
+def test_holding_a_key_does_not_block_other_coroutines():
+    keyboard = HoldingKeyboard()
+    ticks = []
+
+    async def tick():
+        for _ in range(5):
+            ticks.append(len(keyboard.keys))
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(perform, tick())
+
+    perform = runtime.perform(Plan([("send", HoldInput("down", 0.1)), ("sleep", 0.01), ("send", "enter")]), keyboard)
+    asyncio.run(main())
+
+    assert ticks == [0] * 5
+    assert keyboard.keys == [HoldInput("down", 0.1), "enter"]
+
+
+def test_blocking_keyboard_is_adapted():
+    keyboard = KeyList()
+
+    asyncio.run(runtime.perform(Plan([("send", "1"), ("wait_for", "enter")]), SyncKeyboardAdapter(keyboard)))
+
+    assert keyboard.keys == ["1", "wait for enter"]
+
+
+def test_timer_set_when_cooking_task_is_cooked(monkeypatch):
+    monkeypatch.setattr(brain, "CREATION_DELAY_IN_SECONDS", 0.5)
+    now = datetime.now()
+    arriving = Task(1, now, TaskStatus.READY)
+    cooking = Task(2, now - timedelta(seconds=5), TaskStatus.READY)
+    cooking.statement = TaskStatement("Fast Fries", "")
+    cooking.instructions = TaskInstructions(TaskType.COOKING, ["f"], cooking_seconds=10)
+    cooking.cook()
+
+    deadlines = runtime.task_deadlines([arriving, cooking, None])
+
+    assert deadlines == {
+        arriving.created_at + timedelta(seconds=0.5): "Task 1 arrived",
+        cooking.cooked_at: "Task 2 is cooked",
+    }
+
+
+def test_async_bot_selects_task_then_executes_its_statement():
+    keyboard = HoldingKeyboard()
+    with glyph_sensor():
+        bot = AsyncBot(StillCamera(Path("resources/burger/blt.tiff")), keyboard, sensor.CaptureMode.FULL_WINDOW)
+        asyncio.run(bot.run(loops=2))
+
+    assert keyboard.keys == ["1", "b", "l", "t", "enter"]
+    assert bot.decisions[-1].action == "simple_task_execution 'BLT'"
+
+
+class SwitchingCamera(StillCamera):
+    """Shows another frame once switched, like a customer arriving while a key is held."""
+
+    def switch(self, path: Path):
+        self.frame = StillCamera(path).frame
+
+
+class SwitchingKeyboard(HoldingKeyboard):
+    def __init__(self, camera: SwitchingCamera, path: Path):
+        super().__init__()
+        self.camera = camera
+        self.path = path
+
+    async def send(self, key):
+        if isinstance(key, HoldInput):
+            self.camera.switch(self.path)
+        await super().send(key)
+
+
+class HoldThenObserveBot(AsyncBot):
+    def loop(self):
+        self.before = self.observe()
+        self.decide(Task(1, clock.now(), TaskStatus.READY), "hold")
+        self.act(lambda keyboard: keyboard.send(HoldInput("down", 0.2)))
+        self.after = self.observe()
+
+
+def test_next_decision_uses_frames_analysed_while_holding_except_for_busy_slot():
+    camera = SwitchingCamera(Path("resources/burger/blt.tiff"))
+    arrived = Path("resources/medium-grape-w-flavor-blast.tiff")
+    with glyph_sensor():
+        bot = HoldThenObserveBot(camera, SwitchingKeyboard(camera, arrived), sensor.CaptureMode.FULL_WINDOW)
+        asyncio.run(bot.run(loops=1))
+        frame = sensor.create_frame(StillCamera(arrived).frame, sensor.CaptureMode.FULL_WINDOW)
+        sensor.analyse_waiting_tasks(frame)
+
+    assert bot.acting_since <= bot.after.captured_at < bot.acted_at
+    assert bot.after.tasks[0] == bot.before.tasks[0]
+    assert bot.after.tasks[1:] == frame.tasks[1:] != bot.before.tasks[1:]
+    assert bot.observed_while_acting == 1
+
+
+class TwoOrdersBot(AsyncBot):
+    def loop(self):
+        self.request_statement()
+        first = self.observe_statement()
+        self.act(lambda keyboard: keyboard.send("enter"))
+        self.request_statement()
+        second = self.observe_statement()
+        self.answered = [first.statement_request, second.statement_request]
+
+
+def test_every_statement_request_resets_stability_and_is_answered_by_its_own_frames():
+    with glyph_sensor():
+        bot = TwoOrdersBot(
+            StillCamera(Path("resources/burger/blt.tiff")), HoldingKeyboard(), sensor.CaptureMode.FULL_WINDOW
+        )
+        bot.statement_stability = CountingStability()
+        asyncio.run(bot.run(loops=1))
+
+    assert bot.answered == [1, 2]
+    assert bot.statement_stability.resets == 2
+
+
+def test_glyph_sensor_restores_sensor_state():
+    previous = [getattr(sensor, name) for name in SENSOR_STATE]
+
+    with glyph_sensor():
+        assert sensor.ocr_engine is not previous[0]
+
+    assert [getattr(sensor, name) for name in SENSOR_STATE] == previous
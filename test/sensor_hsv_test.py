@@ -0,0 +1,30 @@
+import cv2
+import numpy as np
+
+from botkit import sensor_util
+from core import sensor
+
+
+def load_frame(path: str) -> sensor.Frame:
+    return sensor.Frame(cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB))
+
+
+def test_masks_match_masking_the_crop():
+    frame = load_frame(r"resources/the_triple_w_bacon_2_rush_hour_1.tiff")
+    cropped = frame.fix_rush_overlay_greyscale(frame.crop(sensor.CURRENT_STATEMENT_REGION))
+
+    masked = sensor.in_range(frame.hsv(sensor.CURRENT_STATEMENT_REGION), sensor.CURRENT_STATEMENT_MASK_2)
+
+    assert np.array_equal(masked, sensor_util.mask(cropped, sensor.CURRENT_STATEMENT_MASK_2))
+
+
+def test_every_region_is_converted_once_per_frame():
+    frame = load_frame(r"resources/task-1-2-waiting.tiff")
+    colour_conversions = sensor.colour_conversions
+
+    sensor.analyse_waiting_tasks(frame)
+    sensor.mask_statement(frame)
+    sensor.mask_statement(frame)
+
+    # Waiting tasks, their statuses and the statement.
+    assert sensor.colour_conversions - colour_conversions == 3
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from botkit import sensor_util
+from core import sensor
+
+IMAGES = sorted(path.as_posix() for path in Path("resources").glob("**/*.tiff"))
+
+
+@pytest.mark.parametrize("image", IMAGES)
+def test_roi_frame_sees_the_same_as_the_full_window(image):
+    img = cv2.cvtColor(cv2.imread(image), cv2.COLOR_BGR2RGB)
+    full_frame = sensor.Frame(img)
+    roi_frame = sensor.RoiFrame.of_window(img)
+
+    sensor.analyse_waiting_tasks(full_frame)
+    sensor.analyse_waiting_tasks(roi_frame)
+
+    assert roi_frame.tasks == full_frame.tasks
+    assert np.array_equal(sensor.mask_statement(roi_frame), sensor.mask_statement(full_frame))
+
+
+def test_roi_frame_is_smaller_than_the_window():
+    img = cv2.cvtColor(cv2.imread(r"resources/medium-cola.tiff"), cv2.COLOR_BGR2RGB)
+
+    roi_frame = sensor.RoiFrame.of_window(img)
+
+    assert roi_frame.img.nbytes < img.nbytes / 5
+
+
+def test_regions_of_interest_are_packed_tightly():
+    area = sum(
+        (right - left) * (bottom - top) for left, top, right, bottom in (r.corners for r in sensor.REGIONS_OF_INTEREST)
+    )
+
+    assert area / (sensor._ROI_MOSAIC_WIDTH * sensor._ROI_MOSAIC_HEIGHT) > 0.85
+
+
+def test_regions_of_a_row_are_stacked_without_copy():
+    img = np.arange(4 * 12 * 3).reshape(4, 12, 3)
+    regions = [sensor_util.Region.of_corners(left, 1, left + 2, 3) for left in (1, 5, 9)]
+
+    stacked = sensor.stack_regions(img, regions)
+
+    assert np.shares_memory(stacked, img)
+    for region, view in zip(regions, stacked):
+        assert np.array_equal(view, sensor_util.crop(img, region))
+
+
+def test_roi_frame_cannot_crop_outside_regions_of_interest():
+    img = cv2.cvtColor(cv2.imread(r"resources/medium-cola.tiff"), cv2.COLOR_BGR2RGB)
+    roi_frame = sensor.RoiFrame.of_window(img)
+
+    with pytest.raises(ValueError):
+        roi_frame.crop(sensor_util.Region.of_corners(100, 0, 200, 50))
@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+import pytest
+
+from core import sensor
+
+
+def float_correction(frame: sensor.Frame, img: np.ndarray) -> np.ndarray:
+    background = frame.img[sensor.WAITING_TASK_1_REGION.top, sensor.WAITING_TASK_1_REGION.left, 0]
+    ratio = (np.array([255], dtype=np.uint8) - background) / sensor.EXPECTED_WAITING_TASK_BACKGROUND_DARKNESS
+    return (255 - (255 - img) / ratio).astype(np.uint8)
+
+
+@pytest.mark.parametrize(
+    "image",
+    [
+        r"resources/the_triple_w_bacon_2_rush_hour_1.tiff",
+        r"resources/the_triple_w_bacon_2_rush_hour_2.tiff",
+        r"resources/task-2-blink-rush-1.tiff",
+    ],
+)
+def test_lookup_table_matches_float_correction(image):
+    frame = sensor.Frame(cv2.cvtColor(cv2.imread(image), cv2.COLOR_BGR2RGB))
+
+    for img in (
+        frame.crop(sensor.CURRENT_STATEMENT_REGION),
+        frame.crop(sensor.STATUS_TASK_1_REGION),
+        frame.stack(sensor.WAITING_TASK_REGIONS)[[0, 2, 5]],
+    ):
+        assert np.array_equal(frame.fix_rush_overlay_greyscale(img), float_correction(frame, img))
+
+
+def test_no_overlay_leaves_pixels_untouched():
+    frame = sensor.Frame(cv2.cvtColor(cv2.imread(r"resources/medium-cola.tiff"), cv2.COLOR_BGR2RGB))
+    cropped = frame.crop(sensor.CURRENT_STATEMENT_REGION)
+
+    assert frame.fix_rush_overlay_greyscale(cropped) is cropped
+
+
+def test_smoother_ignores_small_changes():
+    smoother = sensor.RushOverlaySmoother(tolerance=1)
+
+    assert smoother.smooth(np.uint8(110)) == 110
+    assert smoother.smooth(np.uint8(111)) == 110
+    assert smoother.smooth(np.uint8(109)) == 110
+    assert smoother.smooth(np.uint8(122)) == 122
+    assert smoother.changes == 2
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import cv2
+import pytest
+
+from core import sensor
+
+IMAGES = sorted(path.as_posix() for path in Path("resources").glob("**/*.tiff"))
+
+
+@pytest.fixture
+def slot_tracker(monkeypatch):
+    tracker = sensor.SlotTracker()
+    monkeypatch.setattr(sensor, "slot_tracker", tracker)
+    return tracker
+
+
+def load_frame(path: str) -> sensor.Frame:
+    return sensor.Frame(cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB))
+
+
+def analyse_untracked(path: str, monkeypatch) -> list:
+    frame = load_frame(path)
+    with monkeypatch.context() as m:
+        m.setattr(sensor, "slot_tracker", None)
+        sensor.analyse_waiting_tasks(frame)
+    return frame.tasks
+
+
+def test_unchanged_frame_reuses_every_slot(slot_tracker):
+    first = load_frame(r"resources/task-1-2-waiting.tiff")
+    second = load_frame(r"resources/task-1-2-waiting.tiff")
+
+    sensor.analyse_waiting_tasks(first)
+    sensor.analyse_waiting_tasks(second)
+
+    assert second.tasks == first.tasks
+    assert slot_tracker.recomputed == 8
+    assert slot_tracker.skipped == 8
+
+
+def test_changed_slot_is_analysed_again(slot_tracker, monkeypatch):
+    sensor.analyse_waiting_tasks(load_frame(r"resources/burger/blt.tiff"))
+    frame = load_frame(r"resources/burger/the_triple_2.tiff")
+
+    sensor.analyse_waiting_tasks(frame)
+
+    assert frame.tasks == analyse_untracked(r"resources/burger/the_triple_2.tiff", monkeypatch)
+    assert slot_tracker.recomputed == 8 + 1
+    assert slot_tracker.skipped == 7
+
+
+def test_replay_finds_the_same_tasks_as_analysing_every_slot(slot_tracker, monkeypatch):
+    for image in IMAGES:
+        frame = load_frame(image)
+
+        sensor.analyse_waiting_tasks(frame)
+
+        assert frame.tasks == analyse_untracked(image, monkeypatch), image
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+import cv2
+from freezegun import freeze_time
+
+from core import sensor
+
+
+def load_frame(path: str) -> sensor.Frame:
+    return sensor.Frame(cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB))
+
+
+def test_statement_settles_once_unchanged():
+    stability = sensor.StatementStability()
+
+    assert not stability.has_settled(load_frame(r"resources/burger/the_red_1.tiff"))
+    assert not stability.has_settled(load_frame(r"resources/burger/the_triple_1.tiff"))
+    assert stability.has_settled(load_frame(r"resources/burger/the_triple_1.tiff"))
+
+
+def test_reset_forgets_previous_statement():
+    stability = sensor.StatementStability()
+    stability.has_settled(load_frame(r"resources/medium-cola.tiff"))
+
+    stability.reset()
+
+    assert not stability.has_settled(load_frame(r"resources/medium-cola.tiff"))
+
+
+def test_moving_statement_is_read_after_timeout():
+    stability = sensor.StatementStability(timeout=timedelta(seconds=1))
+    stability.reset()
+    stability.has_settled(load_frame(r"resources/burger/the_red_1.tiff"))
+
+    with freeze_time(datetime.now() + timedelta(seconds=2)):
+        assert stability.has_settled(load_frame(r"resources/burger/the_triple_1.tiff"))
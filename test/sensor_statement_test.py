@@ -1,4 +1,7 @@
+import json
+
 import cv2
+import pytest
 
 from botkit import img_logger
 from botkit.text import normalized_levenshtein_distance as nld
@@ -6,6 +9,9 @@ from core import sensor
 
 OCR_ERROR_TOLERANCE = 0.95
 
+with open("resources/statements.json") as statements_file:
+    STATEMENTS = json.load(statements_file)
+
 
 def test_ee_8():
     try:
@@ -327,3 +333,10 @@ def test_chomper_plate():
 
     finally:
         img_logger.finalize()
+
+
+@pytest.mark.parametrize("image, statement", STATEMENTS.items())
+def test_looks_like_statement(image, statement):
+    img = cv2.cvtColor(cv2.imread(f"resources/{image}"), cv2.COLOR_BGR2RGB)
+
+    assert sensor.looks_like_statement(sensor.mask_statement(sensor.Frame(img))) == (statement is not None)
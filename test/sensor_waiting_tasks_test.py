@@ -11,6 +11,11 @@ from suite_utils import enable_stdout_logs
 enable_stdout_logs(logging.INFO)
 
 
+@pytest.fixture(autouse=True, params=list(sensor.StatusDetection), ids=lambda detection: detection.name.lower())
+def status_detection(request, monkeypatch):
+    monkeypatch.setattr(sensor, "STATUS_DETECTION", request.param)
+
+
 def test_medium_grape_w_flavor_blast():
     try:
         img = cv2.cvtColor(cv2.imread(r"resources/medium-grape-w-flavor-blast.tiff"), cv2.COLOR_BGR2RGB)
@@ -0,0 +1,90 @@
+import shutil
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core import session
+
+SOME_TIME = datetime(2025, 10, 20, 19, 48, 32, 111818)
+
+
+def some_frames(count: int, shape=(20, 30, 3)) -> list[np.ndarray]:
+    rng = np.random.default_rng(42)
+    return [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(count)]
+
+
+def test_frames_are_read_back_in_any_order(tmp_path):
+    frames = some_frames(40)
+    with session.SessionWriter(tmp_path / "some.session", frames_per_chunk=16) as writer:
+        for i, frame in enumerate(frames):
+            writer.append(frame, SOME_TIME + i * timedelta(seconds=0.5))
+
+    with session.SessionReader(tmp_path / "some.session") as reader:
+        assert len(reader) == 40
+        for i in (39, 0, 17, 16, -1):
+            np.testing.assert_array_equal(reader[i], frames[i])
+        assert reader.timestamps[17] == SOME_TIME + timedelta(seconds=8.5)
+
+
+def test_frames_of_different_shapes_are_kept(tmp_path):
+    frames = some_frames(3) + some_frames(2, shape=(10, 10))
+    with session.SessionWriter(tmp_path / "some.session") as writer:
+        for frame in frames:
+            writer.append(frame, SOME_TIME)
+
+    with session.SessionReader(tmp_path / "some.session") as reader:
+        for read, written in zip(reader, frames):
+            np.testing.assert_array_equal(read, written)
+
+
+def test_appending_to_existing_session_keeps_previous_frames(tmp_path):
+    frames = some_frames(5)
+    for frame in frames:
+        with session.SessionWriter(tmp_path / "some.session") as writer:
+            writer.append(frame, SOME_TIME)
+
+    with session.SessionReader(tmp_path / "some.session") as reader:
+        assert len(reader) == 5
+        np.testing.assert_array_equal(reader[4], frames[4])
+
+
+def test_incomplete_last_chunk_is_ignored(tmp_path):
+    with session.SessionWriter(tmp_path / "some.session", frames_per_chunk=2) as writer:
+        for frame in some_frames(4):
+            writer.append(frame, SOME_TIME)
+    with open(tmp_path / "some.session", "r+b") as session_file:
+        session_file.truncate(session_file.seek(0, 2) - 10)
+
+    with session.SessionReader(tmp_path / "some.session") as reader:
+        assert len(reader) == 2
+
+
+def test_find_last_frame_taken_before(tmp_path):
+    with session.SessionWriter(tmp_path / "some.session") as writer:
+        for i, frame in enumerate(some_frames(3)):
+            writer.append(frame, SOME_TIME + i * timedelta(seconds=1))
+
+    with session.SessionReader(tmp_path / "some.session") as reader:
+        assert reader.find(SOME_TIME - timedelta(seconds=1)) == -1
+        assert reader.find(SOME_TIME + timedelta(seconds=1.5)) == 1
+        assert reader.find(SOME_TIME + timedelta(seconds=10)) == 2
+
+
+def test_converted_captures_match_their_tiff_files(tmp_path):
+    for name in ("2025-10-20T195021.071006.tiff", "2025-10-20T194832.111818.tiff"):
+        shutil.copy("resources/burger/blt.tiff", tmp_path / name)
+
+    assert session.convert_folder(tmp_path, tmp_path / "captures.session") == 2
+
+    with session.FolderSession(tmp_path) as folder, session.SessionReader(tmp_path / "captures.session") as reader:
+        assert reader.timestamps == folder.timestamps == [SOME_TIME, datetime(2025, 10, 20, 19, 50, 21, 71006)]
+        np.testing.assert_array_equal(reader[1], folder[1])
+        assert reader.name(0) == "2025-10-20T194832.111818"
+
+
+def test_corrupted_session_is_rejected(tmp_path):
+    (tmp_path / "some.session").write_bytes(b"not a session at all, but long enough")
+
+    with pytest.raises(session.CorruptedSessionException):
+        session.SessionReader(tmp_path / "some.session")
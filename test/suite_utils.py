@@ -1,3 +1,9 @@
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from core import brain, ocr, sensor, session
+
 stdout_handler_added = False
 
 
@@ -11,3 +17,64 @@ def enable_stdout_logs(level: int) -> None:
         stdout_handler_added = True
 
     logging.getLogger().setLevel(level)
+
+
+SENSOR_STATE = ("ocr_engine", "statement_cache", "slot_tracker", "rush_overlay_smoother")
+
+
+@contextmanager
+def glyph_sensor():
+    """Sensor reading statements with glyphs, restored to its previous state once done."""
+    previous = {name: getattr(sensor, name) for name in SENSOR_STATE}
+    sensor.ocr_engine = ocr.create_engine(ocr.OcrEngineType.GLYPHS)
+    sensor.statement_cache = ocr.StatementCache()
+    sensor.slot_tracker = sensor.SlotTracker()
+    sensor.rush_overlay_smoother = sensor.RushOverlaySmoother()
+    try:
+        yield
+    finally:
+        sensor.ocr_engine.close()
+        for name, value in previous.items():
+            setattr(sensor, name, value)
+
+
+class StillCamera:
+    def __init__(self, path: Path):
+        with session.FolderSession(path.parent) as frames:
+            self.frame = frames[frames.paths.index(path)]
+
+    def start(self):
+        pass
+
+    def get_latest_frame(self):
+        time.sleep(0.001)
+        return self.frame
+
+    def flush(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class CountingStability(sensor.StatementStability):
+    """Counts its resets, one for every statement it started waiting for."""
+
+    def __init__(self):
+        super().__init__()
+        self.resets = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self.resets += 1
+
+
+class KeyList(brain.Keyboard):
+    def __init__(self):
+        self.keys = []
+
+    def send(self, key):
+        self.keys.append(key)
+
+    def wait_for(self, key):
+        self.keys.append(f"wait for {key}")
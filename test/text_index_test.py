@@ -0,0 +1,157 @@
+import functools
+import itertools
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmark.bench_utils import known_titles
+from botkit.text import autocorrect
+from core import brain, sensor
+from core.text_index import DeletionIndex, FuzzyIndex, KeywordAutomaton, TitleIndex, deletes
+from suite_utils import StillCamera, glyph_sensor
+
+STATEMENTS = json.loads(Path("resources/statements.json").read_text())
+CORRECTIONS = [
+    ("Soda Fountain", 'A"Tombo Cola with Ice, please.', "a jumbo cola with ice please"),
+    ("Ice Cream", "Two Vanilla Scoops with a Cherry, please.", "two vanilla scoops with cherry please"),
+    ("Salad", "Vinaigrette, Cheese, � zon and Croutons.", "vinaigrette cheese bacon and croutons"),
+    ("Breakfast Sandwich", "One �99, Sausage and Cheese", "one egg sausage cheese"),
+]
+
+
+def test_overlapping_keywords_are_all_found():
+    automaton = KeywordAutomaton([("he", 0), ("she", 1), ("his", 2), ("hers", 3)])
+
+    found = [(end, keyword) for end, keyword, _ in automaton.find_all("ushers")]
+
+    assert found == [(4, "she"), (4, "he"), (6, "hers")]
+
+
+def test_keywords_are_case_sensitive():
+    automaton = KeywordAutomaton([("BLT", 0)])
+
+    assert list(automaton.find_all("blt")) == []
+
+
+def test_empty_keyword_is_rejected():
+    with pytest.raises(ValueError):
+        KeywordAutomaton([("", 0)])
+
+
+def test_items_are_returned_by_priority():
+    index = TitleIndex([("Salad", ["The Mix"]), ("Sushi", ["Mixed", "The Mix"])])
+
+    assert index.match("The Mixed Plate") == ["Salad", "Sushi"]
+    assert index.match("Mixed") == ["Sushi"]
+    assert index.match("Soup") == []
+
+
+def test_closest_key_is_found_with_its_confidence():
+    index = FuzzyIndex(["Fast Fries", "Lite Fast Fries", "Grey Tail Fish"])
+
+    title, confidence = index.best_match("Lite Fast  Frles")
+
+    assert title == "Lite Fast Fries"
+    assert 0.85 < confidence < 1
+
+
+def test_text_sharing_nothing_with_keys_has_no_match():
+    index = FuzzyIndex(["Fast Fries"])
+
+    assert index.best_match("xyz") == (None, 0.0)
+
+
+@pytest.mark.parametrize("title", known_titles())
+def test_index_finds_equipments_a_scan_would(title):
+    scanned = [equipment for equipment in brain.EQUIPMENTS.values() if equipment.match_title(title)]
+
+    assert brain.EQUIPMENT_TITLES.match(title) == scanned
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def test_deletes_of_a_word():
+    assert deletes("egg", 1) == {"egg", "gg", "eg"}
+    assert deletes("egg", 5) == {"egg", "gg", "eg", "e", "g", ""}
+
+
+@pytest.mark.parametrize("equipment", ["Robbery", "Pizza", "Salad"])
+def test_every_word_close_to_a_token_is_a_candidate(equipment):
+    step = brain.EQUIPMENTS[equipment].steps[0]
+    alphabet = sorted({char for word in step.autocorrect_dictionary for char in word})
+    tokens = [
+        word[:i] + char + word[i + 1 :]
+        for word in step.autocorrect_dictionary
+        for i, char in itertools.product(range(0, len(word), 2), alphabet[:3])
+    ] + ["a", "�zon", "pepprni", "xyzxyzxyz"]
+
+    for token in tokens:
+        close = {word for word in step.autocorrect_dictionary if edit_distance(token, word) <= 3}
+        assert close <= step.autocorrect_index.lookup(token), token
+
+
+@pytest.mark.parametrize("equipment, description, corrected", CORRECTIONS)
+def test_candidates_keep_the_corrections_of_autocorrect(equipment, description, corrected):
+    step = brain.EQUIPMENTS[equipment].steps[0]
+
+    candidates = step.autocorrect_index.candidates(description)
+
+    assert step.autocorrect_dictionary & set(corrected.split()) <= candidates
+    assert len(candidates) < len(step.autocorrect_dictionary)
+
+
+def test_tokens_too_long_for_any_word_have_no_candidate():
+    index = DeletionIndex(["egg", "bacon"])
+
+    assert index.lookup("baconbaconbacon") == set()
+    assert index.candidates("") == set()
+
+
+@functools.cache
+def read_descriptions() -> list[str]:
+    """Descriptions as the OCR reads them from the frames of statements.json, misreads included."""
+    descriptions = []
+    with glyph_sensor():
+        for name, label in STATEMENTS.items():
+            if label is None:
+                continue
+            frame = sensor.create_frame(StillCamera(Path("resources") / name).frame, sensor.CaptureMode.FULL_WINDOW)
+            sensor.read_task_statement(frame)
+            if frame.current_statement is not None:
+                descriptions.append(frame.current_statement.description)
+    return descriptions
+
+
+@pytest.mark.parametrize("equipment", list(brain.EQUIPMENTS))
+def test_candidates_autocorrect_like_the_whole_dictionary(equipment):
+    descriptions = [
+        *(label["description"] for label in STATEMENTS.values() if label is not None),
+        *read_descriptions(),
+        *(description for _, description, _ in CORRECTIONS),
+    ]
+
+    for step in brain.EQUIPMENTS[equipment].steps:
+        for description in descriptions:
+            expected = autocorrect(description, step.autocorrect_dictionary)
+            assert autocorrect(description, step.autocorrect_candidates(description)) == expected, description
+
+
+def test_description_close_to_no_word_is_corrected_from_the_whole_dictionary(monkeypatch):
+    step = brain.EQUIPMENTS["Salad"].steps[0]
+    description = "Zzzzzzzzzzzzzzzzzzzz."
+    dictionaries = []
+    monkeypatch.setattr(brain, "autocorrect", lambda text, dictionary: dictionaries.append(dictionary) or text)
+
+    step.find_instructions(description)
+
+    assert step.autocorrect_index.candidates(description) == set()
+    assert dictionaries == [step.autocorrect_dictionary]